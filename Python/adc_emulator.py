@@ -0,0 +1,162 @@
+import numpy as np
+
+# =============================================================
+# ADC-Emulator: Abtastzeitpunkte in ganzzahligen Takten
+#
+# Der ADC läuft mit clock / prescaler und braucht cycles Takte pro
+# Wandlung (Projekt: 64 MHz / 6, 14 Takte -> 84 Systemtakte = 1.3125 µs).
+# Alle Zeitpunkte werden als ganze Systemtakte gerechnet:
+#   Sample i im Fenster:  tick = tick_start + i * prescaler * cycles
+# statt  current += adc_sample_time  (aufaddierte Gleitkomma-Drift).
+# Messfenster (Start/Ende) werden ebenfalls auf Systemtakte gerundet.
+#
+# measure() tastet alle Fenster auf einmal ab (flache Arrays, offsets
+# markieren die Fenstergrenzen) und quantisiert auf N Bit. Kennzahlen
+# pro Fenster über np.add.reduceat bzw. cumsum statt Python-Schleifen:
+#   mean          Mittelwert der Samples (NaN: Fenster ohne Sample)
+#   step_mean     Mittelwert der Treppe (Sample hält bis zum nächsten
+#                 bzw. bis Fensterende)
+#   running_mean  laufender Mittelwert innerhalb jedes Fensters
+# =============================================================
+
+ADC_CLOCK = 64e6
+ADC_PRESCALER = 6
+ADC_CYCLES = 14
+
+
+def measurement_windows(period, duty, t_total, t_start=0.0, clock=ADC_CLOCK):
+    """
+    Messfenster eines Mess-PWM (z. B. 1 kHz, 50 %): Fenster k läuft von
+    k*period + duty*period bis (k+1)*period, das letzte wird bei t_total
+    abgeschnitten. Grenzen auf Systemtakte gerundet, Form (n, 2) in s.
+    Fenster ohne Dauer (end <= start nach dem Runden) entfallen.
+    """
+    n = int(np.ceil((t_total - t_start) / period - duty))
+    k = np.arange(max(n, 0))
+    start = np.rint((t_start + (k + duty) * period) * clock)
+    end = np.minimum(np.rint((t_start + (k + 1) * period) * clock), np.rint(t_total * clock))
+    keep = end > start
+    return np.stack((start[keep], end[keep]), axis=-1) / clock
+
+
+class AdcRun:
+    """
+    Ergebnis von AdcEmulator.measure(): flache Arrays über alle Fenster,
+    Fenster w belegt [offsets[w], offsets[w+1]).
+    """
+    def __init__(self, times, codes, offsets, windows):
+        self.times = times
+        self.codes = codes
+        self.offsets = offsets
+        self.windows = windows
+
+    @property
+    def counts(self):
+        return np.diff(self.offsets)
+
+    def window(self, w):
+        """(times, codes) von Fenster w."""
+        s = slice(self.offsets[w], self.offsets[w + 1])
+        return self.times[s], self.codes[s]
+
+    def _window_sums(self, values):
+        """Summe von values je Fenster; Fenster ohne Samples -> NaN."""
+        sums = np.full(self.counts.shape, np.nan)
+        filled = self.counts > 0
+        if filled.any():
+            # leere Fenster haben denselben Offset wie das nächste, reduceat nur über belegte
+            sums[filled] = np.add.reduceat(values, self.offsets[:-1][filled])
+        return sums
+
+    def mean(self):
+        """Mittelwert je Fenster, NaN für Fenster ohne Samples."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._window_sums(self.codes) / self.counts
+
+    def step_mean(self):
+        # Stufendauer: bis zum nächsten Sample, im letzten Sample bis Fensterende
+        hold = np.empty(self.times.shape)
+        hold[:-1] = np.diff(self.times)
+        filled = self.counts > 0
+        last = self.offsets[1:][filled] - 1
+        hold[last] = self.windows[filled, 1] - self.times[last]
+        return self._window_sums(self.codes * hold) / (self.windows[:, 1] - self.windows[:, 0])
+
+    def running_mean(self):
+        """Laufender Mittelwert je Fenster (flach wie codes)."""
+        cs = np.cumsum(self.codes)
+        before = np.concatenate(([0], cs))[self.offsets[:-1]]
+        idx = np.arange(self.codes.size) - np.repeat(self.offsets[:-1], self.counts)
+        return (cs - np.repeat(before, self.counts)) / (idx + 1)
+
+
+class AdcEmulator:
+    """
+    clock/prescaler/cycles: Taktbaum des ADC, bits: Auflösung,
+    lsb: Eingangswert pro Code (1.0 -> Signal schon in Bits).
+    """
+    def __init__(self, clock=ADC_CLOCK, prescaler=ADC_PRESCALER, cycles=ADC_CYCLES, bits=12,
+                 lsb=1.0):
+        self.clock = clock
+        self.ticks_per_sample = prescaler * cycles
+        self.sample_time = self.ticks_per_sample / clock
+        self.bits = bits
+        self.lsb = lsb
+
+    def sample_times(self, windows):
+        """Abtastzeitpunkte aller Fenster und die Fenstergrenzen (offsets)."""
+        ticks = np.rint(np.asarray(windows, dtype=np.float64).reshape(-1, 2) * self.clock).astype(np.int64)
+        counts = np.maximum(-(-(ticks[:, 1] - ticks[:, 0]) // self.ticks_per_sample), 0)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        i = np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+        tick = np.repeat(ticks[:, 0], counts) + i * self.ticks_per_sample
+        return tick / self.clock, offsets
+
+    def quantize(self, v):
+        return np.clip(np.rint(np.asarray(v) / self.lsb), 0, 2 ** self.bits - 1).astype(np.int64)
+
+    def measure(self, signal, windows):
+        """
+        signal: Funktion t -> Spannung (z. B. pwm_sim.PwmRc) oder ein Raster
+        (t, v), das linear interpoliert wird. windows: (n, 2) in s.
+        """
+        windows = np.asarray(windows, dtype=np.float64).reshape(-1, 2)
+        times, offsets = self.sample_times(windows)
+        if callable(signal):
+            v = signal(times)
+        else:
+            v = np.interp(times, *signal)
+        return AdcRun(times, self.quantize(v), offsets, windows)
+
+
+if __name__ == "__main__":
+    import time
+    from pwm_sim import PwmRc, pwm_edges
+
+    adc = AdcEmulator()
+    windows = measurement_windows(1e-3, 0.5, 2e-3)
+    times, offsets = adc.sample_times(windows)
+    print(f"Fenster {windows.tolist()}, Samples je Fenster {np.diff(offsets).tolist()}")
+
+    # alte Schleife: aufaddierte Zeitpunkte
+    start, end = windows[1]
+    old, current = [], start
+    while current < end:
+        old.append(current)
+        current += adc.sample_time
+    t_new = times[offsets[1]:offsets[2]]
+    print(f"Fenster 2: alt {len(old)} Samples, neu {t_new.size}, "
+          f"max. Abweichung {np.abs(np.array(old) - t_new).max() * 1e12:.2f} ps")
+
+    # Langlauf: 10 s PWM (15 kHz, 50 %) -> RC, alle 1-kHz-Messfenster
+    seconds = 10
+    sim = PwmRc(*pwm_edges(1 / 15e3, 0.5, seconds, 0xfff), 1e3 * 60.1e-9)
+    windows = measurement_windows(1e-3, 0.5, seconds)
+    t0 = time.perf_counter()
+    run = adc.measure(sim, windows)
+    mean, step_mean, running = run.mean(), run.step_mean(), run.running_mean()
+    print(f"{seconds} s: {windows.shape[0]} Fenster, {run.codes.size} Samples in "
+          f"{(time.perf_counter() - t0) * 1e3:.0f} ms")
+    print(f"Mittelwert je Fenster {mean.min():.2f} .. {mean.max():.2f}, "
+          f"Treppe {step_mean.min():.2f} .. {step_mean.max():.2f}, "
+          f"laufend am Fensterende = Mittelwert: {np.allclose(running[run.offsets[1:] - 1], mean)}")
@@ -0,0 +1,590 @@
+import os
+import re
+import math
+import random
+from collections import namedtuple
+
+import numpy as np
+
+# =============================================================
+# Headless Clip-Cutter (ohne matplotlib)
+#
+# Gleiche Clip-Logik wie algorithmus.py, aber als Objekte statt
+# Modul-Globals. ClipCutter erzeugt N Frames für alle Kanäle
+# eines Lichtprogramms in einem Aufruf als NumPy-Arrays.
+# =============================================================
+
+CROSSFADE_LENGTH = 50          # Länge des Übergangs (Samples)
+FPS              = 25
+
+project_dir = os.path.dirname(os.path.abspath(__file__))
+CANDLE_C = os.path.join(project_dir, "..", "light source converter", "candle.c")
+
+
+# -------------------------------------------------------------
+# 1) Lichtprogramm aus candle.c laden (ch0..ch3)
+# -------------------------------------------------------------
+def load_light_program(path=CANDLE_C):
+    """
+    Liest ein Lichtprogramm im candle.c-Format. Liefert ein dict mit
+    den LightProgram-Feldern (name, length, fps, ...) und 'channels'
+    als uint8-Array der Form (Kanäle, length).
+    """
+    with open(path, encoding="utf-8") as f:
+        src = f.read()
+
+    channels = []
+    for name, length, body in re.findall(
+            r"static const uint8_t (ch\d+)\[(\d+)\]\s*=\s*\{(.*?)\};", src, re.S):
+        values = [int(v) for v in re.findall(r"\d+", body)]
+        if len(values) != int(length):
+            raise ValueError(f"{name}: {len(values)} Werte statt {length}")
+        channels.append(values)
+
+    program = {'channels': np.array(channels, dtype=np.uint8)}
+    for key, value in re.findall(r"\.(\w+)\s*=\s*(\"[^\"]*\"|\d+)", src):
+        program[key] = value.strip('"') if value.startswith('"') else int(value)
+    return program
+
+
+# -------------------------------------------------------------
+# 2) WELL512 RNG – wie in algorithmus.py, optional mit Startzustand
+# -------------------------------------------------------------
+class Well512:
+    def __init__(self, state=None, index=0):
+        if state is None:
+            state = [random.getrandbits(32) for _ in range(16)]
+        self.state = [int(s) & 0xFFFFFFFF for s in state]
+        self.index = index & 15
+    def rand(self):
+        a = self.state[self.index]
+        c = self.state[(self.index + 13) & 15]
+        b = a ^ c ^ ((a << 16) & 0xFFFFFFFF) ^ ((c << 15) & 0xFFFFFFFF)
+        c = self.state[(self.index + 9) & 15]
+        c ^= (c >> 11)
+        self.state[self.index] = b ^ c
+        a = self.state[self.index]
+        d = a ^ ((a << 5) & 0xDA442D24)
+        self.index = (self.index + 15) & 15
+        self.state[self.index] ^= d
+        return self.state[self.index] & 0xFFFFFFFF
+    def getstate(self):
+        return tuple(self.state), self.index
+    def setstate(self, state):
+        self.state, self.index = list(state[0]), state[1]
+    def jump(self, k):
+        for _ in range(k):
+            self.rand()
+
+
+# -------------------------------------------------------------
+# 2b) WELL512 blockweise mit NumPy
+#
+# Well512 ist linear über GF(2): jede Ausgabe ist ein XOR von Beiträgen
+# der 512 Zustandsbits. Für einen Block von BLOCK Schritten wird der
+# Beitrag jedes Bits einmal vorberechnet (Lauf über die 512 Basiszustände),
+# jeweils 4 Bits zu einer Tabelle mit 16 Kombinationen zusammengefasst.
+# Ein Block kostet dann 128 XOR-Zeilen statt BLOCK Python-Aufrufe.
+# Sprünge um k Schritte nutzen die Potenzen T^(2^i) der 512x512-
+# Übergangsmatrix.
+# -------------------------------------------------------------
+def _well_step(S, index):
+    # ein rand()-Schritt für alle Spalten von S (16, M) gleichzeitig
+    a = S[index]
+    c = S[(index + 13) & 15]
+    b = a ^ c ^ (a << 16) ^ (c << 15)
+    c = S[(index + 9) & 15]
+    c = c ^ (c >> 11)
+    S[index] = b ^ c
+    a = S[index]
+    d = a ^ ((a << 5) & 0xDA442D24)
+    index = (index + 15) & 15
+    S[index] ^= d
+    return S[index].copy(), index
+
+
+def _run_basis(steps):
+    # Ausgaben (512, steps) der 512 Basiszustände und deren Zustand (512, 16)
+    # nach 1, 2, 4, ... steps Schritten, jeweils rotiert auf index = 0
+    j = np.arange(512)
+    S = np.zeros((16, 512), dtype=np.uint32)
+    S[j // 32, j] = np.uint32(1) << (j % 32).astype(np.uint32)
+    outs = np.empty((steps, 512), dtype=np.uint32)
+    states = {}
+    index = 0
+    for n in range(1, steps + 1):
+        outs[n - 1], index = _well_step(S, index)
+        if n & (n - 1) == 0 or n == steps:
+            states[n] = S[(index + np.arange(16)) & 15].T.copy()
+    return outs.T.copy(), states
+
+
+def _group_bits(table):
+    # (512, L) -> (128 * 16, L): Zeile g*16+v = XOR der Bits 4g..4g+3 laut v
+    rows = table.reshape(128, 4, -1)
+    grouped = np.zeros((128, 16, table.shape[1]), dtype=table.dtype)
+    for v in range(1, 16):
+        low = (v & -v).bit_length() - 1
+        grouped[:, v] = grouped[:, v & (v - 1)] ^ rows[:, low]
+    return grouped.reshape(128 * 16, -1)
+
+
+def _to_bits(canon):
+    return ((canon[:, np.newaxis] >> np.arange(32, dtype=np.uint32)) & 1).ravel()
+
+
+def _from_bits(bits):
+    words = bits.reshape(16, 32).astype(np.uint32) << np.arange(32, dtype=np.uint32)
+    return np.bitwise_or.reduce(words, axis=1)
+
+
+class Well512Block:
+    """
+    NumPy-Variante von Well512 mit identischer Zahlenfolge.
+    fill(n) liefert n Werte als uint32-Array, jump(k) überspringt k Werte,
+    getstate()/setstate() sind kompatibel zu Well512(state, index).
+    """
+    BLOCK = 1024
+    _tables = {}    # Blocklänge -> (Ausgabetabelle, Zustandstabelle)
+    _powers = []    # T^(2^i) als float32-Matrix mit Einträgen 0/1
+
+    def __init__(self, state=None, index=0, block=BLOCK):
+        if state is None:
+            state = [random.getrandbits(32) for _ in range(16)]
+        self.block = block
+        self.setstate((state, index))
+
+    def getstate(self):
+        return tuple(int(s) for s in self.state), self.index
+
+    def setstate(self, state):
+        self.state = np.array(state[0], dtype=np.uint32)
+        self.index = state[1] & 15
+
+    def _canonical(self):
+        return self.state[(self.index + np.arange(16)) & 15]
+
+    def _set_canonical(self, canon, steps):
+        self.index = (self.index - steps) & 15
+        self.state[(self.index + np.arange(16)) & 15] = canon
+
+    def _rows(self):
+        nibbles = (self._canonical()[:, np.newaxis] >> np.arange(0, 32, 4, dtype=np.uint32)) & 15
+        return np.arange(128) * 16 + nibbles.ravel()
+
+    @classmethod
+    def _table(cls, block):
+        if block not in cls._tables:
+            outs, states = _run_basis(block)
+            cls._tables[block] = (_group_bits(outs),
+                                  {n: _group_bits(st) for n, st in states.items()})
+        return cls._tables[block]
+
+    @classmethod
+    def _power(cls, i):
+        if not cls._powers:
+            _, states = _run_basis(1)
+            cls._powers.append(np.array([_to_bits(s) for s in states[1]], dtype=np.float32).T)
+        while len(cls._powers) <= i:
+            p = cls._powers[-1]
+            cls._powers.append((p @ p) % 2)
+        return cls._powers[i]
+
+    def fill(self, n):
+        out = np.empty(n, dtype=np.uint32)
+        block = self.block
+        out_table, state_tables = self._table(block)
+        state_table = state_tables[block]
+        wide = block % 2 == 0
+        pos = 0
+        while n - pos >= block:
+            rows = self._rows()
+            if wide:
+                # je zwei uint32 als ein uint64 verknüpfen
+                values = np.bitwise_xor.reduce(out_table.view(np.uint64)[rows], axis=0)
+                out[pos:pos + block] = values.view(np.uint32)
+            else:
+                out[pos:pos + block] = np.bitwise_xor.reduce(out_table[rows], axis=0)
+            self._set_canonical(np.bitwise_xor.reduce(state_table[rows], axis=0), block)
+            pos += block
+        rest = n - pos
+        if rest:
+            out[pos:] = np.bitwise_xor.reduce(out_table[self._rows(), :rest], axis=0)
+            self.jump(rest)
+        return out
+
+    def rand(self):
+        return int(self.fill(1)[0])
+
+    def jump(self, k):
+        # kleiner Rest über die Zustandstabellen 1, 2, 4, ... < block
+        _, state_tables = self._table(self.block)
+        small = k % self.block if self.block & (self.block - 1) == 0 else 0
+        for n in state_tables:
+            if n & small and n < self.block:
+                self._set_canonical(np.bitwise_xor.reduce(state_tables[n][self._rows()], axis=0), n)
+        k -= small
+
+        steps = k
+        bits = _to_bits(self._canonical()).astype(np.float32)
+        i = 0
+        while k:
+            if k & 1:
+                bits = (self._power(i) @ bits) % 2
+            k >>= 1
+            i += 1
+        self._set_canonical(_from_bits(bits), steps)
+
+
+# -------------------------------------------------------------
+# 3) Clip-Koordinaten
+# -------------------------------------------------------------
+def clip_coords(r_in, r_out, total_length, crossfade_length=CROSSFADE_LENGTH):
+    """
+    Bildet zwei Rohwerte des RNG auf (in_point, out_point) ab – exakt
+    wie create_new_clip_coords(). Funktioniert mit ints und Arrays.
+    """
+    max_in  = total_length - 2 * crossfade_length - 2
+    in_pt   = r_in % (max_in + 1)
+    min_out = in_pt + 2 * crossfade_length + 1
+    out_pt  = min_out + r_out % (total_length - min_out)
+    return in_pt, out_pt
+
+
+def crossfade(pos, v_out, v_in, length_):
+    w_in  = 0.5 * (1 - math.cos(math.pi * pos / length_))
+    w_out = 1.0 - w_in
+    return w_out * v_out + w_in * v_in
+
+
+# -------------------------------------------------------------
+# 3b) Festkomma-Crossfade wie auf der MCU
+#
+# Die Gewichte w_in(pos) für pos = 0..length_ liegen als Q-Zahlen in einer
+# Tabelle (im Flash), gemischt wird nur mit Integer-Multiplikation,
+# Addition und Shift. Mit Q15 und 8-Bit-Pixeln passt alles in 32 Bit.
+# -------------------------------------------------------------
+CROSSFADE_Q = 15
+
+def crossfade_table_q(length_, q=CROSSFADE_Q):
+    one = 1 << q
+    return np.array([math.floor(one * 0.5 * (1 - math.cos(math.pi * pos / length_)) + 0.5)
+                     for pos in range(length_ + 1)], dtype=np.int64)
+
+def crossfade_fixed(pos, v_out, v_in, table, q=CROSSFADE_Q):
+    w_in  = table[pos]
+    w_out = (1 << q) - w_in
+    return (w_out * v_out + w_in * v_in + (1 << (q - 1))) >> q
+
+def crossfade_error_report(length_, q=CROSSFADE_Q, max_value=255):
+    """
+    Vergleicht crossfade_fixed() mit crossfade() für alle Positionen und
+    alle Pixelpaare 0..max_value. 'exact' ist der Anteil der Fälle, in
+    denen das Festkomma-Ergebnis dem gerundeten Float-Ergebnis entspricht.
+    """
+    table = crossfade_table_q(length_, q)
+    v = np.arange(max_value + 1, dtype=np.int64)
+    v_out, v_in = v[:, np.newaxis], v[np.newaxis, :]
+    max_abs = sum_abs = sum_sq = 0.0
+    n_exact = 0
+    for pos in range(length_ + 1):
+        ref = crossfade(pos, v_out.astype(np.float64), v_in, length_)
+        err = crossfade_fixed(pos, v_out, v_in, table, q) - ref
+        max_abs = max(max_abs, float(np.abs(err).max()))
+        sum_abs += float(np.abs(err).sum())
+        sum_sq  += float((err ** 2).sum())
+        n_exact += int(np.count_nonzero(err == np.floor(ref + 0.5) - ref))
+    n = (length_ + 1) * v.size ** 2
+    w_ref = np.array([0.5 * (1 - math.cos(math.pi * pos / length_)) for pos in range(length_ + 1)])
+    return {
+        'q'            : q,
+        'length'       : length_,
+        'max_weight_error' : float(np.abs(table / (1 << q) - w_ref).max()),
+        'max_abs'      : max_abs,
+        'mean_abs'     : sum_abs / n,
+        'rms'          : math.sqrt(sum_sq / n),
+        'exact'        : n_exact / n,
+    }
+
+
+class ScalarCutter:
+    """
+    Referenz: get_next_pixel() aus algorithmus.py mit Zustand im Objekt
+    statt in Modul-Globals. Ein Frame pro Aufruf.
+    """
+    def __init__(self, pixel_values, crossfade_length=CROSSFADE_LENGTH, well=None):
+        self.pixel_values = pixel_values
+        self.total_length = len(pixel_values)
+        self.crossfade_length = crossfade_length
+        self.well = well if well is not None else Well512()
+        self.current_clip = self.create_new_clip_coords()
+        self.next_clip    = self.create_new_clip_coords()
+        self.clip_changed = False
+
+    def create_new_clip_coords(self):
+        in_pt, out_pt = clip_coords(self.well.rand(), self.well.rand(),
+                                    self.total_length, self.crossfade_length)
+        return {
+            'in_point'            : in_pt,
+            'crossfade_in_end'    : in_pt + self.crossfade_length,
+            'crossfade_out_begin' : out_pt - self.crossfade_length,
+            'out_point'           : out_pt,
+            'frame_counter'       : in_pt,
+        }
+
+    def get_next_pixel(self):
+        self.clip_changed = False
+        cur, nxt = self.current_clip, self.next_clip
+        frame = cur['frame_counter']
+
+        if frame < cur['crossfade_out_begin']:
+            px = self.pixel_values[frame]
+            second_play = None
+        else:
+            cf_frame  = frame - cur['crossfade_out_begin']
+            pixel_out = self.pixel_values[frame]
+            pixel_in  = self.pixel_values[nxt['in_point'] + cf_frame]
+            px        = crossfade(cf_frame, pixel_out, pixel_in, self.crossfade_length)
+
+            next_idx    = nxt['in_point'] + cf_frame
+            second_play = (next_idx, pixel_in)
+            nxt['frame_counter'] = next_idx + 1
+
+        cur['frame_counter'] += 1
+        if cur['frame_counter'] > cur['out_point']:
+            self.current_clip, self.next_clip = nxt, self.create_new_clip_coords()
+            self.clip_changed = True
+
+        return frame, px, second_play
+
+
+# -------------------------------------------------------------
+# 4) Vektorisierter Cutter
+# -------------------------------------------------------------
+# Alle Felder haben die Frame-Achse als letzte Achse.
+#   frame        Index des gespielten Samples im aktuellen Clip
+#   second       synchroner Index im nächsten Clip (-1 außerhalb Crossfade)
+#   values       (Kanäle, N) float64 – identisch zu get_next_pixel()
+#   clip_changed True am letzten Frame eines Clips
+#   in_point ... next_out_point: Koordinaten von aktuellem/nächstem Clip
+Frames = namedtuple("Frames", [
+    "frame", "second", "values", "clip_changed",
+    "in_point", "out_point", "next_in_point", "next_out_point",
+])
+
+
+def _concat_frames(blocks):
+    if len(blocks) == 1:
+        return blocks[0]
+    return Frames(*(np.concatenate(parts, axis=-1) for parts in zip(*blocks)))
+
+
+def _split_frames(block, n):
+    return (Frames(*(f[..., :n] for f in block)),
+            Frames(*(f[..., n:] for f in block)))
+
+
+class ClipCutter:
+    """
+    Erzeugt die Frame-Folge von get_next_pixel() blockweise für alle
+    Kanäle eines Lichtprogramms. Bei gleichem Well512-Zustand sind die
+    Werte bitgenau gleich zur skalaren Referenz (Gewichte werden mit
+    math.cos vorberechnet, die Mischung rechnet in float64).
+
+    Mit q_bits (z. B. CROSSFADE_Q) wird stattdessen die Festkomma-Mischung
+    der Firmware emuliert, values ist dann ein int64-Array.
+
+    Mit splice_index (splice_index.SpliceIndex) wird der in_point jedes
+    Folgeclips nur aus den guten Partnern des vorherigen out_points gezogen,
+    out_point wie bisher. Die Werte weichen dann von get_next_pixel() ab.
+    """
+    def __init__(self, channels, crossfade_length=CROSSFADE_LENGTH, well=None, q_bits=None,
+                 splice_index=None):
+        channels = np.asarray(channels)
+        if channels.ndim == 1:
+            channels = channels[np.newaxis, :]
+        self.q_bits = q_bits
+        self.channels = channels.astype(np.float64 if q_bits is None else np.int64)
+        self.total_length = channels.shape[1]
+        self.crossfade_length = crossfade_length
+        if self.total_length - 2 * crossfade_length - 2 < 0:
+            raise ValueError("Lichtprogramm zu kurz für diese Crossfade-Länge")
+
+        self.well = well if well is not None else Well512Block()
+        self.splice_index = splice_index
+        if splice_index is not None and (splice_index.total_length != self.total_length or
+                                         splice_index.crossfade_length != crossfade_length):
+            raise ValueError("splice_index passt nicht zu Programm oder Crossfade-Länge")
+
+        cf = crossfade_length
+        self.w_in  = np.array([0.5 * (1 - math.cos(math.pi * pos / cf)) for pos in range(cf + 1)])
+        self.w_out = 1.0 - self.w_in
+        if q_bits is not None:
+            self.w_in_q = crossfade_table_q(cf, q_bits)
+
+        # aktueller Clip (in, out) und nächster abzuspielender Frame darin
+        in_pt, out_pt = self._draw_clips(1)
+        self._clip  = (int(in_pt[0]), int(out_pt[0]))
+        self._start = self._clip[0]
+        self._pending = []
+        self._n_pending = 0
+
+    def _draw_clips(self, n, prev_out=None):
+        if hasattr(self.well, "fill"):
+            raw = self.well.fill(2 * n).astype(np.int64)
+        else:
+            raw = np.array([self.well.rand() for _ in range(2 * n)], dtype=np.int64)
+        if self.splice_index is None or prev_out is None:
+            return clip_coords(raw[0::2], raw[1::2], self.total_length, self.crossfade_length)
+
+        # in_point hängt vom vorigen out_point ab -> Clip für Clip
+        cand, out_min = self.splice_index.candidates, self.splice_index.out_min
+        k = cand.shape[1]
+        r_in, r_out = raw[0::2].tolist(), raw[1::2].tolist()
+        in_pt  = np.empty(n, dtype=np.int64)
+        out_pt = np.empty(n, dtype=np.int64)
+        total, cf = self.total_length, self.crossfade_length
+        for j in range(n):
+            i = int(cand[prev_out - out_min, r_in[j] % k])
+            min_out = i + 2 * cf + 1
+            prev_out = min_out + r_out[j] % (total - min_out)
+            in_pt[j], out_pt[j] = i, prev_out
+        return in_pt, out_pt
+
+    def _extend(self, n_clips):
+        cf = self.crossfade_length
+        new_in, new_out = self._draw_clips(n_clips, self._clip[1])
+        ins  = np.concatenate(([self._clip[0]], new_in))
+        outs = np.concatenate(([self._clip[1]], new_out))
+
+        # Clip k wird mit Clip k+1 überblendet -> letzter bleibt offen
+        in_k, out_k = ins[:-1], outs[:-1]
+        next_in, next_out = ins[1:], outs[1:]
+        starts = np.concatenate(([self._start], in_k[1:] + cf + 1))
+
+        lengths = out_k - starts + 1
+        offsets = np.cumsum(lengths) - lengths
+        clip = np.repeat(np.arange(n_clips), lengths)
+        frame = np.arange(lengths.sum()) - offsets[clip] + starts[clip]
+
+        pos = frame - (out_k[clip] - cf)
+        fade = pos >= 0
+        second = np.where(fade, next_in[clip] + pos, -1)
+
+        values = self.channels[:, frame]
+        pf = pos[fade]
+        if self.q_bits is None:
+            values[:, fade] = (self.w_out[pf] * values[:, fade]
+                               + self.w_in[pf] * self.channels[:, second[fade]])
+        else:
+            values[:, fade] = crossfade_fixed(pf, values[:, fade], self.channels[:, second[fade]],
+                                              self.w_in_q, self.q_bits)
+
+        clip_changed = np.zeros(frame.size, dtype=bool)
+        clip_changed[offsets + lengths - 1] = True
+
+        self._pending.append(Frames(frame, second, values, clip_changed,
+                                    in_k[clip], out_k[clip], next_in[clip], next_out[clip]))
+        self._n_pending += frame.size
+        self._clip  = (int(ins[-1]), int(outs[-1]))
+        self._start = self._clip[0] + cf + 1
+
+    def render(self, n_frames):
+        """Liefert die nächsten n_frames Frames als Frames-Tupel."""
+        while self._n_pending < n_frames or not self._pending:
+            # jeder Clip spielt mindestens crossfade_length + 1 Frames
+            missing = n_frames - self._n_pending
+            self._extend(max(16, missing // (self.crossfade_length + 1) + 1))
+
+        block, rest = _split_frames(_concat_frames(self._pending), n_frames)
+        self._pending = [rest]
+        self._n_pending -= n_frames
+        return block
+
+    def skip(self, n_frames):
+        """
+        Überspringt n_frames Frames, ohne Pixelwerte zu berechnen. Es werden
+        nur Clip-Koordinaten gezogen; der RNG steht danach genau dort, wo
+        ihn render(n_frames) hinterlassen hätte.
+        """
+        if n_frames == 0:
+            return
+        if n_frames <= self._n_pending:
+            _, rest = _split_frames(_concat_frames(self._pending), n_frames)
+            self._pending = [rest]
+            self._n_pending -= n_frames
+            return
+        n_frames -= self._n_pending
+        self._pending = []
+        self._n_pending = 0
+
+        cf = self.crossfade_length
+        while True:
+            saved = self.well.getstate()
+            n_clips = max(16, n_frames // (cf + 1) + 1)
+            new_in, new_out = self._draw_clips(n_clips, self._clip[1])
+            lengths = np.concatenate(([self._clip[1] - self._start + 1],
+                                      new_out - new_in - cf))
+            ends = np.cumsum(lengths)
+            m = int(np.searchsorted(ends, n_frames, side="right"))
+            if m <= n_clips:
+                # Ziel liegt in Clip m: RNG nur bis einschließlich Clip m vorspulen
+                self.well.setstate(saved)
+                self.well.jump(2 * m)
+                offset = n_frames - (ends[m - 1] if m else 0)
+                if m:
+                    self._clip  = (int(new_in[m - 1]), int(new_out[m - 1]))
+                    self._start = self._clip[0] + cf + 1
+                self._start += int(offset)
+                return
+            n_frames -= int(ends[-1])
+            self._clip  = (int(new_in[-1]), int(new_out[-1]))
+            self._start = self._clip[0] + cf + 1
+
+
+# -------------------------------------------------------------
+# 5) Vergleich mit der skalaren Referenz
+# -------------------------------------------------------------
+if __name__ == "__main__":
+    import time
+
+    program = load_light_program()
+    channels = program['channels']
+    cf = program['fade_frames']
+    seed = [random.getrandbits(32) for _ in range(16)]
+    n = 25 * 60 * 10   # 10 Minuten
+
+    t0 = time.perf_counter()
+    ref = []
+    for ch in channels:
+        cutter = ScalarCutter(list(ch), cf, Well512(seed))
+        ref.append([cutter.get_next_pixel()[1] for _ in range(n)])
+    t_scalar = time.perf_counter() - t0
+
+    Well512Block().fill(1)   # Tabellen einmalig aufbauen
+    t0 = time.perf_counter()
+    frames = ClipCutter(channels, cf, Well512Block(seed)).render(n)
+    t_batch = time.perf_counter() - t0
+
+    print(f"{n} Frames x {len(channels)} Kanäle: skalar {t_scalar:.3f} s, Block {t_batch:.4f} s")
+    print("bitgenau:", np.array_equal(np.array(ref, dtype=np.float64), frames.values))
+
+    # Start bei beliebigem Frame-Offset ohne Neuberechnung des Verlaufs
+    offset = 25 * 3600 * 8   # 8 Stunden
+    t0 = time.perf_counter()
+    cutter = ClipCutter(channels, cf, Well512Block(seed))
+    cutter.skip(offset)
+    tail = cutter.render(n)
+    t_skip = time.perf_counter() - t0
+    full = ClipCutter(channels, cf, Well512Block(seed)).render(offset + n)
+    print(f"skip({offset}) + render({n}): {t_skip:.3f} s, identisch:",
+          np.array_equal(full.values[:, offset:], tail.values))
+
+    # Festkomma-Emulation der Firmware gegen den Float-Pfad
+    report = crossfade_error_report(cf)
+    print("Festkomma Q{q}, Crossfade {length}: max |Fehler| {max_abs:.3f}, "
+          "mittel {mean_abs:.3f}, RMS {rms:.3f}, = round(float) in {exact:.2%}, "
+          "max Gewichtsfehler {max_weight_error:.2e}".format(**report))
+    fixed = ClipCutter(channels, cf, Well512Block(seed), q_bits=CROSSFADE_Q).render(n)
+    print("Programm-Ausgabe Festkomma vs. Float: max |Fehler|",
+          np.abs(fixed.values - frames.values).max())
@@ -0,0 +1,208 @@
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+from matplotlib.patches import Rectangle
+
+from clip_cutter import ClipCutter, load_light_program, FPS
+
+# =============================================================
+# Live-Monitor für den Clip-Cutter (alle Kanäle gleichzeitig)
+#
+# Gegenüber algorithmus.py:
+#  - Frames kommen blockweise aus ClipCutter statt einzeln
+#  - History ist ein vorab angelegter NumPy-Ringpuffer (Sweep-Anzeige)
+#  - Rechtecke und Marker werden nur bei Clipwechsel verschoben,
+#    nicht entfernt und neu angelegt
+#  - Zeit pro Frame (Update + Zeichnen/Blit) wird gemessen und angezeigt
+# =============================================================
+
+INTERVAL_MS   = 1000 / FPS
+CHUNK_FRAMES  = FPS * 10       # so viele Frames pro ClipCutter.render()
+CHANNEL_COLORS = ['tab:red', 'tab:blue', 'tab:green', 'tab:orange']
+
+mk_keys  = ['in_point', 'crossfade_in_end', 'crossfade_out_begin', 'out_point']
+mk_color = {'in_point':'green', 'crossfade_in_end':'green',
+            'crossfade_out_begin':'purple', 'out_point':'purple'}
+
+
+class ClipView:
+    """
+    Figure mit aktuellem Clip, nächstem Clip und History für alle Kanäle.
+    show(frames, i) setzt alle Artists auf Frame i eines Frames-Blocks
+    und liefert die geänderten Artists (für Blitting).
+    """
+    def __init__(self, channels, crossfade_length, history_length=None, fig=None, animated=True):
+        self.channels = np.asarray(channels, dtype=np.float64)
+        self.cf = crossfade_length
+        n_ch, total = self.channels.shape
+        self.history_length = history_length or total
+
+        if fig is None:
+            fig = plt.figure(figsize=(9, 8))
+        self.fig = fig
+        self.ax_cur, self.ax_next, self.ax_hist = fig.subplots(3, 1)
+
+        y_max = 260
+        for ax in (self.ax_cur, self.ax_next):
+            for ch, color in zip(self.channels, CHANNEL_COLORS):
+                ax.plot(range(total), ch, color=color, alpha=0.25)
+            ax.set_xlim(0, total)
+            ax.set_ylim(0, y_max)
+            ax.set_ylabel("Pixelwert")
+        self.ax_cur.set_title("Aktueller Clipverlauf")
+        self.ax_next.set_title("Nächster Clipverlauf")
+
+        self.ax_hist.set_xlim(0, self.history_length)
+        self.ax_hist.set_ylim(0, y_max)
+        self.ax_hist.set_title(f"Verlauf von play(pixel_value), {n_ch} Kanäle")
+        self.ax_hist.set_xlabel("Frames")
+        self.ax_hist.set_ylabel("Pixelwert")
+
+        # Ringpuffer: x-Achse fest, y wird an Position pos überschrieben
+        self.hist_x = np.arange(self.history_length)
+        self.hist_buf = np.full((n_ch, self.history_length), np.nan)
+        self.hist_pos = 0
+        self.hist_lines = [self.ax_hist.plot(self.hist_x, row, color=color, animated=animated)[0]
+                           for row, color in zip(self.hist_buf, CHANNEL_COLORS)]
+        self.hist_cursor = self.ax_hist.axvline(0, color='gray', linewidth=0.8, animated=animated)
+
+        # Marker: eine Line2D pro Farbe und Achse für alle Kanäle. Statt
+        # Textlabels an jedem Marker (ein Text kostet pro Frame mehr als
+        # alle Linien zusammen) erklärt eine Legende die Farben.
+        def _dots(ax, c, label=None):
+            return ax.plot([], [], 'o', color=c, label=label, animated=animated)[0]
+
+        self.banks = []
+        for ax in (self.ax_cur, self.ax_next):
+            self.banks.append({
+                'green' : _dots(ax, 'green',  "in_point / crossfade_in_end"),
+                'purple': _dots(ax, 'purple', "crossfade_out_begin / out_point"),
+            })
+        self.play_cur  = _dots(self.ax_cur,  'red', "play")
+        self.play_next = _dots(self.ax_next, 'red', "play")
+
+        y0, y1 = 0, y_max
+        self.cur_rect = self.ax_cur.add_patch(Rectangle(
+            (0, y0 + 5), 0, y1 - y0 - 10, color='orange', alpha=0.2, animated=animated,
+            label="Crossfade"))
+        self.next_rect = self.ax_next.add_patch(Rectangle(
+            (0, y0 + 5), 0, y1 - y0 - 10, color='orange', alpha=0.2, animated=animated,
+            label="Crossfade"))
+        for ax in (self.ax_cur, self.ax_next):
+            ax.legend(loc='upper right', fontsize=7, ncol=4)
+
+        self.stats_text = self.ax_hist.text(0.01, 0.95, '', transform=self.ax_hist.transAxes,
+                                            va='top', fontsize=8, animated=animated)
+        self.shown_clip = None
+
+        self.artists = [self.play_cur, self.play_next, *self.hist_lines, self.hist_cursor,
+                        self.cur_rect, self.next_rect, self.stats_text]
+        for dots in self.banks:
+            self.artists += dots.values()
+
+    def _place(self, dots, in_pt, out_pt):
+        points = {'in_point': in_pt, 'crossfade_in_end': in_pt + self.cf,
+                  'crossfade_out_begin': out_pt - self.cf, 'out_point': out_pt}
+        for color, line in dots.items():
+            idx = [points[k] for k in mk_keys if mk_color[k] == color]
+            line.set_data(np.repeat(idx, len(self.channels)), self.channels[:, idx].T.ravel())
+
+    def _set_clips(self, clip):
+        in_pt, out_pt, next_in, next_out = clip
+        self._place(self.banks[0], in_pt, out_pt)
+        self._place(self.banks[1], next_in, next_out)
+        self.cur_rect.set_x(out_pt - self.cf)
+        self.cur_rect.set_width(self.cf)
+        self.next_rect.set_x(next_in)
+        self.next_rect.set_width(self.cf)
+        self.shown_clip = clip
+
+    def show(self, frames, i):
+        clip = (int(frames.in_point[i]), int(frames.out_point[i]),
+                int(frames.next_in_point[i]), int(frames.next_out_point[i]))
+        if clip != self.shown_clip:
+            self._set_clips(clip)
+
+        idx = int(frames.frame[i])
+        px = frames.values[:, i]
+        self.play_cur.set_data(np.full(px.size, idx), px)
+
+        idx2 = int(frames.second[i])
+        if idx2 >= 0:
+            self.play_next.set_data(np.full(px.size, idx2), px)   # gleicher y-Wert wie oben
+        else:
+            self.play_next.set_data([], [])
+
+        self.hist_buf[:, self.hist_pos] = px
+        for line, row in zip(self.hist_lines, self.hist_buf):
+            line.set_ydata(row)
+        self.hist_cursor.set_xdata([self.hist_pos, self.hist_pos])
+        self.hist_pos = (self.hist_pos + 1) % self.history_length
+        return self.artists
+
+
+class ClipMonitor:
+    """
+    Interaktive Anzeige: ClipView + FuncAnimation mit Zeitmessung.
+    Update = Rechenzeit in _update, Frame = _update + Zeichnen und Blit
+    der Artists (gemessen in einem zweiten Timer-Callback, der im selben
+    Tick nach dem von FuncAnimation läuft).
+    """
+    def __init__(self, cutter, history_length=None, interval_ms=INTERVAL_MS):
+        self.cutter = cutter
+        self.interval_ms = interval_ms
+        self.view = ClipView(cutter.channels, cutter.crossfade_length, history_length)
+        self.frames = cutter.render(CHUNK_FRAMES)
+        self.i = 0
+        self.n_frames = 0
+        self.update_ms = np.zeros(FPS)     # Rechenzeit in _update, letzte FPS Frames
+        self.frame_ms = np.zeros(FPS)      # ganzer Frame inkl. Zeichnen/Blit
+        self.t_frame = None
+        self.t_last = None
+        self.interval_avg = interval_ms
+
+    def _update(self, _):
+        t0 = self.t_frame = time.perf_counter()
+        if self.i == self.frames.frame.size:
+            self.frames = self.cutter.render(CHUNK_FRAMES)
+            self.i = 0
+        artists = self.view.show(self.frames, self.i)
+        self.i += 1
+
+        # Frame-Intervall (gleitend) und Rechenzeit im Callback
+        if self.t_last is not None:
+            self.interval_avg += 0.1 * ((t0 - self.t_last) * 1e3 - self.interval_avg)
+        self.t_last = t0
+        self.update_ms[self.n_frames % FPS] = (time.perf_counter() - t0) * 1e3
+        return artists
+
+    def _frame_done(self):
+        """Timer-Callback nach FuncAnimation: Artists sind gezeichnet und geblittet."""
+        if self.t_frame is None:
+            return
+        self.frame_ms[self.n_frames % FPS] = (time.perf_counter() - self.t_frame) * 1e3
+        self.t_frame = None
+        self.n_frames += 1
+        if self.n_frames % FPS == 0:
+            # Text nur einmal pro Sekunde neu setzen (Layout bleibt gecacht)
+            self.view.stats_text.set_text(
+                f"Frame {self.frame_ms.mean():.2f} ms (max {self.frame_ms.max():.2f}), "
+                f"davon Update {self.update_ms.mean():.2f} ms, "
+                f"Intervall {self.interval_avg:.1f} ms = {1000 / self.interval_avg:.1f} fps")
+
+    def run(self):
+        self.ani = animation.FuncAnimation(self.view.fig, self._update,
+                                           interval=self.interval_ms,
+                                           blit=True,
+                                           cache_frame_data=False)
+        self.ani.event_source.add_callback(self._frame_done)
+        plt.tight_layout()
+        plt.show()
+
+
+if __name__ == "__main__":
+    program = load_light_program()
+    cutter = ClipCutter(program['channels'], program['fade_frames'])
+    ClipMonitor(cutter).run()
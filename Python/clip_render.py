@@ -0,0 +1,182 @@
+import os
+import zlib
+import random
+import shutil
+import struct
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from clip_cutter import ClipCutter, Well512Block, load_light_program, FPS
+from clip_monitor import ClipView
+
+# =============================================================
+# Offline-Rendering der Clip-Animation (Agg, ohne Fenster)
+#
+# Die Frames [start, stop) werden in Stücke aufgeteilt; jeder Worker
+# bekommt nur (Cutter im Startzustand, first, last), spult den RNG mit
+# ClipCutter.skip() vor (nur Clip-Koordinaten, wie clip_stats.py) und
+# rechnet seine Frames samt History-Vorlauf selbst. Der Elternprozess
+# rechnet und verschickt keine Frame-Daten.
+# Jeder Worker zeichnet den statischen Hintergrund einmal und pro Frame
+# nur die animierten Artists darüber.
+# Ausgabe: PNG-Sequenz (Ordner) oder Video (über ffmpeg).
+# PNGs werden direkt geschrieben (Filter "None", zlib Stufe 1): Pillows
+# Encoder mit adaptiver Zeilenfilterung brauchte pro Frame etwa 3x so
+# lange wie das Zeichnen und begrenzte das Ganze auf ~1x Echtzeit.
+# =============================================================
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.mov', '.avi')
+
+
+def _ffmpeg():
+    path = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+    if path is None:
+        raise RuntimeError("ffmpeg nicht gefunden – Video-Export nicht möglich, "
+                           "stattdessen einen Ordner für die PNG-Sequenz angeben")
+    return path
+
+
+def _png_chunk(tag, data):
+    return (struct.pack(">I", len(data)) + tag + data
+            + struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+
+class _PngWriter:
+    """RGB-PNGs aus einem RGBA-Puffer fester Größe (Filter None, zlib Stufe 1)."""
+    def __init__(self, width, height):
+        self.header = (b"\x89PNG\r\n\x1a\n"
+                       + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        # jede Zeile: Filterbyte 0 + RGB
+        self.rows = np.zeros((height, 1 + 3 * width), dtype=np.uint8)
+        self.rgb = self.rows[:, 1:].reshape(height, width, 3)
+
+    def write(self, path, rgba):
+        self.rgb[...] = np.asarray(rgba)[..., :3]
+        with open(path, "wb") as f:
+            f.write(self.header)
+            f.write(_png_chunk(b"IDAT", zlib.compress(self.rows, 1)))
+            f.write(_png_chunk(b"IEND", b""))
+
+
+def _render_chunk(job):
+    cutter, history_length, dpi, first, last, target = job
+
+    # RNG vorspulen und History-Vorlauf + eigenes Stück selbst rechnen
+    first_warm = max(0, first - history_length)
+    cutter.skip(first_warm)
+    frames = cutter.render(last - first_warm)
+    lo = first - first_warm
+    warm = frames.values[:, :lo]
+    frames = type(frames)(*(f[..., lo:] for f in frames))
+
+    fig = Figure(figsize=(9, 8), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    view = ClipView(cutter.channels, cutter.crossfade_length, history_length, fig=fig)
+    fig.tight_layout()
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    # History mit den Frames vor dem Stück füllen -> Ergebnis unabhängig
+    # von der Aufteilung
+    H = view.history_length
+    n_warm = warm.shape[1]
+    view.hist_buf[:, (first - n_warm + np.arange(n_warm)) % H] = warm
+    view.hist_pos = first % H
+
+    width, height = canvas.get_width_height()
+    if target.endswith(VIDEO_EXTENSIONS):
+        ffmpeg = subprocess.Popen(
+            [_ffmpeg(), '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(FPS),
+             # yuv420p braucht gerade Breite/Höhe (je nach dpi ungerade)
+             '-i', '-', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+             '-c:v', 'libx264', '-pix_fmt', 'yuv420p', target],
+            stdin=subprocess.PIPE)
+        write = ffmpeg.stdin.write
+    else:
+        ffmpeg = None
+        png = _PngWriter(width, height)
+
+    for i in range(frames.frame.size):
+        artists = view.show(frames, i)
+        canvas.restore_region(background)
+        for a in artists:
+            a.axes.draw_artist(a)
+        rgba = canvas.buffer_rgba()
+        if ffmpeg is not None:
+            write(rgba)
+        else:
+            png.write(os.path.join(target, f"frame_{first + i:07d}.png"), rgba)
+
+    if ffmpeg is not None:
+        ffmpeg.stdin.close()
+        if ffmpeg.wait() != 0:
+            raise RuntimeError(f"ffmpeg-Fehler beim Schreiben von {target}")
+    return target
+
+
+def render_offline(cutter, start, stop, out, workers=None, chunk_frames=FPS * 20, dpi=100):
+    """
+    Rendert die Frames [start, stop) des Cutters nach out: Ordner -> PNGs
+    frame_0000123.png, Dateiname mit Video-Endung -> ein Video.
+    Der Cutter muss am Frame 0 stehen (frisch angelegt); jeder Worker
+    bekommt eine Kopie und spult selbst zu seinem Stück vor.
+    """
+    history_length = cutter.total_length
+    video = out.endswith(VIDEO_EXTENSIONS)
+    if video:
+        ffmpeg = _ffmpeg()
+        parts_dir = out + ".parts"
+        os.makedirs(parts_dir, exist_ok=True)
+    else:
+        os.makedirs(out, exist_ok=True)
+
+    jobs = []
+    for first in range(start, stop, chunk_frames):
+        last = min(first + chunk_frames, stop)
+        target = os.path.join(parts_dir, f"part_{first:07d}.mp4") if video else out
+        jobs.append((cutter, history_length, dpi, first, last, target))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_render_chunk, jobs))
+
+    if video:
+        # Teilvideos ohne Neukodierung aneinanderhängen
+        list_file = os.path.join(parts_dir, "parts.txt")
+        with open(list_file, "w", encoding="utf-8") as f:
+            f.writelines(f"file '{os.path.abspath(p)}'\n" for p in parts)
+        subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                        '-i', list_file, '-c', 'copy', out], check=True)
+        shutil.rmtree(parts_dir)
+    return out
+
+
+if __name__ == "__main__":
+    import time
+
+    parser = argparse.ArgumentParser(description="Clip-Animation offline rendern")
+    parser.add_argument("out", help="Ordner für PNGs oder Videodatei (.mp4, ...)")
+    parser.add_argument("--start", type=int, default=0, help="erster Frame")
+    parser.add_argument("--stop", type=int, default=FPS * 60, help="Frame nach dem letzten")
+    parser.add_argument("--seed", type=int, default=None, help="Seed für den Well512-Startzustand")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    program = load_light_program()
+    cutter = ClipCutter(program['channels'], program['fade_frames'],
+                        Well512Block([rng.getrandbits(32) for _ in range(16)]))
+
+    t0 = time.perf_counter()
+    render_offline(cutter, args.start, args.stop, args.out, args.workers)
+    dt = time.perf_counter() - t0
+    n = args.stop - args.start
+    print(f"{n} Frames ({n / FPS:.1f} s Wiedergabe) in {dt:.1f} s = {n / dt:.1f} fps "
+          f"({n / FPS / dt:.1f}x Echtzeit)")
@@ -0,0 +1,214 @@
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from clip_cutter import Well512Block, clip_coords, load_light_program
+
+# =============================================================
+# Monte-Carlo-Statistik für create_new_clip_coords()
+#
+# Zieht Millionen Clips mit Well512Block (Prozesse starten per
+# jump() an disjunkten Stellen derselben Zufallsfolge) und sammelt:
+#  - Histogramme von in_point, out_point und Cliplängen
+#  - wie oft jedes Sample gespielt wird (normal / als Crossfade-Eingang)
+#  - Sprunghöhen an den Crossfade-Nahtstellen
+# Alles wird als Histogramm akkumuliert, die Ergebnisse der Prozesse
+# lassen sich daher einfach addieren. Für die Nahtstellen wird nur
+# gezählt, wie oft jedes Paar (out_point, nächster in_point) vorkommt,
+# dünn als sortierte Schlüssel out_point * L + next_in mit Anzahl (es
+# gibt höchstens so viele Paare wie Clips, nicht L²); die Sprünge werden
+# danach einmal pro vorkommendem Paar berechnet.
+# =============================================================
+
+JUMP_EDGES = np.linspace(0, 256, 1025)     # 0.25er Klassen für Sprunghöhen (Plot)
+PERCENTILES = (50, 90, 99, 99.9, 100)
+SUB_BATCH = 20000                          # Clips pro Vektor-Durchgang
+
+
+def _seam_steps(x, out_pt, next_in, w_in):
+    """
+    Maximale Sprunghöhe je Nahtstelle und Kanal. Die Folge an der Naht ist
+    x[o-cf-1], Crossfade y_0..y_cf, x[i+cf+1] (vgl. get_next_pixel()).
+    x: (Kanäle, L), Rückgabe (Kanäle, Nähte).
+    """
+    cf = w_in.size - 1
+    j = np.arange(cf + 1)
+    frames_out = out_pt[:, np.newaxis] - cf + j
+    frames_in  = next_in[:, np.newaxis] + j
+    fade = (1.0 - w_in) * x[:, frames_out] + w_in * x[:, frames_in]
+    seq = np.concatenate((x[:, out_pt - cf - 1][..., np.newaxis], fade,
+                          x[:, next_in + cf + 1][..., np.newaxis]), axis=-1)
+    return np.abs(np.diff(seq, axis=-1)).max(axis=-1)
+
+
+def _merge_pairs(keys, counts):
+    """Paarzählungen [(Schlüssel, Anzahl), ...] zu einer sortierten Zählung zusammenfassen."""
+    keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    return keys, np.bincount(inverse, weights=np.concatenate(counts)).astype(np.int64)
+
+
+def _stats_chunk(job):
+    state, first_clip, n_clips, total, cf = job
+
+    well = Well512Block(*state)
+    well.jump(2 * first_clip)
+
+    res = {
+        'in_hist'     : np.zeros(total, dtype=np.int64),
+        'out_hist'    : np.zeros(total, dtype=np.int64),
+        'length_hist' : np.zeros(total, dtype=np.int64),    # out - in
+        'played_hist' : np.zeros(total, dtype=np.int64),    # Frames pro Clip im Dauerbetrieb
+        'cover_main'  : np.zeros(total, dtype=np.int64),
+        'cover_fade'  : np.zeros(total, dtype=np.int64),
+    }
+    pair_keys = np.zeros(0, dtype=np.int64)      # out_point * L + next_in, sortiert
+    pair_counts = np.zeros(0, dtype=np.int64)
+
+    # letzter Clip des Stücks braucht den ersten des nächsten als Partner
+    raw = well.fill(2).astype(np.int64)
+    prev_in, prev_out = clip_coords(raw[0], raw[1], total, cf)
+    for done in range(0, n_clips, SUB_BATCH):
+        k = min(SUB_BATCH, n_clips - done)
+        raw = well.fill(2 * k).astype(np.int64)
+        new_in, new_out = clip_coords(raw[0::2], raw[1::2], total, cf)
+        in_pt  = np.concatenate(([prev_in], new_in[:-1]))
+        out_pt = np.concatenate(([prev_out], new_out[:-1]))
+        next_in = new_in
+        prev_in, prev_out = new_in[-1], new_out[-1]
+
+        res['in_hist']     += np.bincount(in_pt, minlength=total)
+        res['out_hist']    += np.bincount(out_pt, minlength=total)
+        res['length_hist'] += np.bincount(out_pt - in_pt, minlength=total)
+        res['played_hist'] += np.bincount(out_pt - in_pt - cf, minlength=total)
+
+        # Differenzen-Array: +1 am Anfang, -1 hinter dem Ende jedes Bereichs
+        res['cover_main'] += np.cumsum(np.bincount(in_pt + cf + 1, minlength=total + 1)
+                                       - np.bincount(out_pt + 1, minlength=total + 1))[:total]
+        res['cover_fade'] += np.cumsum(np.bincount(next_in, minlength=total + 1)
+                                       - np.bincount(next_in + cf + 1, minlength=total + 1))[:total]
+
+        keys, counts = np.unique(out_pt * total + next_in, return_counts=True)
+        pair_keys, pair_counts = _merge_pairs([pair_keys, keys], [pair_counts, counts])
+    return res, pair_keys, pair_counts
+
+
+def _weighted_percentiles(values, weights, q=PERCENTILES):
+    order = np.argsort(values)
+    cum = np.cumsum(weights[order]) / weights.sum()
+    return {p: values[order[min(np.searchsorted(cum, p / 100 - 1e-12), values.size - 1)]]
+            for p in q}
+
+
+def clip_statistics(channels, crossfade_length, n_clips, seed=None, workers=None, chunks=None):
+    """
+    Statistik über n_clips aufeinanderfolgende Clips (Dauerbetrieb, d. h.
+    jeder Clip startet bei in_point + crossfade_length + 1).
+    channels: (Kanäle, L) oder 1-D wie pixel_values.
+    """
+    channels = np.atleast_2d(np.asarray(channels))
+    rng = random.Random(seed)
+    state = ([rng.getrandbits(32) for _ in range(16)], 0)
+
+    chunks = chunks or max(1, min(64, n_clips // SUB_BATCH))
+    bounds = np.linspace(0, n_clips, chunks + 1).astype(np.int64)
+    total = channels.shape[1]
+    jobs = [(state, int(a), int(b - a), total, crossfade_length)
+            for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_stats_chunk, jobs))
+    res = {key: sum(p[key] for p, _, _ in parts) for key in parts[0][0]}
+    pairs, counts = _merge_pairs([k for _, k, _ in parts], [c for _, _, c in parts])
+
+    # Nahtstellen: jedes vorkommende Paar einmal auswerten, mit Häufigkeit gewichten
+    cf = crossfade_length
+    x = channels.astype(np.float64)
+    w_in = 0.5 * (1 - np.cos(np.pi * np.arange(cf + 1) / cf))
+    out_pt, next_in = pairs // total, pairs % total
+    steps = np.concatenate([_seam_steps(x, out_pt[i:i + SUB_BATCH], next_in[i:i + SUB_BATCH], w_in)
+                            for i in range(0, pairs.size, SUB_BATCH)], axis=-1)
+    level = np.abs(x[:, out_pt - cf] - x[:, next_in])
+
+    res['n_clips'] = n_clips
+    res['crossfade_length'] = cf
+    res['jump_hist']  = np.array([np.histogram(v, JUMP_EDGES, weights=counts)[0] for v in steps])
+    res['jump_percentiles']  = [_weighted_percentiles(v, counts) for v in steps]
+    res['level_percentiles'] = [_weighted_percentiles(v, counts) for v in level]
+    # Vergleich: Sprünge im Programm selbst (ohne Schnitt)
+    res['program_percentiles'] = [_weighted_percentiles(np.abs(np.diff(ch)), np.ones(total - 1))
+                                  for ch in x]
+    return res
+
+
+def print_summary(res):
+    cf = res['crossfade_length']
+    lengths = np.arange(res['played_hist'].size)
+    mean_played = (lengths * res['played_hist']).sum() / res['n_clips']
+    cover = res['cover_main'] + res['cover_fade']
+    print(f"{res['n_clips']} Clips, Crossfade {cf} Frames")
+    print(f"  gespielte Frames pro Clip: Mittel {mean_played:.1f}, "
+          f"min {np.flatnonzero(res['played_hist'])[0]}, max {np.flatnonzero(res['played_hist'])[-1]}")
+    print(f"  Abdeckung: nie gespielt {np.count_nonzero(cover == 0)} Samples, "
+          f"max/min (gespielte) {cover.max() / cover[cover > 0].min():.1f}")
+    for ch, (jp, lp, pp) in enumerate(zip(res['jump_percentiles'], res['level_percentiles'],
+                                          res['program_percentiles'])):
+        fmt = lambda d: ", ".join(f"P{p:g}={v:.2f}" for p, v in d.items())
+        print(f"  ch{ch} Naht max. Sprung: {fmt(jp)}")
+        print(f"      Pegeldifferenz out/in: {fmt(lp)}")
+        print(f"      Programm ohne Schnitt: {fmt(pp)}")
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    parser = argparse.ArgumentParser(description="Monte-Carlo-Statistik der Clip-Auswahl")
+    parser.add_argument("--clips", type=int, default=1_000_000)
+    parser.add_argument("--crossfade", type=int, default=None, help="Standard: fade_frames aus candle.c")
+    parser.add_argument("--length", type=int, default=None, help="Programm auf diese Länge kürzen")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+
+    program = load_light_program()
+    channels = program['channels'][:, :args.length]
+    cf = args.crossfade or program['fade_frames']
+
+    t0 = time.perf_counter()
+    res = clip_statistics(channels, cf, args.clips, args.seed, args.workers)
+    print(f"Laufzeit {time.perf_counter() - t0:.2f} s")
+    print_summary(res)
+
+    if not args.no_plot:
+        total = channels.shape[1]
+        fig, axs = plt.subplots(4, 1, figsize=(10, 11))
+        axs[0].plot(res['in_hist'], label='in_point')
+        axs[0].plot(res['out_hist'], label='out_point')
+        axs[0].set_title("Verteilung der Schnittpunkte")
+        axs[0].set_xlabel("Sample")
+        axs[0].legend()
+
+        axs[1].plot(res['played_hist'] / res['n_clips'], color='black')
+        axs[1].set_title("Gespielte Frames pro Clip")
+        axs[1].set_xlabel("Frames")
+        axs[1].set_xlim(0, total)
+
+        axs[2].stackplot(np.arange(total), res['cover_main'], res['cover_fade'],
+                         labels=['normal', 'Crossfade-Eingang'])
+        axs[2].set_title("Wie oft wird jedes Sample gespielt?")
+        axs[2].set_xlabel("Sample")
+        axs[2].legend()
+
+        for ch, h in enumerate(res['jump_hist']):
+            axs[3].plot(JUMP_EDGES[1:], np.cumsum(h) / h.sum(), label=f"ch{ch}")
+        axs[3].set_xscale('symlog', linthresh=1)
+        axs[3].set_title("Max. Sprung an der Naht (kumulativ)")
+        axs[3].set_xlabel("Sprung (Pixelwert)")
+        axs[3].legend()
+        for ax in axs:
+            ax.grid(True)
+        plt.tight_layout()
+        plt.show()
@@ -0,0 +1,238 @@
+import os
+import random
+import struct
+import asyncio
+import argparse
+
+import numpy as np
+
+from clip_cutter import ClipCutter, Well512Block, load_light_program, FPS
+
+# =============================================================
+# Frame-Streaming im festen FPS-Takt (asyncio, ohne FuncAnimation)
+#
+# Frame k wird zum Termin t0 + k / fps ausgegeben. Der Termin wird
+# jedes Mal aus k berechnet, nicht aufaddiert -> keine Drift, auch
+# nach Stunden nicht. Ein verspäteter Frame verschiebt die folgenden
+# nicht; er wird gezählt und trotzdem ausgegeben.
+# Mehrere Streams (z. B. mehrere Controller) laufen auf einer
+# Event-Loop mit gemeinsamem t0.
+#
+# Paketformat (an die Senke):
+#   0xA5, Stream-ID (uint8), Frame-Zähler (uint16 LE), ein Byte pro Kanal
+# =============================================================
+
+CHUNK_FRAMES = FPS * 10     # so viele Frames pro ClipCutter.render()
+SYNC = 0xA5
+START_DELAY = 0.1           # Vorlauf vor Frame 0 (erster render() aller Streams)
+JITTER_BINS_MS = np.array([0.5, 1, 2, 5, 10, 20, 40, np.inf])
+
+
+def encode_frame(stream_id, k, values):
+    return struct.pack('<BBH', SYNC, stream_id, k & 0xFFFF) + bytes(values)
+
+
+class StreamStats:
+    """Jitter (Ausgabezeit - Termin) und Zähler für verspätete Frames."""
+    def __init__(self, fps=FPS):
+        self.period = 1.0 / fps
+        self.n_frames = 0
+        self.late = 0                  # nach dem Termin des nächsten Frames
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+        self.jitter_hist = np.zeros(JITTER_BINS_MS.size, dtype=np.int64)
+
+    def add(self, jitter):
+        self.n_frames += 1
+        self.jitter_sum += jitter
+        self.jitter_max = max(self.jitter_max, jitter)
+        if jitter >= self.period:
+            self.late += 1
+        self.jitter_hist[np.searchsorted(JITTER_BINS_MS, jitter * 1e3)] += 1
+
+    def report(self):
+        mean = self.jitter_sum / max(1, self.n_frames)
+        return (f"{self.n_frames} Frames, Jitter Mittel {mean * 1e3:.2f} ms, "
+                f"max {self.jitter_max * 1e3:.2f} ms, verspätet {self.late}")
+
+
+# -------------------------------------------------------------
+# Senken: async write(packet) und close()
+# -------------------------------------------------------------
+class CallbackSink:
+    def __init__(self, callback):
+        self.callback = callback
+
+    async def write(self, packet):
+        self.callback(packet)
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    def __init__(self, path):
+        self.f = open(path, "wb")
+
+    async def write(self, packet):
+        self.f.write(packet)
+
+    def close(self):
+        self.f.close()
+
+
+class PtySink:
+    """
+    Pseudo-Terminal als Ersatz für den UART des LED-Controllers. Das
+    Gegenstück (z. B. ein Test-Skript mit pyserial) öffnet slave_name.
+    Liest niemand mit, werden Pakete verworfen und als overruns gezählt,
+    statt die Event-Loop zu blockieren. Ein angefangenes Paket wird
+    dagegen immer vollständig geschrieben (sonst ginge die Paketgrenze
+    verloren): auf den Rest wird per add_writer gewartet.
+    """
+    def __init__(self):
+        self.master, self.slave = os.openpty()
+        self.slave_name = os.ttyname(self.slave)
+        os.set_blocking(self.master, False)
+        self.overruns = 0
+
+    async def write(self, packet):
+        try:
+            n = os.write(self.master, packet)
+        except BlockingIOError:
+            self.overruns += 1
+            return
+        rest = memoryview(packet)[n:]
+        while rest:
+            await self._writable()
+            try:
+                rest = rest[os.write(self.master, rest):]
+            except BlockingIOError:
+                pass
+
+    async def _writable(self):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_writer(self.master, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_writer(self.master)
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+
+class SocketSink:
+    """TCP-Verbindung, z. B. zu einer Seriell-über-TCP-Brücke."""
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.writer = None
+
+    async def write(self, packet):
+        if self.writer is None:
+            _, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(packet)
+        await self.writer.drain()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+# -------------------------------------------------------------
+# Streams
+# -------------------------------------------------------------
+class ClipStream:
+    """
+    Gibt die Frames eines ClipCutters im Takt fps an eine Senke aus.
+    frames() ist der zugrundeliegende async Generator und kann auch
+    direkt benutzt werden.
+    """
+    def __init__(self, cutter, sink, stream_id=0, fps=FPS):
+        self.cutter = cutter
+        self.sink = sink
+        self.stream_id = stream_id
+        self.fps = fps
+        self.stats = StreamStats(fps)
+
+    async def frames(self, n_frames=None, t0=None):
+        """Liefert (k, Pixelwerte als uint8) jeweils zum Termin von Frame k."""
+        loop = asyncio.get_running_loop()
+        t0 = loop.time() if t0 is None else t0
+        k = 0
+        while n_frames is None or k < n_frames:
+            block = self.cutter.render(CHUNK_FRAMES)
+            values = np.clip(np.rint(block.values), 0, 255).astype(np.uint8).T
+            for px in values:
+                if n_frames is not None and k >= n_frames:
+                    return
+                deadline = t0 + k / self.fps
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.stats.add(loop.time() - deadline)
+                yield k, px
+                k += 1
+
+    async def run(self, n_frames=None, t0=None):
+        try:
+            async for k, px in self.frames(n_frames, t0):
+                await self.sink.write(encode_frame(self.stream_id, k, px))
+        finally:
+            self.sink.close()
+
+
+async def run_streams(streams, n_frames=None, report_s=None):
+    """Alle Streams auf der laufenden Event-Loop, gemeinsames t0."""
+    t0 = asyncio.get_running_loop().time() + START_DELAY
+    tasks = [asyncio.ensure_future(s.run(n_frames, t0)) for s in streams]
+
+    async def reporter():
+        while True:
+            await asyncio.sleep(report_s)
+            for s in streams:
+                print(f"Stream {s.stream_id}: {s.stats.report()}")
+
+    rep = asyncio.ensure_future(reporter()) if report_s else None
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        if rep is not None:
+            rep.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clip-Frames im FPS-Takt ausgeben")
+    parser.add_argument("--streams", type=int, default=1, help="Anzahl paralleler Streams")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--sink", choices=["null", "file", "pty", "socket"], default="null")
+    parser.add_argument("--out", default="stream", help="Dateipräfix (file) oder host:port (socket)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    program = load_light_program()
+    rng = random.Random(args.seed)
+
+    def make_sink(i):
+        if args.sink == "file":
+            return FileSink(f"{args.out}_{i}.bin")
+        if args.sink == "pty":
+            sink = PtySink()
+            print(f"Stream {i}: {sink.slave_name}")
+            return sink
+        if args.sink == "socket":
+            host, port = args.out.rsplit(":", 1)
+            return SocketSink(host, int(port))
+        return CallbackSink(lambda packet: None)
+
+    streams = [ClipStream(ClipCutter(program['channels'], program['fade_frames'],
+                                     Well512Block([rng.getrandbits(32) for _ in range(16)])),
+                          make_sink(i), stream_id=i)
+               for i in range(args.streams)]
+    asyncio.run(run_streams(streams, int(args.seconds * FPS), report_s=5))
+    for s in streams:
+        print(f"Stream {s.stream_id}: {s.stats.report()}")
+        print("  Jitter-Histogramm (ms bis):",
+              ", ".join(f"{b:g}: {n}" for b, n in zip(JITTER_BINS_MS, s.stats.jitter_hist)))
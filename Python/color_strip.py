@@ -0,0 +1,66 @@
+import numpy as np
+
+# =============================================================
+# Signal als Helligkeits-/Farbband mit einem einzigen Bild-Artist
+#
+# Ersetzt Schleifen wie
+#   for i in range(1, n): ax.axvspan(t[i-1], t[i], color=(g, g, g))
+# (ein Patch pro Sample -> Zeichnen dauert länger als die Simulation).
+# Die Samples werden auf Pixelspalten der Achse gemittelt und als
+# 1 x Spalten-Bild mit imshow gezeichnet; Aufwand O(Samples) beim
+# Aufbau, beim Zeichnen nur noch ein Bild.
+# =============================================================
+
+
+def strip_columns(t, values, n_columns):
+    """Mittelwert von values je Spalte (gleich breit über t[0]..t[-1])."""
+    t = np.asarray(t, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    edges = np.linspace(t[0], t[-1], n_columns + 1)
+    col = np.clip(np.searchsorted(edges, t, side='right') - 1, 0, n_columns - 1)
+    counts = np.bincount(col, minlength=n_columns)
+    flat = values.reshape(t.size, -1)
+    sums = np.stack([np.bincount(col, weights=c, minlength=n_columns) for c in flat.T], axis=-1)
+    means = sums / np.maximum(counts, 1)[:, np.newaxis]
+    # weniger Samples als Spalten: leere Spalten zeigen das vorherige Sample
+    filled = np.maximum.accumulate(np.where(counts > 0, np.arange(n_columns), 0))
+    return means[filled].reshape((n_columns,) + values.shape[1:])
+
+
+def color_strip(ax, t, values, cmap='gray', vmin=0.0, vmax=1.0, n_columns=None, y=(0.0, 1.0),
+                **kwargs):
+    """
+    Zeichnet values über t als Band zwischen y[0] und y[1].
+    values: (N,) -> Farbtabelle cmap (vmin..vmax), (N, 3) bzw. (N, 4) -> RGB(A) 0..1.
+    n_columns: Standard ist die Breite der Achse in Bildschirmpixeln.
+    """
+    if n_columns is None:
+        n_columns = max(int(np.ceil(ax.get_window_extent().width)), 1)
+    image = strip_columns(t, values, n_columns)[np.newaxis]
+    return ax.imshow(image, cmap=cmap, vmin=vmin, vmax=vmax, aspect='auto', origin='lower',
+                     interpolation='nearest', extent=(t[0], t[-1], y[0], y[1]), **kwargs)
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    t = np.linspace(0, 1e-3, 2_000_000)
+    v = 0.5 + 0.5 * np.sin(2 * np.pi * 5e3 * t) * np.exp(-t / 4e-4)
+    rgb = np.stack((v, 1 - v, np.full_like(v, 0.3)), axis=-1)
+
+    fig, axs = plt.subplots(2, 1, figsize=(10, 3), sharex=True)
+    t0 = time.perf_counter()
+    color_strip(axs[0], t * 1e6, v)
+    color_strip(axs[1], t * 1e6, rgb)
+    fig.canvas.draw()
+    print(f"{t.size} Samples, 2 Bänder, Aufbau + Zeichnen: {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+    # Vergleich: axvspan pro Sample, nur 2000 Samples
+    fig2, ax = plt.subplots(figsize=(10, 1.5))
+    t0 = time.perf_counter()
+    for i in range(1, 2000):
+        ax.axvspan(t[i - 1] * 1e6, t[i] * 1e6, color=(v[i],) * 3)
+    fig2.canvas.draw()
+    print(f"axvspan, 2000 Samples: {(time.perf_counter() - t0) * 1e3:.0f} ms")
+    plt.show()
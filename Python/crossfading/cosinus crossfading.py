@@ -1,6 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from fade_curves import crossfade_inplace, balance as fade_balance
+
 # Parameter
 fs = 1000  # Samplingrate in Hz
 duration = 2.0  # Gesamtdauer in Sekunden
@@ -13,22 +15,16 @@ x2 = 0.5 * np.sign(np.cos(2 * np.pi * 5 * t))      # Rechtecksignal mit Amplitud
 # Crossfade von 0.5 s bis 1.5 s (über 1 Sekunde)
 fade_start = 0.5
 fade_end = 1.5
-balance = np.zeros_like(t)
 
 # Indizes für Start und Ende des Fades
 idx_start = int(fade_start * fs)
 idx_end = int(fade_end * fs)
 
-# Cosinusförmige Crossfade-Kurve im Bereich (0.5 s bis 1.5 s)
-fade_range = np.linspace(0, np.pi, idx_end - idx_start)
-cos_fade = (1 - np.cos(fade_range)) / 2
-balance[idx_start:idx_end] = cos_fade
-
-# Nach dem Fade: balance = 1
-balance[idx_end:] = 1
+# Crossfade-Anwendung (fade_curves.py): nur das Fade-Fenster wird gerechnet
+y = crossfade_inplace(x1.copy(), x2, idx_start, idx_end, 'cosine')
 
-# Crossfade-Anwendung
-y = x1 + balance * (x2 - x1)
+# Balance-Verlauf für den Plot: cosinusförmig 0 → 1 im Fade-Bereich, danach 1
+balance = fade_balance(t.size, idx_start, idx_end, 'cosine')
 
 # Plotten
 plt.figure(figsize=(14, 10))
@@ -1,6 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from fade_curves import crossfade_inplace, balance as fade_balance
+
 # Parameter
 fs = 1000  # Samplingrate in Hz
 duration = 2.0  # Gesamtdauer in Sekunden
@@ -13,21 +15,16 @@ x2 = 0.5 * np.sign(np.cos(2 * np.pi * 5 * t))      # Rechtecksignal mit Amplitud
 # Crossfade von 1 s bis 1 s (über 0 Sekunden)
 fade_start = 1
 fade_end = 1
-balance = np.zeros_like(t)
 
 # Indizes für Start und Ende des Fades
 idx_start = int(fade_start * fs)
 idx_end = int(fade_end * fs)
 
-# Balance im Fade-Bereich (hier: kein Bereich)
-if idx_end > idx_start:
-    balance[idx_start:idx_end] = np.linspace(0, 1, idx_end - idx_start)
-
-# Nach dem Fade: balance = 1
-balance[idx_end:] = 1
+# Crossfade-Anwendung (fade_curves.py): nur das Fade-Fenster wird gerechnet
+y = crossfade_inplace(x1.copy(), x2, idx_start, idx_end, 'jump')
 
-# Crossfade-Anwendung
-y = x1 + balance * (x2 - x1)
+# Balance-Verlauf für den Plot: Sprung von 0 auf 1 bei idx_end
+balance = fade_balance(t.size, idx_start, idx_end, 'jump')
 
 # Plotten
 plt.figure(figsize=(14, 10))
@@ -0,0 +1,112 @@
+import numpy as np
+
+# =============================================================
+# Crossfade-Kurven für viele Kanalpaare auf einmal
+#
+# x1, x2: (Kanäle, Samples), typischerweise float32. Der Fade läuft
+# von idx_start bis idx_end (exklusiv):
+#   vor dem Fade   y = x1          (bleibt unangetastet)
+#   im Fade        y = g_out * x1 + g_in * x2
+#   nach dem Fade  y = x2          (nur kopiert)
+# crossfade_inplace() schreibt das Ergebnis nach x1 und legt dabei nur
+# Zwischenwerte in Größe des Fade-Fensters an (blockweise über Kanäle).
+# Die Kurven entsprechen den Skripten crossfade jump/linear.py und
+# cosinus crossfading.py, dazu Equal-Power (konstante Leistung).
+# =============================================================
+
+CURVES = ('jump', 'linear', 'cosine', 'equal_power')
+ROW_BLOCK = 256        # Kanäle pro Durchgang im Fade-Fenster
+
+
+def fade_gains(kind, n, dtype=np.float32):
+    """Gewichte (g_out, g_in) für ein Fade-Fenster der Länge n."""
+    if kind == 'jump':
+        if n:
+            raise ValueError("'jump' hat kein Fade-Fenster (idx_start == idx_end)")
+        g_in = np.zeros(0)
+    elif kind == 'linear':
+        g_in = np.linspace(0, 1, n)
+    elif kind == 'cosine':
+        g_in = (1 - np.cos(np.linspace(0, np.pi, n))) / 2
+    elif kind == 'equal_power':
+        theta = np.linspace(0, np.pi / 2, n)
+        return np.cos(theta).astype(dtype), np.sin(theta).astype(dtype)
+    else:
+        raise ValueError(f"unbekannte Kurve {kind!r}, erlaubt: {CURVES}")
+    return (1 - g_in).astype(dtype), g_in.astype(dtype)
+
+
+def balance(n_samples, idx_start, idx_end, kind='linear'):
+    """Voller Balance-Verlauf g_in (nur zum Plotten)."""
+    b = np.zeros(n_samples)
+    b[idx_start:idx_end] = fade_gains(kind, idx_end - idx_start, np.float64)[1]
+    b[idx_end:] = 1
+    return b
+
+
+def crossfade_inplace(x1, x2, idx_start, idx_end, kind='cosine'):
+    """
+    Überblendet x1 -> x2 und schreibt das Ergebnis nach x1 (auch 1-D).
+    Rückgabe: x1.
+    """
+    y, x2 = np.atleast_2d(x1), np.atleast_2d(x2)
+    g_out, g_in = fade_gains(kind, idx_end - idx_start, y.dtype)
+    for r in range(0, y.shape[0], ROW_BLOCK):
+        w = y[r:r + ROW_BLOCK, idx_start:idx_end]
+        v = x2[r:r + ROW_BLOCK, idx_start:idx_end]
+        if kind == 'equal_power':
+            w *= g_out
+            w += v * g_in
+        else:
+            # gleiche Rechnung wie in den Skripten: x1 + b * (x2 - x1)
+            d = v - w
+            d *= g_in
+            w += d
+    y[:, idx_end:] = x2[:, idx_end:]
+    return x1
+
+
+def crossfade_full(x1, x2, idx_start, idx_end, kind='cosine'):
+    """Bisheriger Weg über ein volles balance-Array (Vergleich/Benchmark)."""
+    if kind == 'equal_power':
+        raise ValueError("crossfade_full kennt nur x1 + balance * (x2 - x1)")
+    b = np.zeros_like(x1)
+    b[..., idx_start:idx_end] = fade_gains(kind, idx_end - idx_start, x1.dtype)[1]
+    b[..., idx_end:] = 1
+    return x1 + b * (x2 - x1)
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    channels, samples = 2000, 20000
+    idx_start, idx_end = 9000, 10000
+    rng = np.random.default_rng(0)
+    x1 = rng.standard_normal((channels, samples), dtype=np.float32)
+    x2 = rng.standard_normal((channels, samples), dtype=np.float32)
+    size_mb = x1.nbytes / 2**20
+    print(f"{channels} Kanalpaare x {samples} Samples float32 ({size_mb:.0f} MB pro Signal), "
+          f"Fade {idx_end - idx_start} Samples")
+
+    for kind in ('linear', 'cosine'):
+        ref = crossfade_full(x1, x2, idx_start, idx_end, kind)
+        y = x1.copy()
+        crossfade_inplace(y, x2, idx_start, idx_end, kind)
+        print(f"{kind:7s}: max. Abweichung {np.abs(y - ref).max():.2e}")
+
+    def measure(name, fn):
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(3):
+            fn()
+        dt = (time.perf_counter() - t0) / 3
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:32s} {dt * 1e3:7.1f} ms   Spitze {peak / 2**20:7.1f} MB zusätzlich")
+
+    y = x1.copy()
+    measure("volles balance-Array", lambda: crossfade_full(x1, x2, idx_start, idx_end))
+    measure("in-place (Ergebnis nach x1)", lambda: crossfade_inplace(y, x2, idx_start, idx_end))
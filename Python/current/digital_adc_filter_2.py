@@ -1,6 +1,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from state_space import ss_lowpass
+from pwm_waveform import compare_steps, compare_edges, pwm_sample
+from adc_emulator import AdcEmulator, measurement_windows
+
 # === Parameter ===
 V_max_bits = 0xfff
 t_total = 2e-3
@@ -15,76 +19,53 @@ t = np.linspace(0, t_total, samples)
 dt = t[1] - t[0]
 
 # === PWM erzeugen ===
-t_pwm = []
-v_pwm = []
-current_time = 0.0
-while current_time < t_total:
-    duty = 0.0 if current_time < 1e-3 else compare_val / counter_max
-    on_time = pwm_period * duty
-    t_pwm.extend([current_time, current_time + on_time, current_time + on_time, current_time + pwm_period])
-    v_pwm.extend([V_max_bits, V_max_bits, 0, 0])
-    current_time += pwm_period
-
-v_pwm_interp = np.interp(t, t_pwm, v_pwm)
-
-# === Filter 2. Ordnung (kritisch gedämpft) ===
-tau = 72.1046e-6  # s (gegeben)
-v_out_pwm = np.zeros_like(t)
-v_out_deriv = np.zeros_like(t)  # erste Ableitung
+n_periods = int(np.ceil(t_total / pwm_period))
+compare = compare_steps(n_periods, pwm_period, [(1e-3, compare_val)])
+t_pwm, v_pwm = compare_edges(compare, pwm_period, counter_max, v_high=V_max_bits)
+
+v_pwm_interp = pwm_sample(t_pwm, v_pwm, t)
 
-for i in range(2, len(t)):
-    u = v_pwm_interp[i]
-    acc = (u - v_out_pwm[i - 1] - 2 * tau * v_out_deriv[i - 1]) / (tau ** 2)
-    v_out_deriv[i] = v_out_deriv[i - 1] + acc * dt
-    v_out_pwm[i] = v_out_pwm[i - 1] + v_out_deriv[i] * dt
+# === Filter 2. Ordnung (kritisch gedämpft, exakt diskretisiert) ===
+tau = 72.1046e-6  # s (gegeben)
+v_out_pwm = ss_lowpass(v_pwm_interp, dt, tau, order=2)
 
 # === ADC-Messintervalle ===
 pwm_adc_freq = 1000
 pwm_adc_period = 1 / pwm_adc_freq
 pwm_adc_duty = 0.5
 
-adc_intervals = []
-current_time = 0.0
-while current_time < t_total:
-    start = current_time + pwm_adc_period * pwm_adc_duty
-    end = current_time + pwm_adc_period
-    if start < t_total:
-        adc_intervals.append((start, min(end, t_total)))
-    current_time += pwm_adc_period
+adc_intervals = measurement_windows(pwm_adc_period, pwm_adc_duty, t_total)
+
+# === ADC: 64 MHz / 6 mit 14 Takten pro Messung, 12 Bit ===
+adc = AdcEmulator(64e6, prescaler=6, cycles=14, bits=12)
 
-# === ADC-Zeitbasis: 64 MHz / 6 mit 14 Takten pro Messung ===
-adc_clk = 64e6 / 6
-adc_sample_time = 14 / adc_clk
+# === Alle ADC-Messbereiche abtasten (quantisiert) ===
+adc_run = adc.measure((t, v_out_pwm), adc_intervals)
+adc_means = adc_run.mean()
+adc_step_means = adc_run.step_mean()
+adc_running = adc_run.running_mean()
+for w, (start, end) in enumerate(adc_intervals):
+    print(f"Messbereich {w}: {start * 1e3:.2f}..{end * 1e3:.2f} ms, {adc_run.counts[w]} Samples, "
+          f"Mittelwert {adc_means[w]:.1f} Bits, Stufen-Mittelwert {adc_step_means[w]:.1f} Bits")
 
 # === Nur den zweiten ADC-Messbereich anzeigen ===
 if len(adc_intervals) >= 2:
     start, end = adc_intervals[1]
 
+    # === RC-Ausgang im Intervall extrahieren (analog) ===
     idx_range = np.where((t >= start) & (t <= end))
     t_range = t[idx_range]
     v_range = v_out_pwm[idx_range]
     v_mean_analog = np.mean(v_range)
 
-    adc_times = []
-    current = start
-    while current < end:
-        adc_times.append(current)
-        current += adc_sample_time
-
-    adc_times = np.array(adc_times)
-    adc_values = np.interp(adc_times, t, v_out_pwm)
-    adc_values = np.round(adc_values).clip(0, V_max_bits)  # 12-Bit Quantisierung
-
-    mean_adc = 0.0
-    mean_adc_values = []
-    for i, x in enumerate(adc_values, start=1):
-        mean_adc += (x - mean_adc) / i
-        mean_adc_values.append(mean_adc)
-
-    v_mean_adc = np.mean(adc_values)
-    adc_step_durations = np.diff(np.append(adc_times, end))
-    adc_area = np.sum(adc_values * adc_step_durations)
-    v_mean_step = adc_area / (end - start)
+    # === ADC-Zeitpunkte, Werte und laufender Mittelwert ===
+    adc_times, adc_values = adc_run.window(1)
+    mean_adc_values = adc_running[adc_run.offsets[1]:adc_run.offsets[2]]
+    mean_adc = mean_adc_values[-1]
+
+    # === Mittelwert über die Samples und über die Treppe ===
+    v_mean_adc = adc_means[1]
+    v_mean_step = adc_step_means[1]
 
     # === Plot ===
     fig, ax = plt.subplots(figsize=(10, 3))
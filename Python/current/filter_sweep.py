@@ -0,0 +1,128 @@
+import argparse
+
+import numpy as np
+
+from pwm_sim import PwmRc, pwm_edges, pwm_steady_state
+from sweep_cache import cached_map
+from settling import settle_time
+
+# =============================================================
+# Sweep über R, C, compare_val und PWM-Frequenz
+#
+# Szenario wie ina_filter_adc.py: bis t_step ist compare = 0, danach
+# compare_val; gemessen wird im ADC-Fenster [t_adc0, t_adc1]
+# (zweite Hälfte des zweiten 1-kHz-ADC-Zyklus). Alle Werte in Bits.
+#
+#  settle_step  1-LSB-Einschwingzeit auf das ideale Rechteck (analog):
+#               A e^(-t/RC) = LSB  ->  t = RC ln(A / LSB) (settling.py)
+#  settle_pwm   bis die PWM-Antwort bis auf 1 LSB im periodisch
+#               eingeschwungenen Zustand ist: Abweichung y_start e^(-t/RC)
+#  ripple_ss    Ripple p-p im eingeschwungenen Zustand
+#  ripple_adc   p-p im ADC-Fenster (Ripple + Rest-Einschwingen)
+#  mean_error   Mittelwert im ADC-Fenster minus V_max * duty
+# Ein Job rechnet alle (R, C) für ein (compare, f_pwm) vektorisiert;
+# Jobs laufen im Prozess-Pool mit Plattencache (sweep_cache.py).
+# Ergebnis-Arrays haben die Form (compare, f_pwm, R, C) -> Heatmaps.
+# =============================================================
+
+V_MAX_BITS = 0xfff
+COUNTER_MAX = 0xfff
+LSB = 1
+T_STEP = 1e-3
+ADC_WINDOW = (1.5e-3, 2e-3)
+METRICS = ('settle_step', 'settle_pwm', 'ripple_ss', 'ripple_adc', 'mean_error')
+
+
+def _sweep_job(job):
+    R, C, compare_val, pwm_freq = job
+    rc = R[:, np.newaxis] * C[np.newaxis, :]
+    period = 1 / pwm_freq
+    duty = compare_val / COUNTER_MAX
+    amplitude = V_MAX_BITS * duty
+    t0, t1 = ADC_WINDOW
+
+    n_per = int(np.ceil(t1 / period)) + 1
+    per_duty = np.where(np.arange(n_per) * period < T_STEP, 0.0, duty)
+    sim = PwmRc(*pwm_edges(period, per_duty, n_per * period, V_MAX_BITS), rc)
+    y_min, y_max = sim.extrema(t0, t1)
+    y_start, y_peak = pwm_steady_state(period, duty, rc, V_MAX_BITS)
+
+    # erste PWM-Periode mit duty > 0 beginnt bei der ersten Periodengrenze >= T_STEP
+    t_first = np.ceil(T_STEP / period - 1e-9) * period
+    return {
+        'settle_step': settle_time(rc, LSB / max(amplitude, LSB), order=1),
+        'settle_pwm' : (t_first - T_STEP) + settle_time(rc, LSB / np.maximum(y_start, LSB), order=1),
+        'ripple_ss'  : y_peak - y_start,
+        'ripple_adc' : y_max - y_min,
+        'mean_error' : sim.mean(t0, t1) - amplitude,
+    }
+
+
+_sweep_job.CACHE_VERSION = 1
+
+
+def filter_sweep(R, C, compare_vals, pwm_freqs, workers=None):
+    """Liefert {Kennzahl: Array (compare, f_pwm, R, C)} und die Anzahl neu gerechneter Jobs."""
+    R, C = np.asarray(R, dtype=np.float64), np.asarray(C, dtype=np.float64)
+    jobs = [(R, C, int(cv), float(f)) for cv in compare_vals for f in pwm_freqs]
+    parts, n_new = cached_map(_sweep_job, jobs, workers)
+    shape = (len(compare_vals), len(pwm_freqs), R.size, C.size)
+    return {m: np.array([p[m] for p in parts]).reshape(shape) for m in METRICS}, n_new
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    parser = argparse.ArgumentParser(description="R/C/duty-Sweep für den PWM-RC-Filter")
+    parser.add_argument("--r", type=float, nargs=3, default=[100, 100e3, 40],
+                        metavar=("MIN", "MAX", "N"), help="R logarithmisch (Ω)")
+    parser.add_argument("--c", type=float, nargs=3, default=[1e-9, 1e-6, 40],
+                        metavar=("MIN", "MAX", "N"), help="C logarithmisch (F)")
+    parser.add_argument("--compare", type=int, nargs="+", default=[205, 1024, 2047, 3071, 3890])
+    parser.add_argument("--freq", type=float, nargs="+", default=[15e3, 64e6 / 0xFFF])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+
+    R = np.geomspace(args.r[0], args.r[1], int(args.r[2]))
+    C = np.geomspace(args.c[0], args.c[1], int(args.c[2]))
+    t_start = time.perf_counter()
+    res, n_new = filter_sweep(R, C, args.compare, args.freq, args.workers)
+    n = res['settle_pwm'].size
+    print(f"{n} Kombinationen ({n_new} Jobs neu gerechnet) in {time.perf_counter() - t_start:.2f} s")
+
+    # brauchbar: zu Beginn des ADC-Fensters eingeschwungen und Fenster-Mittelwert
+    # auf 1 LSB genau (p-p <= 1 LSB schafft ein Filter 1. Ordnung hier nie)
+    ok = (res['settle_pwm'] <= ADC_WINDOW[0] - T_STEP) & (np.abs(res['mean_error']) <= LSB)
+    print(f"eingeschwungen und |Mittelwertfehler| <= {LSB} LSB: {ok.sum()} von {n}, "
+          f"davon p-p <= {LSB} LSB: {(ok & (res['ripple_adc'] <= LSB)).sum()}")
+    for i, cv in enumerate(args.compare):
+        for j, f in enumerate(args.freq):
+            rc_ok = (R[:, np.newaxis] * C[np.newaxis, :])[ok[i, j]]
+            span = f"RC {rc_ok.min() * 1e6:.1f} .. {rc_ok.max() * 1e6:.1f} µs" if rc_ok.size else "keine"
+            print(f"  compare {cv:4d}, f_pwm {f / 1e3:6.2f} kHz: {span}")
+
+    if not args.no_plot:
+        i, j = len(args.compare) // 2, 0
+        fig, axs = plt.subplots(2, 2, figsize=(12, 9))
+        panels = [('settle_pwm', 1e3, "Einschwingzeit 1 LSB (ms)"),
+                  ('ripple_ss', 1, "Ripple p-p eingeschwungen (Bits)"),
+                  ('ripple_adc', 1, "p-p im ADC-Fenster (Bits)"),
+                  ('mean_error', 1, "Mittelwertfehler im ADC-Fenster (Bits)")]
+        for ax, (m, scale, title) in zip(axs.flat, panels):
+            data = res[m][i, j] * scale
+            norm = 'symlog' if m == 'mean_error' else 'log'
+            mesh = ax.pcolormesh(C * 1e9, R / 1e3, np.maximum(data, 1e-3) if norm == 'log' else data,
+                                 norm=norm, shading='nearest')
+            ax.contour(C * 1e9, R / 1e3, ok[i, j], levels=[0.5], colors='white', linewidths=1)
+            fig.colorbar(mesh, ax=ax)
+            ax.set_xscale('log')
+            ax.set_yscale('log')
+            ax.set_xlabel("C (nF)")
+            ax.set_ylabel("R (kΩ)")
+            ax.set_title(title)
+        fig.suptitle(f"compare = {args.compare[i]}, f_pwm = {args.freq[j] / 1e3:.2f} kHz "
+                     f"(weiß: eingeschwungen, Mittelwert auf {LSB} LSB)")
+        plt.tight_layout()
+        plt.show()
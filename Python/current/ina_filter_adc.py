@@ -1,6 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from rc_filter import rc_lowpass
+from pwm_waveform import compare_steps, compare_edges, pwm_sample
+from adc_emulator import measurement_windows
+from settling import settle_time
+
 # === Parameter ===
 V_max_bits = 0xfff     # 12 Bit Auflösung, entspricht 4095
 t_total = 2e-3         # 2 ms Gesamtdauer
@@ -22,36 +27,22 @@ t = np.linspace(0, t_total, samples)
 dt = t[1] - t[0]
 
 # === PWM erzeugen anhand Counter-Wert ===
-t_pwm = []
-v_pwm = []
-current_time = 0.0
-while current_time < t_total:
-    if current_time < 1e-3:
-        duty = 0.0
-    else:
-        duty = compare_val / counter_max
-    on_time = pwm_period * duty
-    t_pwm.extend([current_time, current_time + on_time, current_time + on_time, current_time + pwm_period])
-    v_pwm.extend([V_max_bits, V_max_bits, 0, 0])
-    current_time += pwm_period
-
-# === Interpoliertes PWM-Signal ===
-v_pwm_interp = np.interp(t, t_pwm, v_pwm)
+n_periods = int(np.ceil(t_total / pwm_period))
+compare = compare_steps(n_periods, pwm_period, [(1e-3, compare_val)])
+t_pwm, v_pwm = compare_edges(compare, pwm_period, counter_max, v_high=V_max_bits)
+duty = compare_val / counter_max
+
+# === Abgetastetes PWM-Signal ===
+v_pwm_interp = pwm_sample(t_pwm, v_pwm, t)
 
 # === RC-Filterung des PWM-Signals ===
-v_out_pwm = np.zeros_like(t)
-for i in range(1, len(t)):
-    dv = (v_pwm_interp[i] - v_out_pwm[i - 1]) * dt / RC
-    v_out_pwm[i] = v_out_pwm[i - 1] + dv
+v_out_pwm = rc_lowpass(v_pwm_interp, dt, RC)
 
 # === Ideales analoges Rechtecksignal (500 Hz) ===
 v_analog = np.where(t < 1e-3, 0, V_max_bits * duty)
 
 # === RC-Filterung des analogem Rechtecksignals ===
-v_out_analog = np.zeros_like(t)
-for i in range(1, len(t)):
-    dv = (v_analog[i] - v_out_analog[i - 1]) * dt / RC
-    v_out_analog[i] = v_out_analog[i - 1] + dv
+v_out_analog = rc_lowpass(v_analog, dt, RC)
 
 # === 1000 Hz PWM zur ADC-Steuerung ===
 pwm_adc_freq = 1000  # 1000 Hz
@@ -59,26 +50,17 @@ pwm_adc_period = 1 / pwm_adc_freq  # 1 ms
 pwm_adc_duty = 0.5  # 50%, d.h. 0.5 ms HIGH, 0.5 ms LOW
 
 # === ADC-Messintervalle für Schattierung ===
-adc_intervals = []
-current_time = 0.0
-while current_time < t_total:
-    start = current_time + pwm_adc_period * pwm_adc_duty
-    end = current_time + pwm_adc_period
-    if start < t_total:
-        adc_intervals.append((start, min(end, t_total)))
-    current_time += pwm_adc_period
-
-# === Stelle finden, an der Differenz zwischen analogem Rechteck und RC-Ausgang 1 LSB beträgt ===
-diff = np.abs(v_analog - v_out_analog)
-lsb = 1
-idx_lsb = np.where(np.abs(diff - lsb) < 0.1)[0]
+adc_intervals = measurement_windows(pwm_adc_period, pwm_adc_duty, t_total)
 
-if idx_lsb.size > 0:
-    idx = idx_lsb[0]
-    y_lsb = v_out_analog[idx]
-    x_lsb = t[idx] * 1e3  # in ms
+# === Stelle, an der die Differenz zwischen analogem Rechteck und RC-Ausgang 1 LSB beträgt ===
+# exakt aus A * exp(-(t - 1 ms) / RC) = lsb (settling.py) statt Suche im Raster
+lsb = 1
+amplitude = V_max_bits * duty
+if amplitude > lsb:
+    t_lsb = 1e-3 + float(settle_time(RC, lsb / amplitude, order=1))
+    y_lsb = amplitude - lsb
+    x_lsb = t_lsb * 1e3  # in ms
 else:
-    idx = None
     y_lsb = None
     x_lsb = None
 
@@ -98,7 +80,7 @@ plt.plot(t * 1e3, v_analog, label='Rechtecksignal (analog)', color='green')
 plt.plot(t * 1e3, v_out_analog, label='RC-Ausgang aus Rechteck', color='orange')
 
 # Vertikale Linie + Marker bei 1 LSB Differenz
-if idx is not None:
+if x_lsb is not None:
     plt.axvline(x=x_lsb, color='black', label='1 LSB Differenz (grün - orange)')
     plt.plot(x_lsb, y_lsb, 'ko', label='1 LSB Punkt')
 
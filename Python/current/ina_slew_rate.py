@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from rc_filter import rc_lowpass
+from slew_amp import slew_amp
+
 # === Parameter ===
 V_ref = 3.3
 t_total = 2e-3
@@ -11,6 +14,7 @@ C = 6.01e-9
 tau_rc = R * C               # Bauteilzeitkonstante
 tau_adjusted = 1.65e-6       # Slew-Rate-gerechte Zeitkonstante
 tau_extra = 72.1046e-6       # Weitere Zeitkonstante aus vorherigem Beispiel
+tau_fast = 0.1e-6            # schneller als der INA folgen kann (Rampe V_ref / SR = 1.65 µs)
 
 # Zeitachse
 t = np.linspace(0, t_total, samples)
@@ -20,19 +24,31 @@ dt = t[1] - t[0]
 v_in = np.where(t < 1e-3, 0, V_ref)
 start_idx = np.where(t >= 1e-3)[0][0]
 
-# Ausgangssignale
-v_out_rc = np.zeros_like(t)
-v_out_adjusted = np.zeros_like(t)
-v_out_extra = np.zeros_like(t)
+# Filterberechnung (alle 1. Ordnung, aber mit unterschiedlichem τ), ab dem Sprung
+taus = [tau_rc, tau_adjusted, tau_extra, tau_fast]
+v_out = np.zeros((len(taus), len(t)))
+v_out[:, start_idx:] = rc_lowpass(v_in[start_idx:], dt, taus)
+v_out_rc, v_out_adjusted, v_out_extra, v_out_fast = v_out
+
+# INA mit Slew-Rate-Grenze (2 V/µs) direkt am Sprung und hinter den RC-Filtern.
+# Für τ >= V_ref / SR = 1.65 µs bleibt die Steigung unter der Grenze (gleiche
+# Einschwingzeit), bei τ = 0.1 µs bestimmt die Rampe die Einschwingzeit.
+slew_rate = 2  # V/µs
+v_ina = slew_amp(v_in, dt, slew_rate * 1e6)
+v_out_slew = slew_amp(v_out, dt, slew_rate * 1e6)
 
-# Filterberechnung (alle 1. Ordnung, aber mit unterschiedlichem τ)
-for i in range(start_idx + 1, len(t)):
-    v_out_rc[i] = v_out_rc[i - 1] + (v_in[i] - v_out_rc[i - 1]) * dt / tau_rc
-    v_out_adjusted[i] = v_out_adjusted[i - 1] + (v_in[i] - v_out_adjusted[i - 1]) * dt / tau_adjusted
-    v_out_extra[i] = v_out_extra[i - 1] + (v_in[i] - v_out_extra[i - 1]) * dt / tau_extra
+# Einschwingzeit auf 1 LSB (12 Bit) nach dem Sprung, mit und ohne Slew-Grenze
+lsb = V_ref / 0xfff
+def settle_us(v):
+    late = np.flatnonzero(np.abs(v - V_ref) > lsb)
+    return (t[late[-1] + 1] - t[start_idx]) * 1e6 if late.size else 0.0
+
+print(f"INA direkt: {settle_us(v_ina):.2f} µs")
+for tau_, v_lin, v_sl in zip(taus, v_out, v_out_slew):
+    print(f"τ = {tau_ * 1e6:7.2f} µs: 1 LSB nach {settle_us(v_lin):7.2f} µs, "
+          f"mit Slew-Grenze {settle_us(v_sl):7.2f} µs")
 
 # Slew-Rate-Grenzlinie (2 V/µs)
-slew_rate = 2  # V/µs
 slew_duration_us = V_ref / slew_rate
 t_slew_line = np.linspace(0, slew_duration_us * 1e-6, 100)
 v_slew_line = t_slew_line * 1e6 * slew_rate
@@ -46,6 +62,8 @@ plt.plot(t * 1e3, v_in, label='Eingangssignal (3.3 V Rechteck)', color='green'
 plt.plot(t * 1e3, v_out_rc, label=f'RC-Filter (τ = {tau_rc*1e6:.2f} µs)', color='orange')
 plt.plot(t * 1e3, v_out_extra, label=f'RC-Filter (τ = {tau_extra*1e6:.2f} µs)', color='red')
 plt.plot(t * 1e3, v_out_adjusted, label=f'RC-Filter (τ = {tau_adjusted*1e6:.2f} µs, Slew-Rate)', color='blue')
+plt.plot(t * 1e3, v_out_fast, label=f'RC-Filter (τ = {tau_fast*1e6:.2f} µs)', color='gray')
+plt.plot(t * 1e3, v_out_slew[-1], label=f'INA hinter τ = {tau_fast*1e6:.2f} µs (2 V/µs)', color='purple')
 plt.plot((t[start_idx] + t_slew_line) * 1e3, v_slew_line, '--', color='black', label='Slew-Rate-Grenze (2 V/µs)')
 
 plt.xlabel('Zeit in ms', fontsize=12)
@@ -0,0 +1,80 @@
+import numpy as np
+from scipy.special import gammainccinv, lambertw
+
+# =============================================================
+# Einschwingzeit kritisch gedämpfter Tiefpässe, geschlossen
+#
+# Sprungantwort von H(s) = 1 / (1 + s tau)^n mit x = t / tau:
+#   y(x) = 1 - e^(-x) * sum_{k<n} x^k / k!  =  1 - Q(n, x)
+# (Q: regularisierte obere Gammafunktion). Eingeschwungen auf eps
+# (z. B. 1 LSB: eps = 1 / 4095) heißt Q(n, x) = eps:
+#   n = 1:  x = ln(1 / eps)
+#   n = 2:  (1 + x) e^(-x) = eps  ->  x = -1 - W_-1(-eps / e)   (Lambert W)
+#   n > 2:  x = gammainccinv(n, eps)
+# Danach tau = t_settle / x bzw. t_settle = tau * x – für ganze Arrays
+# aus (Bittiefe, Einschwingzeit, Ordnung) in einem Aufruf statt je
+# Kombination ein fsolve wie in tau_filter_2.py.
+# =============================================================
+
+
+def lsb_eps(bits, lsb=1):
+    """Relative Restabweichung von lsb LSB bei Vollausschlag 2^bits - 1."""
+    return lsb / (2.0 ** np.asarray(bits) - 1)
+
+
+def settle_x(eps, order=1):
+    """x = t_settle / tau, bei dem die Sprungantwort 1 - eps erreicht (eps >= 1 -> 0)."""
+    eps, order = np.broadcast_arrays(np.asarray(eps, dtype=np.float64), np.asarray(order))
+    x = np.zeros(eps.shape)
+    live = eps < 1
+    for n in np.unique(order[live]):
+        rows = live & (order == n)
+        e = eps[rows]
+        if n == 1:
+            x[rows] = -np.log(e)
+        elif n == 2:
+            x[rows] = -1 - lambertw(-e / np.e, k=-1).real
+        else:
+            x[rows] = gammainccinv(n, e)
+    return x
+
+
+def settle_tau(t_settle, eps, order=1):
+    """Größtes tau, das nach t_settle auf eps eingeschwungen ist (gebroadcastet)."""
+    return np.asarray(t_settle, dtype=np.float64) / settle_x(eps, order)
+
+
+def settle_time(tau, eps, order=1):
+    """Einschwingzeit auf eps für Zeitkonstante tau (gebroadcastet)."""
+    return np.asarray(tau, dtype=np.float64) * settle_x(eps, order)
+
+
+if __name__ == "__main__":
+    import time
+    from scipy.optimize import fsolve
+    from scipy.special import gammaincc
+
+    # Fall aus tau_filter_2.py: 2. Ordnung, 0.5 ms, 4094/4095
+    t = 0.0005
+    tau = settle_tau(t, 1 - 4094 / 4095, order=2)
+    tau_fs = fsolve(lambda tau: 1 - (1 + t / tau) * np.exp(-t / tau) - 4094 / 4095, 1e-4)[0]
+    print(f"tau = {tau * 1e6:.4f} µs (fsolve {tau_fs * 1e6:.4f} µs)")
+
+    # Design-Gitter: Bittiefe x Einschwingzeit x Ordnung
+    bits = np.arange(8, 17)[:, None, None]
+    t_settle = np.geomspace(10e-6, 1e-3, 200)[None, :, None]
+    orders = np.arange(1, 7)[None, None, :]
+    t0 = time.perf_counter()
+    taus = settle_tau(t_settle, lsb_eps(bits), orders)
+    dt = time.perf_counter() - t0
+    resid = np.abs(gammaincc(orders, t_settle / taus) / lsb_eps(bits) - 1).max()
+    print(f"{taus.size} Kombinationen in {dt * 1e3:.1f} ms, max. relativer Restfehler {resid:.1e}")
+
+    # Vergleich: ein fsolve je Kombination (nur Ordnung 2)
+    t0 = time.perf_counter()
+    for b in bits.ravel():
+        for ts in t_settle.ravel():
+            v = 1 - lsb_eps(b)
+            fsolve(lambda tau: 1 - (1 + ts / tau) * np.exp(-ts / tau) - v, ts / 10)
+    print(f"fsolve für {bits.size * t_settle.size} Kombinationen (nur 2. Ordnung): "
+          f"{(time.perf_counter() - t0) * 1e3:.0f} ms")
@@ -0,0 +1,184 @@
+import numpy as np
+from scipy.optimize import brentq, least_squares
+
+from pwm_sim import pwm_steady_state
+
+# =============================================================
+# Treiberkette eines Kanals, vektorisiert über alle Kanäle
+#
+#   Lichtwert (0..255) -> compare (12 Bit) -> PWM 64 MHz / 0xFFF
+#   -> RC-Gatefilter wie gs_filterung_*.py (R = 194.3 Ω, C = 100 nF)
+#   -> MOSFET (Schwellspannungsmodell) -> LED + Shunt an 5 V
+#
+# Gatespannung: periodisch eingeschwungener Zustand (pwm_steady_state),
+# innerhalb der Periode exakt exponentiell; ein Frame (40 ms) ist viel
+# länger als tau (19 µs). Der Strom ist nichtlinear in V_GS, daher wird
+# er über die Periode gemittelt (Mittelpunktregel getrennt für High-
+# und Low-Phase), nicht aus dem Mittelwert der Gatespannung gerechnet.
+#
+# MOSFET: EKV-Interpolation zwischen Unterschwell- (exponentiell) und
+# Sättigungsbereich (quadratisch)
+#   I = K * (2 n U_T * ln(1 + exp((V_GS - V_th) / (2 n U_T))))^2
+# K, V_th, n und die wirksame Gate-Zeitkonstante rc gefittet an die
+# Referenzmessung ohne LED aus strommessung_eines_kanals.py (nur Shunt
+# an 5 V). Mit dem Nennwert R * C = 19.4 µs lag das Modell oben um bis
+# zu 42 % unter der Messung; der Fit liefert rc ≈ 62 µs (Gate-/Miller-
+# Kapazität des MOSFET parallel zu C). Restfehler siehe fit_mosfet().
+# Last: 5 V = V_LED(I) + I * R_shunt (+ V_DS >= 0) begrenzt den Strom
+# auf I_max; LED-Kennlinie I = a * exp(b * V) wie led_kennlinien_plot.py.
+#
+# Weil compare nur 4096 Werte annimmt, wird die Kette einmal für alle
+# compare-Werte gerechnet und das Programm per Index nachgeschlagen.
+# =============================================================
+
+V_SUPPLY = 5.0
+R_SHUNT = 5.0
+V_GATE = 3.3
+COUNTER_MAX = 0xFFF
+PWM_PERIOD = 0xFFF / 64e6
+R_GATE = 194.3
+C_GATE = 100e-9
+U_T = 0.02585
+N_PHASE = 64
+
+# Messpunkte LED (led_kennlinien_plot.py)
+LED_V = np.array([3.0, 3.5])
+LED_I = np.array([0.12, 0.35])
+
+# Shunt-Messung eines Kanals (strommessung_eines_kanals.py), Shunt-Spannung in mV
+CCR = np.array([700, 750, 800, 850, 900, 950, 1000, 1050, 1100, 1150, 1200])
+SHUNT_MV_LED = np.array([0, 0, 4.7, 13.7, 31.2, 71, 127, 246, 320, 370, 340])
+SHUNT_MV_NO_LED = np.array([0, 0, 5.6, 18, 40, 87, 176, 361, 726, 996, 1142])
+
+
+def led_fit(voltages=LED_V, currents=LED_I):
+    """(a, b) mit I = a * exp(b * V), wie led_kennlinien_plot.py."""
+    b, log_a = np.polyfit(voltages, np.log(currents), 1)
+    return np.exp(log_a), b
+
+
+def load_limit(led=None, v_supply=V_SUPPLY, r_shunt=R_SHUNT):
+    """Größter Strom bei V_DS = 0: mit LED (a, b) bzw. nur Shunt (led=None)."""
+    if led is None:
+        return v_supply / r_shunt
+    a, b = led
+    return brentq(lambda i: np.log(i / a) / b + i * r_shunt - v_supply, a * 1e-6, v_supply / r_shunt)
+
+
+def mosfet_current(v_gs, k, v_th, n):
+    x = 2 * n * U_T * np.logaddexp(0, (v_gs - v_th) / (2 * n * U_T))
+    return k * x * x
+
+
+def gate_waveform(compare, period=PWM_PERIOD, rc=R_GATE * C_GATE, counter_max=COUNTER_MAX,
+                  v_high=V_GATE, n_phase=N_PHASE):
+    """
+    Eingeschwungene Gatespannung an n_phase Mittelpunkten der High- und
+    der Low-Phase: (v, w) der Form compare.shape + (2 * n_phase,),
+    w sind die Zeitgewichte (Summe 1).
+    """
+    duty = np.clip(np.asarray(compare, dtype=np.float64) / counter_max, 0, 1)[..., np.newaxis]
+    y_start, y_peak = pwm_steady_state(period, duty, rc, v_high)
+    s = (np.arange(n_phase) + 0.5) / n_phase
+    t_on, t_off = s * duty * period, s * (1 - duty) * period
+    v_on = v_high + (y_start - v_high) * np.exp(-t_on / rc)
+    v_off = y_peak * np.exp(-t_off / rc)
+    w = np.concatenate(np.broadcast_arrays(duty / n_phase, (1 - duty) / n_phase, v_on)[:2], axis=-1)
+    return np.concatenate((v_on, v_off), axis=-1), w
+
+
+def fit_mosfet(ccr=CCR, shunt_mv=SHUNT_MV_NO_LED, r_shunt=R_SHUNT, floor_mv=1.0):
+    """
+    (K, V_th, n, rc) aus der Shunt-Messung ohne LED, gefittet im Log-Raum
+    auf den periodengemittelten Strom; rc ist die wirksame Zeitkonstante
+    des Gatefilters. Messwerte unter floor_mv (die 0-mV-Punkte) sind
+    zensiert: dort zählt nur, wenn das Modell darüber liegt.
+
+    Restfehler gegen die Messung (Shunt-Spannung, CCR 800..1200):
+    ohne LED -18 .. +17 % (größter Fehler bei CCR 800, 950..1000 und
+    1100), mit LED (LED-Kennlinie aus nur zwei Punkten, nicht mitgefittet)
+    -2 .. +71 %, das Modell liegt dort oberhalb CCR 900 durchweg zu hoch.
+    Vorhersagen taugen für Größenordnung und Verlauf, nicht als
+    kalibrierte Ströme.
+    """
+    i_max = load_limit(None, r_shunt=r_shunt)
+    i_floor = floor_mv / 1e3 / r_shunt
+    i_meas = np.maximum(np.asarray(shunt_mv) / 1e3 / r_shunt, i_floor)
+    censored = np.asarray(shunt_mv) < floor_mv
+
+    def residual(p):
+        k, v_th, n, rc = np.exp(p[0]), p[1], p[2], np.exp(p[3])
+        v, w = gate_waveform(ccr, rc=rc)
+        i = (np.minimum(mosfet_current(v, k, v_th, n), i_max) * w).sum(axis=-1)
+        r = np.log(np.maximum(i, 1e-12)) - np.log(i_meas)
+        return np.where(censored, np.maximum(r, 0), r)
+
+    p = least_squares(residual, [np.log(0.5), 1.0, 1.5, np.log(R_GATE * C_GATE)],
+                      bounds=([-10, 0.0, 1.0, np.log(1e-6)], [8, 3.0, 5.0, np.log(1e-3)])).x
+    return np.exp(p[0]), p[1], p[2], np.exp(p[3])
+
+
+class Driver:
+    """
+    Treiberkette für alle compare-Werte 0..counter_max vorberechnet.
+    led=None: nur Shunt (Referenzmessung), sonst LED-Fit (a, b).
+    mosfet: (K, V_th, n, rc) wie fit_mosfet(); rc=None nimmt das
+    gefittete rc, sonst gilt das angegebene.
+    """
+    def __init__(self, mosfet=None, led='fit', counter_max=COUNTER_MAX, max_value=255,
+                 period=PWM_PERIOD, rc=None, r_shunt=R_SHUNT):
+        self.mosfet = fit_mosfet() if mosfet is None else mosfet
+        self.rc = self.mosfet[3] if rc is None else rc
+        self.led = led_fit() if led == 'fit' else led
+        self.counter_max = counter_max
+        self.max_value = max_value
+        self.r_shunt = r_shunt
+        self.i_max = load_limit(self.led, r_shunt=r_shunt)
+        v, w = gate_waveform(np.arange(counter_max + 1), period, self.rc, counter_max)
+        self.v_gate_mean = (v * w).sum(axis=-1)
+        self.current_lut = (np.minimum(mosfet_current(v, *self.mosfet[:3]), self.i_max) * w).sum(axis=-1)
+
+    def compare(self, values):
+        """
+        Lichtwerte -> 12-Bit compare (wie pwm_waveform.program_compare).
+        Werte außerhalb 0..max_value werden begrenzt wie der Duty-Cycle in
+        pwm_waveform, sonst liefen negative Werte rückwärts durch die
+        Tabelle und zu große ins IndexError.
+        """
+        values = np.clip(np.asarray(values, dtype=np.float64), 0, self.max_value)
+        scaled = values * (self.counter_max / self.max_value)
+        return np.rint(scaled).astype(np.int64)
+
+    def current(self, values):
+        """Mittlerer LED-Strom (A) für Lichtwerte beliebiger Form, z. B. (Kanäle, Frames)."""
+        return self.current_lut[self.compare(values)]
+
+    def shunt_voltage(self, values):
+        return self.current(values) * self.r_shunt
+
+
+if __name__ == "__main__":
+    import time
+    from clip_cutter import load_light_program, FPS
+
+    t0 = time.perf_counter()
+    ref = Driver(led=None)
+    drv = Driver(mosfet=ref.mosfet)
+    print(f"Fit (K, V_th, n, rc) = ({ref.mosfet[0]:.3g} A/V², {ref.mosfet[1]:.3f} V, {ref.mosfet[2]:.2f}, "
+          f"{ref.mosfet[3] * 1e6:.1f} µs), "
+          f"I_max mit LED {drv.i_max * 1e3:.0f} mA, Tabellen in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+    print(" CCR  V_GS   ohne LED: Messung/Modell (mV)   mit LED: Messung/Modell (mV)")
+    for c, m0, m1 in zip(CCR, SHUNT_MV_NO_LED, SHUNT_MV_LED):
+        print(f"{c:5d} {drv.v_gate_mean[c]:.3f}   {m0:7.1f} / {ref.current_lut[c] * R_SHUNT * 1e3:7.1f}"
+              f"              {m1:7.1f} / {drv.current_lut[c] * R_SHUNT * 1e3:7.1f}")
+
+    program = load_light_program()
+    t0 = time.perf_counter()
+    current = drv.current(program['channels'])
+    dt = time.perf_counter() - t0
+    print(f"Programm {program['channels'].shape} ({program['channels'].shape[1] / FPS:.0f} s) "
+          f"in {dt * 1e3:.2f} ms")
+    for ch, i in enumerate(current):
+        print(f"  ch{ch}: Mittel {i.mean() * 1e3:6.1f} mA, Spitze {i.max() * 1e3:6.1f} mA")
+    print(f"  Summe aller Kanäle: Mittel {current.sum(axis=0).mean() * 1e3:.1f} mA, "
+          f"Spitze {current.sum(axis=0).max() * 1e3:.1f} mA")
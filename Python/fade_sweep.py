@@ -0,0 +1,136 @@
+import random
+import argparse
+
+import numpy as np
+
+from clip_cutter import Well512Block, clip_coords, load_light_program
+from crossfading.fade_curves import fade_gains
+from sweep_cache import cached_map
+
+# =============================================================
+# Sweep: Crossfade-Qualität über Kurventyp und Fade-Länge
+#
+# Für zufällige Schnittpaare (out_point, in_point) aus dem echten
+# Lichtprogramm wird jede Kurve mit jeder Länge cf bewertet. Gemischt
+# werden wie im Cutter die Fenster x[o-cf .. o] und x[i .. i+cf]
+# (cf + 1 Samples), davor/dahinter je zwei Samples Originalverlauf.
+# 'jump' ist der harte Schnitt (kein Fenster).
+#
+# Kennzahlen je Naht und Kanal:
+#  step       größter Sprung |Δy| (Pixelwert)
+#  slope      größter Knick |Δ²y| (Pixelwert)
+#  dip        Helligkeitseinbruch nach Gamma-Dekodierung (L = (y/255)^2.2)
+#             gegenüber einer Überblendung der Leuchtdichten mit gleichem
+#             Fortschritt, in % der vollen Helligkeit
+#  overshoot  Leuchtdichte über beiden Quellen (Equal-Power), in %
+# Alle Jobs nutzen dieselben Schnittpaare (gleiche Zufallszahlen).
+# =============================================================
+
+GAMMA = 2.2
+CURVES = ('linear', 'cosine', 'equal_power')
+LENGTHS = (5, 10, 15, 25, 35, 50, 75, 100, 150, 200)
+PERCENTILES = (50, 90, 99)
+METRICS = ('step', 'slope', 'dip', 'overshoot')
+
+
+def _seam_sequences(x, out_pt, in_pt, kind, cf):
+    """Verlauf um die Naht, Form (Nähte, Samples), dazu Quellen und Fortschritt im Fenster."""
+    n = 0 if kind == 'jump' else cf + 1
+    j = np.arange(n)
+    a = x[out_pt[:, np.newaxis] - n + 1 + j]
+    b = x[in_pt[:, np.newaxis] + j]
+    g_out, g_in = fade_gains(kind, n, np.float64)
+    y = g_out * a + g_in * b
+    before = x[out_pt[:, np.newaxis] - n + np.array([-1, 0])]
+    after = x[in_pt[:, np.newaxis] + n + np.array([0, 1])]
+    seq = np.concatenate((before, y, after), axis=1)
+    progress = g_in / np.maximum(g_out + g_in, 1e-12)
+    return seq, a, b, y, progress
+
+
+def _score_job(job):
+    kind, cf, channels, out_pt, in_pt = job
+    res = {m: np.empty((channels.shape[0], len(PERCENTILES))) for m in METRICS}
+    for c, x in enumerate(channels.astype(np.float64)):
+        seq, a, b, y, p = _seam_sequences(x, out_pt, in_pt, kind, cf)
+        lum = lambda v: (v / 255) ** GAMMA
+        values = {
+            'step' : np.abs(np.diff(seq, axis=1)).max(axis=1),
+            'slope': np.abs(np.diff(seq, 2, axis=1)).max(axis=1),
+        }
+        if y.shape[1]:
+            la, lb, ly = lum(a), lum(b), lum(y)
+            values['dip'] = 100 * np.maximum(((1 - p) * la + p * lb - ly).max(axis=1), 0)
+            values['overshoot'] = 100 * np.maximum((ly - np.maximum(la, lb)).max(axis=1), 0)
+        else:
+            values['dip'] = values['overshoot'] = np.zeros(out_pt.size)
+        for m in METRICS:
+            res[m][c] = np.percentile(values[m], PERCENTILES)
+    return res
+
+
+_score_job.CACHE_VERSION = 1
+
+
+def fade_sweep(channels, n_pairs=20000, lengths=LENGTHS, curves=CURVES, seed=0, workers=None):
+    """
+    Bewertet alle Kombinationen Kurve x Länge. Ergebnis:
+    {(kind, cf): {Kennzahl: (Kanäle, len(PERCENTILES))}}, 'jump' mit cf = 0.
+    """
+    channels = np.atleast_2d(np.asarray(channels))
+    rng = random.Random(seed)
+    well = Well512Block([rng.getrandbits(32) for _ in range(16)])
+    raw = well.fill(2 * n_pairs).astype(np.int64)
+    # Koordinaten für die größte Länge -> jedes Paar passt für alle Längen
+    cf_max = max(lengths) + 1
+    if channels.shape[1] - 2 * cf_max - 2 < 0:
+        raise ValueError(f"Lichtprogramm ({channels.shape[1]} Frames) zu kurz für "
+                         f"Crossfade-Länge {max(lengths)}")
+    in_pt, out_pt = clip_coords(raw[0::2], raw[1::2], channels.shape[1], cf_max)
+
+    grid = [('jump', 0)] + [(kind, cf) for kind in curves for cf in lengths]
+    jobs = [(kind, cf, channels, out_pt, in_pt) for kind, cf in grid]
+    results, n_new = cached_map(_score_job, jobs, workers)
+    return dict(zip(grid, results)), n_new
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    parser = argparse.ArgumentParser(description="Crossfade-Qualität über Kurve und Länge")
+    parser.add_argument("--pairs", type=int, default=20000, help="Schnittpaare pro Job")
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(LENGTHS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+
+    program = load_light_program()
+    t0 = time.perf_counter()
+    res, n_new = fade_sweep(program['channels'], args.pairs, args.lengths, seed=args.seed,
+                            workers=args.workers)
+    print(f"{len(res)} Jobs ({n_new} neu gerechnet) in {time.perf_counter() - t0:.2f} s")
+
+    # Tabelle: P90 über alle Nähte, Mittel über die Kanäle
+    i90 = PERCENTILES.index(90)
+    print(f"{'Kurve':12s} {'cf':>4s} " + " ".join(f"{m:>10s}" for m in METRICS) + "   (P90)")
+    for (kind, cf), r in res.items():
+        print(f"{kind:12s} {cf:4d} " + " ".join(f"{r[m][:, i90].mean():10.2f}" for m in METRICS))
+
+    if not args.no_plot:
+        units = {'step': "Pixelwert", 'slope': "Pixelwert", 'dip': "%", 'overshoot': "%"}
+        fig, axs = plt.subplots(len(METRICS), 1, figsize=(9, 11), sharex=True)
+        for ax, m in zip(axs, METRICS):
+            for kind in CURVES:
+                ax.plot(args.lengths, [res[(kind, cf)][m][:, i90].mean() for cf in args.lengths],
+                        'o-', label=kind)
+            ax.axhline(res[('jump', 0)][m][:, i90].mean(), color='gray', linestyle='--',
+                       label='jump')
+            ax.set_title(f"{m} (P90, Mittel über Kanäle)")
+            ax.set_ylabel(units[m])
+            ax.grid(True)
+            ax.legend()
+        axs[-1].set_xlabel("Crossfade-Länge (Frames)")
+        plt.tight_layout()
+        plt.show()
@@ -0,0 +1,126 @@
+import argparse
+
+import numpy as np
+
+from pwm_sim import pwm_steady_state
+
+# =============================================================
+# Gatefilter aus gs_filterung_*.py für alle compare-Werte 0..0xFFF
+#
+# Statt je Skript ein Tastgrad (D_5 = 0.05 bzw. 0.2) im Zeitraster
+# wird alles geschlossen gerechnet, ein Array pro Kennzahl:
+#   v_mean      eingeschwungener Mittelwert (= V_pwm * duty)
+#   v_min/v_max Minimum (Periodenbeginn) / Maximum (fallende Flanke)
+#   ripple      v_max - v_min
+#   t_first     erstes Überschreiten der Schwelle ab 0 V (inf: nie)
+#   above       Anteil der Periode über der Schwelle (eingeschwungen)
+# Ab 0 V wachsen die Periodenanfänge geometrisch auf den eingeschwungenen
+# Wert zu: y_k = y_ss (1 - q^k), q = a_on * a_off. Die erste Periode,
+# deren Maximum die Schwelle erreicht, folgt daraus per Logarithmus,
+# der Zeitpunkt in ihrer High-Phase aus der Exponentialfunktion.
+# =============================================================
+
+V_PWM = 3.3
+T_PWM = 0xFFF / 64e6
+R = 194.3
+C = 100e-9
+V_TH = 0.5              # kleinste Gate Threshold Voltage
+COUNTER_MAX = 0xFFF
+COLUMNS = ('compare', 'duty', 'v_mean', 'v_min', 'v_max', 'ripple', 't_first', 'above')
+
+
+def duty_sweep(compare=None, period=T_PWM, rc=R * C, v_pwm=V_PWM, v_th=V_TH,
+               counter_max=COUNTER_MAX):
+    """Kennzahlen (siehe oben) als dict von Arrays über compare (Standard: alle)."""
+    if compare is None:
+        compare = np.arange(counter_max + 1)
+    compare = np.asarray(compare)
+    duty = compare / counter_max
+    t_on = duty * period
+    y_start, y_peak = pwm_steady_state(period, duty, rc, v_pwm)
+    a_on = np.exp(-t_on / rc)
+    q = a_on * np.exp(-(period - t_on) / rc)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # erstes Überschreiten ab 0 V: Periode k mit a_on y_k + (1 - a_on) V >= v_th
+        need = (v_th - (1 - a_on) * v_pwm) / a_on
+        k = np.ceil(np.log1p(-np.maximum(need, 0) / y_start) / np.log(q) - 1e-12)
+        k = np.where(need <= 0, 0, k)
+        y_k = y_start * -np.expm1(k * np.log(q))
+        t_first = k * period + rc * np.log((v_pwm - y_k) / (v_pwm - v_th))
+        t_first = np.where(y_peak >= v_th, t_first, np.inf)
+
+        # Zeit über der Schwelle im eingeschwungenen Zustand
+        rise = rc * np.log((v_pwm - y_start) / (v_pwm - v_th))     # ab Periodenbeginn bis v_th
+        fall = rc * np.log(y_peak / v_th)                          # ab fallender Flanke bis v_th
+        above = (t_on - np.clip(rise, 0, t_on) + np.clip(fall, 0, period - t_on)) / period
+    above = np.where(y_start >= v_th, 1.0, np.where(y_peak < v_th, 0.0, above))
+
+    return {
+        'compare': compare, 'duty': duty,
+        'v_mean': v_pwm * duty, 'v_min': y_start, 'v_max': y_peak,
+        'ripple': y_peak - y_start, 't_first': t_first, 'above': above,
+    }
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    parser = argparse.ArgumentParser(description="Gatefilter über alle compare-Werte")
+    parser.add_argument("--vth", type=float, default=V_TH, help="Gate-Schwellspannung (V)")
+    parser.add_argument("--csv", help="Tabelle als CSV speichern")
+    parser.add_argument("--check", action="store_true", help="gegen PwmRc-Simulation prüfen")
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    res = duty_sweep(v_th=args.vth)
+    print(f"{res['compare'].size} compare-Werte in {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    conducts = np.flatnonzero(res['above'] > 0)
+    always = np.flatnonzero(res['above'] >= 1)
+    print(f"Schwelle {args.vth} V: erstmals erreicht ab compare {conducts[0]} "
+          f"(duty {res['duty'][conducts[0]] * 100:.2f} %), "
+          f"dauerhaft darüber ab compare {always[0]} (duty {res['duty'][always[0]] * 100:.2f} %)")
+    for c in (205, 819):      # entspricht D_5 = 0.05 und 0.2 in gs_filterung_*.py
+        print(f"  compare {c:4d}: {res['v_min'][c]:.3f} .. {res['v_max'][c]:.3f} V, "
+              f"Ripple {res['ripple'][c]:.3f} V, t_first {res['t_first'][c] * 1e6:.2f} µs, "
+              f"über Schwelle {res['above'][c] * 100:.1f} %")
+
+    if args.check:
+        from pwm_sim import PwmRc, pwm_edges
+        for c in (100, 205, 400, 819, 2047, 3500):
+            duty = c / COUNTER_MAX
+            sim = PwmRc(*pwm_edges(T_PWM, duty, 400 * T_PWM, V_PWM), R * C)
+            t = np.linspace(0, 400 * T_PWM, 4_000_001)
+            y = sim(t)
+            cross = t[np.argmax(y >= args.vth)] if (y >= args.vth).any() else np.inf
+            last = t >= 399 * T_PWM
+            print(f"  check {c:4d}: t_first {cross * 1e6:.3f} / {res['t_first'][c] * 1e6:.3f} µs, "
+                  f"über Schwelle {(y[last] >= args.vth).mean() * 100:.2f} / {res['above'][c] * 100:.2f} %")
+
+    if args.csv:
+        np.savetxt(args.csv, np.column_stack([res[k] for k in COLUMNS]), delimiter=',',
+                   header=','.join(COLUMNS), comments='', fmt='%.9g')
+        print(f"gespeichert: {args.csv}")
+
+    if not args.no_plot:
+        fig, axs = plt.subplots(3, 1, sharex=True, figsize=(10, 8))
+        c = res['compare']
+        axs[0].fill_between(c, res['v_min'], res['v_max'], color='green', alpha=0.3, label='min .. max')
+        axs[0].plot(c, res['v_mean'], color='green', label='Mittelwert')
+        axs[0].axhline(args.vth, color='black', linestyle='--', alpha=0.5, label=f'Schwelle {args.vth} V')
+        axs[0].set_ylabel("GS-Spannung (V)")
+        axs[0].legend(loc='upper left')
+        axs[1].plot(c, res['above'] * 100, color='red')
+        axs[1].set_ylabel("über Schwelle (%)")
+        axs[2].plot(c, res['t_first'] * 1e6, color='blue')
+        axs[2].set_yscale('log')
+        axs[2].set_ylabel("erstes Erreichen (µs)")
+        axs[2].set_xlabel("compare (12 Bit)")
+        for ax in axs:
+            ax.grid(True)
+        fig.suptitle(f"Gatefilter R = {R} Ω, C = {C * 1e9:.0f} nF, f_PWM = {1 / T_PWM / 1e3:.2f} kHz")
+        plt.tight_layout()
+        plt.show()
@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from sim_stream import PwmRcStream, WindowStats
+from color_strip import color_strip
+
 # Parameter
 V_pwm = 3.3
 D_5 = 0.2
@@ -13,17 +16,21 @@ tau = R * C
 # Zeitachse
 n_periods = 500
 dt = T_pwm / 100
-t = np.arange(0, n_periods * T_pwm, dt)
-t_1ms_index = np.searchsorted(t, 1e-3)
 
-# PWM-Signal bei 5 % Duty Cycle
-pwm_signal_5 = ((t % T_pwm) < (D_5 * T_pwm)).astype(float) * V_pwm
-
-# GS-Spannung mit RC-Tiefpass berechnen (Euler-Verfahren)
-v_out_5 = np.zeros_like(t)
-for i in range(1, len(t)):
-    dv = (pwm_signal_5[i-1] - v_out_5[i-1]) / tau
-    v_out_5[i] = v_out_5[i-1] + dv * dt
+# PWM und GS-Spannung blockweise mit mitgeführtem Filterzustand (sim_stream.py,
+# Eingang über dt gehalten). Behalten wird nur die erste 1 ms für die Plots,
+# min/max/Mittel pro PWM-Periode laufen über alle Perioden mit.
+stream = PwmRcStream(T_pwm, D_5, tau, dt, V_pwm)
+stats = WindowStats(100)
+shown = []
+for t_chunk, pwm_chunk, v_chunk in stream.chunks(n_periods * 100):
+    if t_chunk[0] < 1e-3:
+        shown.append((t_chunk, pwm_chunk, v_chunk))
+    stats.update(v_chunk)
+t, pwm_signal_5, v_out_5 = (np.concatenate(parts) for parts in zip(*shown))
+t_1ms_index = np.searchsorted(t, 1e-3)
+_, v_min, v_max, v_mean = stats.last
+print(f"letzte PWM-Periode: {v_min:.3f} .. {v_max:.3f} V, Mittel {v_mean:.3f} V")
 
 # Invertierte Helligkeit (0 V = weiß, 3.3 V = schwarz)
 brightness_fullrange_5 = np.clip(v_out_5 / 3.3, 0, 1)
@@ -54,9 +61,7 @@ axs[1].set_ylim(0, 3.6)
 axs[1].grid(True)
 
 # Plot 3: Invertierter Helligkeitsverlauf
-for i in range(1, t_1ms_index):
-    gray_val = brightness_fullrange_5[i]  # 0 = weiß, 1 = schwarz
-    axs[2].axvspan(t[i-1] * 1e6, t[i] * 1e6, color=(gray_val, gray_val, gray_val), alpha=1.0)
+color_strip(axs[2], t[:t_1ms_index] * 1e6, brightness_fullrange_5[:t_1ms_index])
 
 axs[2].set_title("Ausgangshelligkeit (schwarz = 0,0 V, weiß = 3,3 V)")
 axs[2].set_ylabel("Helligkeit")
@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from rc_filter import rc_lowpass
+from pwm_waveform import compare_steps, compare_edges, pwm_sample
+
 # === Parameter ===
 V_max_bits = 0xfff     # 12 Bit Auflösung, entspricht 4095
 t_total = 2e-3         # 2 ms Gesamtdauer
@@ -22,36 +25,22 @@ t = np.linspace(0, t_total, samples)
 dt = t[1] - t[0]
 
 # === PWM erzeugen anhand Counter-Wert ===
-t_pwm = []
-v_pwm = []
-current_time = 0.0
-while current_time < t_total:
-    if current_time < 1e-3:
-        duty = 0.0
-    else:
-        duty = compare_val / counter_max
-    on_time = pwm_period * duty
-    t_pwm.extend([current_time, current_time + on_time, current_time + on_time, current_time + pwm_period])
-    v_pwm.extend([V_max_bits, V_max_bits, 0, 0])
-    current_time += pwm_period
-
-# === Interpoliertes PWM-Signal ===
-v_pwm_interp = np.interp(t, t_pwm, v_pwm)
+n_periods = int(np.ceil(t_total / pwm_period))
+compare = compare_steps(n_periods, pwm_period, [(1e-3, compare_val)])
+t_pwm, v_pwm = compare_edges(compare, pwm_period, counter_max, v_high=V_max_bits)
+duty = compare_val / counter_max
+
+# === Abgetastetes PWM-Signal ===
+v_pwm_interp = pwm_sample(t_pwm, v_pwm, t)
 
 # === RC-Filterung des PWM-Signals ===
-v_out_pwm = np.zeros_like(t)
-for i in range(1, len(t)):
-    dv = (v_pwm_interp[i] - v_out_pwm[i - 1]) * dt / RC
-    v_out_pwm[i] = v_out_pwm[i - 1] + dv
+v_out_pwm = rc_lowpass(v_pwm_interp, dt, RC)
 
 # === Ideales analoges Rechtecksignal (500 Hz) ===
 v_analog = np.where(t < 1e-3, 0, V_max_bits * duty)
 
 # === RC-Filterung des analogen Rechtecksignals ===
-v_out_analog = np.zeros_like(t)
-for i in range(1, len(t)):
-    dv = (v_analog[i] - v_out_analog[i - 1]) * dt / RC
-    v_out_analog[i] = v_out_analog[i - 1] + dv
+v_out_analog = rc_lowpass(v_analog, dt, RC)
 
 # === Stelle finden, an der Differenz zwischen analogem Rechteck und RC-Ausgang 1 LSB beträgt ===
 diff = np.abs(v_analog - v_out_analog)
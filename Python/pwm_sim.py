@@ -0,0 +1,181 @@
+import numpy as np
+
+# =============================================================
+# PWM -> RC ohne Zeitraster (von Flanke zu Flanke)
+#
+# Zwischen zwei Flanken ist der Eingang konstant, die RC-Spannung
+# läuft exakt exponentiell auf diesen Pegel zu:
+#   y(t) = v_k + (y_k - v_k) * exp(-(t - t_k) / RC),  t_k <= t < t_k+1
+# Die Spannungen y_k an den Flanken folgen aus der affinen Rekursion
+#   y_k+1 = a_k * y_k + (1 - a_k) * v_k,   a_k = exp(-(t_k+1 - t_k) / RC)
+# Sie wird als Präfix-Scan über die Abbildungen y -> A y + B gerechnet,
+# blockweise in zwei Durchgängen (O(Flanken), ~2 sqrt(Flanken) NumPy-
+# Schritte statt einer Python-Schleife pro Flanke) und ohne Unterlauf-
+# problem wie bei einem kumulativen Produkt der a_k.
+# Danach lässt sich y an beliebigen Zeitpunkten auswerten (ADC-Samples,
+# Plot-Raster) – Aufwand O(Flanken + Abfragen).
+# =============================================================
+
+
+def pwm_edges(period, duty, t_end, v_high=1.0, v_low=0.0, t_start=0.0):
+    """
+    Flanken eines PWM-Signals: Periode k beginnt bei t_start + k * period
+    (ganzzahliges k, keine aufaddierte Drift) mit v_high und fällt nach
+    duty * period auf v_low. duty: Skalar oder ein Wert pro Periode.
+    Liefert (times, levels); levels[k] gilt ab times[k].
+    """
+    n = int(np.ceil((t_end - t_start) / period))
+    duty = np.broadcast_to(np.asarray(duty, dtype=np.float64), (n,))
+    start = t_start + np.arange(n) * period
+    times = np.empty(2 * n)
+    levels = np.empty(2 * n)
+    times[0::2], times[1::2] = start, start + duty * period
+    levels[0::2], levels[1::2] = v_high, v_low
+    return times, levels
+
+
+def affine_scan(A, B):
+    """
+    Inklusiver Scan der Abbildungen y -> A y + B entlang der letzten Achse,
+    blockweise in zwei Durchgängen (O(n) Arbeit und Speicher):
+      1. Scan innerhalb von Blöcken der Länge m, alle Blöcke gleichzeitig
+      2. Übertrag von Block zu Block, dann auf alle Elemente angewendet
+    Python-Schleifen nur über m + n/m ~ 2 sqrt(n) Schritte. A und B werden
+    gebroadcastet (z. B. A (..., 1) als fester Faktor je Zeile) und dürfen
+    komplex sein (state_space.ss_filter).
+    """
+    A, B = np.asarray(A), np.asarray(B)
+    shape = np.broadcast_shapes(A.shape, B.shape)
+    batch, n = shape[:-1], shape[-1]
+    dtype = np.result_type(A, B, np.float64)
+    if n == 0:
+        return np.zeros(shape, dtype), np.zeros(shape, dtype)
+    m = int(np.ceil(np.sqrt(n)))
+    n_blocks = -(-n // m)
+    # mit Identitäten (A = 1, B = 0) auf n_blocks * m auffüllen
+    A_ = np.ones(batch + (n_blocks * m,), dtype)
+    B_ = np.zeros(batch + (n_blocks * m,), dtype)
+    A_[..., :n], B_[..., :n] = A, B
+    A_ = A_.reshape(batch + (n_blocks, m))
+    B_ = B_.reshape(batch + (n_blocks, m))
+
+    for j in range(1, m):
+        B_[..., j] += A_[..., j] * B_[..., j - 1]
+        A_[..., j] *= A_[..., j - 1]
+
+    # exklusiver Präfix über die Blöcke (Abbildung vor Blockbeginn)
+    A_pre = np.ones(batch + (n_blocks,), dtype)
+    B_pre = np.zeros(batch + (n_blocks,), dtype)
+    for i in range(1, n_blocks):
+        A_pre[..., i] = A_[..., i - 1, -1] * A_pre[..., i - 1]
+        B_pre[..., i] = A_[..., i - 1, -1] * B_pre[..., i - 1] + B_[..., i - 1, -1]
+
+    B_ += A_ * B_pre[..., np.newaxis]
+    A_ *= A_pre[..., np.newaxis]
+    return A_.reshape(batch + (-1,))[..., :n], B_.reshape(batch + (-1,))[..., :n]
+
+
+class PwmRc:
+    """
+    RC-Antwort auf ein stückweise konstantes Signal (times, levels).
+    rc darf ein Array sein (mehrere Zeitkonstanten auf einmal), y0 ist
+    die Spannung bei times[0]. Ergebnisse haben die Form rc.shape + (...).
+    """
+    def __init__(self, times, levels, rc, y0=0.0):
+        self.times = np.asarray(times, dtype=np.float64)
+        self.levels = np.asarray(levels, dtype=np.float64)
+        self.rc = np.asarray(rc, dtype=np.float64)
+        rc_ = self.rc[..., np.newaxis]
+        a = np.exp(-np.diff(self.times) / rc_)
+        A, B = affine_scan(a, (1 - a) * self.levels[:-1])
+        y0 = np.broadcast_to(np.asarray(y0, dtype=np.float64), self.rc.shape)[..., np.newaxis]
+        self.y_edges = np.concatenate((y0, A * y0 + B), axis=-1)   # y an jeder Flanke
+
+    def __call__(self, t):
+        """Spannung zu den Zeitpunkten t (vor times[0]: y0)."""
+        t = np.asarray(t, dtype=np.float64)
+        k = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, None)
+        dt = np.maximum(t - self.times[k], 0)
+        v = self.levels[k]
+        return v + (self.y_edges[..., k] - v) * np.exp(-dt / self._rc(t))
+
+    def _rc(self, t):
+        # rc passend zu den Achsen der Abfragezeiten
+        return self.rc.reshape(self.rc.shape + (1,) * t.ndim)
+
+    def integral(self, t):
+        """Exaktes Integral von y ab times[0] bis t (stückweise Exponentialfunktionen)."""
+        t = np.asarray(t, dtype=np.float64)
+        if not hasattr(self, '_F'):
+            rc_ = self.rc[..., np.newaxis]
+            dt = np.diff(self.times)
+            v = self.levels[:-1]
+            seg = v * dt + (self.y_edges[..., :-1] - v) * rc_ * -np.expm1(-dt / rc_)
+            self._F = np.concatenate((np.zeros(self.rc.shape + (1,)), np.cumsum(seg, axis=-1)),
+                                     axis=-1)
+        k = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, None)
+        dt = np.maximum(t - self.times[k], 0)
+        v = self.levels[k]
+        rc_ = self._rc(t)
+        return self._F[..., k] + v * dt + (self.y_edges[..., k] - v) * rc_ * -np.expm1(-dt / rc_)
+
+    def mean(self, t0, t1):
+        """Zeitlicher Mittelwert von y über [t0, t1]."""
+        return (self.integral(t1) - self.integral(t0)) / (np.asarray(t1) - np.asarray(t0))
+
+    def extrema(self, t0, t1):
+        """(min, max) von y über [t0, t1]; zwischen Flanken ist y monoton."""
+        inside = (self.times > t0) & (self.times < t1)
+        y = np.concatenate((self.y_edges[..., inside], self([t0, t1])), axis=-1)
+        return y.min(axis=-1), y.max(axis=-1)
+
+
+def pwm_steady_state(period, duty, rc, v_high=1.0, v_low=0.0):
+    """
+    Eingeschwungener Zustand bei konstantem duty: (y_start, y_peak) am
+    Periodenbeginn (Minimum) und an der fallenden Flanke (Maximum).
+    Der Mittelwert ist exakt v_low + duty * (v_high - v_low).
+    """
+    rc = np.asarray(rc, dtype=np.float64)
+    a_on = np.exp(-duty * period / rc)
+    a_off = np.exp(-(1 - duty) * period / rc)
+    # y_peak = a_on y_start + (1 - a_on) v_high,  y_start = a_off y_peak + (1 - a_off) v_low
+    y_start = (a_off * (1 - a_on) * v_high + (1 - a_off) * v_low) / (1 - a_on * a_off)
+    y_peak = a_on * y_start + (1 - a_on) * v_high
+    return y_start, y_peak
+
+
+if __name__ == "__main__":
+    import time
+    from rc_filter import rc_lowpass
+
+    # Parameter wie current/ina_filter_adc.py
+    V_max_bits = 0xfff
+    pwm_period = 1 / 15e3
+    RC = 1e3 * 60.1e-9
+    t_total = 2e-3
+
+    # Vergleich mit rc_lowpass auf einem Raster, auf dem alle Flanken liegen
+    # (50 % Duty, 2000 Schritte pro Periode) -> beide Rechnungen exakt
+    n_per = int(np.ceil(t_total / pwm_period))
+    steps = 2000
+    duty = np.where(np.arange(n_per) * pwm_period < 1e-3, 0.0, 0.5)
+    times, levels = pwm_edges(pwm_period, duty, t_total, V_max_bits)
+    sim = PwmRc(times, levels, RC)
+    i = np.arange(n_per * steps)
+    t = i * (pwm_period / steps)
+    grid_levels = np.where((i % steps < steps // 2) & (duty[i // steps] > 0), V_max_bits, 0.0)
+    grid = rc_lowpass(grid_levels, pwm_period / steps, RC, hold='previous')
+    print(f"max. Abweichung zum Raster: {np.abs(sim(t) - grid).max():.2e} Bits")
+
+    # Sekunden PWM: Kosten ~ Anzahl Flanken
+    for f_pwm, name in ((15e3, "15 kHz"), (64e6 / 0xFFF, "64 MHz/0xFFF")):
+        seconds = 10
+        times, levels = pwm_edges(1 / f_pwm, 0.2, seconds, 3.3)
+        t_adc = np.arange(0, seconds, 14 / (64e6 / 6))          # ADC-Takt 64 MHz/6, 14 Takte
+        t0 = time.perf_counter()
+        sim = PwmRc(times, levels, [194.3 * 100e-9, RC])
+        y = sim(t_adc)
+        dt = time.perf_counter() - t0
+        print(f"{name}: {seconds} s, {times.size} Flanken, 2 Zeitkonstanten, "
+              f"{t_adc.size} ADC-Zeitpunkte: {dt:.2f} s (Mittel {y[:, -1000:].mean(axis=1).round(3)} V)")
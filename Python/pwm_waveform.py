@@ -0,0 +1,122 @@
+import numpy as np
+
+from pwm_sim import pwm_edges
+
+# =============================================================
+# PWM-Signal aus einem compare-Wert pro Periode (vektorisiert)
+#
+# Ersetzt die Schleifen  while current_time < t_total: ... extend(...)
+# der PWM-Skripte. Periode k beginnt exakt bei t_start + k * period
+# (ganzzahliges k), es wird keine Zeit aufaddiert -> keine Drift.
+# duty = compare / counter_max.
+#
+#  mode='edge'   : high ab Periodenbeginn für duty * period (Zählung aufwärts)
+#  mode='center' : high-Puls mittig in der Periode (Zählung auf/ab)
+#
+# Ergebnis wie in pwm_sim.py: (times, levels), levels[i] gilt ab times[i];
+# mode='edge' ist pwm_sim.pwm_edges mit duty aus den compare-Werten.
+# =============================================================
+
+MODES = ('edge', 'center')
+
+
+def compare_steps(n_periods, period, steps, t_start=0.0):
+    """
+    compare pro Periode aus Umschaltpunkten [(t, compare), ...]: eine
+    Periode bekommt den Wert des letzten Punkts mit t <= Periodenbeginn,
+    vor dem ersten Punkt 0. Beispiel der Skripte: [(1e-3, compare_val)].
+    """
+    starts = t_start + np.arange(n_periods) * period
+    times = np.array([t for t, _ in steps], dtype=np.float64)
+    values = np.array([0] + [c for _, c in steps])
+    # kleine Toleranz gegen Rundung von k * period genau auf einem Umschaltpunkt
+    return values[np.searchsorted(times, starts + 1e-9 * period, side='right')]
+
+
+def program_compare(values, fps, period, counter_max=0xfff, max_value=255, t_start=0.0,
+                    n_periods=None):
+    """
+    Lichtprogramm (ein Wert pro Frame) auf PWM-Perioden hochgetastet:
+    jede Periode nimmt den Frame, in dem sie beginnt.
+    """
+    values = np.asarray(values)
+    if n_periods is None:
+        n_periods = int(np.floor(values.shape[-1] / fps / period))
+    frame = np.floor((t_start + np.arange(n_periods) * period) * fps + 1e-9).astype(np.int64)
+    frame = np.minimum(frame, values.shape[-1] - 1)
+    return np.rint(values[..., frame] * (counter_max / max_value)).astype(np.int64)
+
+
+def compare_edges(compare, period, counter_max=0xfff, mode='edge', v_high=1.0, v_low=0.0,
+                  t_start=0.0):
+    """Flanken für compare-Werte (ein Wert pro Periode, 1-D)."""
+    if mode not in MODES:
+        raise ValueError(f"mode muss einer von {MODES} sein")
+    compare = np.asarray(compare)
+    duty = np.clip(compare / counter_max, 0, 1)
+    if mode == 'edge':
+        # t_end mitten in der letzten Periode: genau compare.size Perioden
+        t_end = t_start + (compare.size - 0.5) * period
+        times, levels = pwm_edges(period, duty, t_end, v_high, v_low, t_start)
+    else:
+        start = t_start + np.arange(compare.size) * period
+        times = np.empty(3 * compare.size)
+        times[0::3] = start
+        times[1::3] = start + (1 - duty) * period / 2
+        times[2::3] = start + (1 + duty) * period / 2
+        levels = np.tile([v_low, v_high, v_low], compare.size)
+    return times, levels
+
+
+def pwm_sample(times, levels, t, v_before=0.0):
+    """Stufensignal (times, levels) zu den Zeitpunkten t."""
+    k = np.searchsorted(times, t, side='right') - 1
+    return np.where(k >= 0, np.asarray(levels)[np.maximum(k, 0)], v_before)
+
+
+def pwm_waveform(compare, period, t, counter_max=0xfff, mode='edge', v_high=1.0, v_low=0.0,
+                 t_start=0.0):
+    """Abgetastetes PWM-Signal direkt aus den compare-Werten."""
+    times, levels = compare_edges(compare, period, counter_max, mode, v_high, v_low, t_start)
+    return pwm_sample(times, levels, t, v_low)
+
+
+if __name__ == "__main__":
+    import time
+    from clip_cutter import load_light_program, FPS
+
+    # Skript-Szenario: 15 kHz, compare 0 bis 1 ms, danach counter_max // 2
+    period = 1 / 15e3
+    t_total = 2e-3
+    n = int(np.ceil(t_total / period))
+    compare = compare_steps(n, period, [(1e-3, 0xfff // 2)])
+    t = np.linspace(0, t_total, 20000)
+    v = pwm_waveform(compare, period, t, v_high=0xfff)
+
+    # alte Schleife zum Vergleich
+    t_pwm, v_pwm, current_time = [], [], 0.0
+    while current_time < t_total:
+        duty = 0.0 if current_time < 1e-3 else (0xfff // 2) / 0xfff
+        on_time = period * duty
+        t_pwm.extend([current_time, current_time + on_time, current_time + on_time,
+                      current_time + period])
+        v_pwm.extend([0xfff, 0xfff, 0, 0])
+        current_time += period
+    v_old = np.interp(t, t_pwm, v_pwm)
+    # aufaddierte Zeit über 10 s PWM gegenüber k * period
+    acc = 0.0
+    for _ in range(int(10 / period)):
+        acc += period
+    print(f"Drift von current_time += period nach 10 s: {acc - int(10 / period) * period:.2e} s")
+    print(f"Perioden mit compare > 0: alt {sum(1 for x in t_pwm[::4] if x >= 1e-3)}, "
+          f"neu {np.count_nonzero(compare)}")
+    print(f"abweichende Samples: {np.count_nonzero(v != v_old)} von {t.size}")
+
+    # Lichtprogramm auf 64 MHz / 0xFFF hochgetastet, alle 4 Kanäle
+    program = load_light_program()
+    period = 0xFFF / 64e6
+    t0 = time.perf_counter()
+    cmp = program_compare(program['channels'], FPS, period)
+    edges = [compare_edges(c, period, mode='center', v_high=3.3) for c in cmp]
+    print(f"Programm {program['channels'].shape[1] / FPS:.0f} s -> {cmp.shape[1]} Perioden x 4 Kanäle, "
+          f"{sum(e[0].size for e in edges)} Flanken in {(time.perf_counter() - t0) * 1e3:.0f} ms")
@@ -0,0 +1,143 @@
+import numpy as np
+
+from rc_filter import rc_lowpass
+
+# =============================================================
+# PWM -> RC blockweise mit mitgeführtem Zustand
+#
+# Wie gs_filterung_*.py (Raster dt, Eingang über dt gehalten), aber
+# in Blöcken fester Länge statt ganzer Arrays für t, PWM und v_out:
+# Speicher bleibt konstant, egal wie lang simuliert wird.
+#   - Sample n liegt exakt bei n * dt (ganzzahliges n, keine Drift)
+#   - Filterzustand zwischen Blöcken: letztes Eingangssample und
+#     letzte Ausgangsspannung; der Block wird mit diesem Sample vorne
+#     gefiltert -> bitgleich zur Rechnung am Stück
+#   - Auswertungen (WindowStats, Crossings) bekommen jeden Block und
+#     geben fertige Ergebnisse sofort zurück, Reste bleiben stehen
+# =============================================================
+
+CHUNK = 1 << 16
+
+
+class PwmRcStream:
+    """
+    PWM (period, duty, v_high/v_low) über RC (rc) auf dem Raster dt.
+    duty: Skalar oder ein Wert pro Periode (danach bleibt der letzte).
+    """
+    def __init__(self, period, duty, rc, dt, v_high=1.0, v_low=0.0, y0=0.0, chunk=CHUNK):
+        self.period = period
+        self.duty = np.atleast_1d(np.asarray(duty, dtype=np.float64))
+        self.rc = rc
+        self.dt = dt
+        self.v_high, self.v_low = v_high, v_low
+        self.chunk = chunk
+        self.n = 0                 # nächstes Sample
+        self._x_last = None        # Zustand: letztes Eingangssample ...
+        self._y_last = y0          # ... und letzte Ausgangsspannung
+
+    def pwm(self, n0, n1):
+        t = np.arange(n0, n1) * self.dt
+        k = np.minimum((t // self.period).astype(np.int64), self.duty.size - 1)
+        on = (t % self.period) < self.duty[k] * self.period
+        return t, np.where(on, self.v_high, self.v_low)
+
+    def chunks(self, n_samples):
+        """Erzeugt (t, pwm, v) blockweise für die nächsten n_samples Samples."""
+        end = self.n + n_samples
+        while self.n < end:
+            n1 = min(self.n + self.chunk, end)
+            t, x = self.pwm(self.n, n1)
+            if self._x_last is None:
+                v = rc_lowpass(x, self.dt, self.rc, y0=self._y_last, hold='previous')
+            else:
+                v = rc_lowpass(np.concatenate(([self._x_last], x)), self.dt, self.rc,
+                               y0=self._y_last, hold='previous')[1:]
+            self._x_last, self._y_last = x[-1], v[-1]
+            self.n = n1
+            yield t, x, v
+
+
+class WindowStats:
+    """min/max/Mittel über Fenster aus n_window Samples, fortlaufend."""
+    def __init__(self, n_window):
+        self.n_window = n_window
+        self.index = 0             # Nummer des nächsten fertigen Fensters
+        self.last = None           # (index, min, max, mean) des zuletzt fertigen Fensters
+        self._rest = np.empty(0)
+
+    def update(self, v):
+        """Liefert (index, min, max, mean) der in diesem Block fertig gewordenen Fenster."""
+        v = np.concatenate((self._rest, v)) if self._rest.size else v
+        n_full = v.size // self.n_window
+        full = v[:n_full * self.n_window].reshape(n_full, self.n_window)
+        self._rest = v[n_full * self.n_window:].copy()
+        idx = self.index + np.arange(n_full)
+        self.index += n_full
+        result = idx, full.min(axis=1), full.max(axis=1), full.mean(axis=1)
+        if n_full:
+            self.last = tuple(r[-1] for r in result)
+        return result
+
+
+class Crossings:
+    """Schwellwert-Durchgänge, linear zwischen den Samples interpoliert."""
+    def __init__(self, level):
+        self.level = level
+        self._t_last = None
+        self._v_last = None
+
+    def update(self, t, v):
+        """Liefert (Zeitpunkte, Richtung +1 steigend / -1 fallend) in diesem Block."""
+        if self._t_last is not None:
+            t = np.concatenate(([self._t_last], t))
+            v = np.concatenate(([self._v_last], v))
+        self._t_last, self._v_last = t[-1], v[-1]
+        above = v >= self.level
+        k = np.flatnonzero(above[1:] != above[:-1])
+        frac = (self.level - v[k]) / (v[k + 1] - v[k])
+        return t[k] + frac * (t[k + 1] - t[k]), np.where(above[k + 1], 1, -1)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="PWM -> RC blockweise über lange Zeiträume")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--chunk", type=int, default=CHUNK)
+    args = parser.parse_args()
+
+    # Parameter wie gs-filter/gs_filterung_20.py
+    V_pwm = 3.3
+    T_pwm = 0xFFF / 64e6
+    dt = T_pwm / 100
+    tau = 194.3 * 100e-9
+
+    # Vergleich mit der Rechnung am Stück (500 Perioden)
+    t = np.arange(0, 500 * T_pwm, dt)
+    full = rc_lowpass(((t % T_pwm) < (0.2 * T_pwm)).astype(float) * V_pwm, dt, tau, hold='previous')
+    parts = [v for _, _, v in PwmRcStream(T_pwm, 0.2, tau, dt, V_pwm, chunk=777).chunks(t.size)]
+    print(f"500 Perioden blockweise (777 Samples): max. Abweichung "
+          f"{np.abs(np.concatenate(parts) - full).max():.1e} V")
+
+    # Langlauf: duty springt nach 1 s von 20 % auf 60 %, Statistik pro PWM-Periode
+    n_per = int(args.seconds / T_pwm)
+    duty = np.where(np.arange(n_per) * T_pwm < 1.0, 0.2, 0.6)
+    stream = PwmRcStream(T_pwm, duty, tau, dt, V_pwm, chunk=args.chunk)
+    stats = WindowStats(100)
+    cross = Crossings(0.5)             # kleinste Gate-Threshold-Spannung
+    v_min, v_max, n_cross, first_cross = np.inf, -np.inf, 0, None
+    t0 = time.perf_counter()
+    for t, x, v in stream.chunks(n_per * 100):
+        idx, lo, hi, mean = stats.update(v)
+        v_min, v_max = min(v_min, lo.min(initial=np.inf)), max(v_max, hi.max(initial=-np.inf))
+        tc, direction = cross.update(t, v)
+        n_cross += tc.size
+        if first_cross is None and tc.size:
+            first_cross = tc[0]
+    dt_run = time.perf_counter() - t0
+    print(f"{args.seconds:.0f} s, {n_per} Perioden, {stream.n} Samples in {dt_run:.1f} s "
+          f"(Blöcke à {args.chunk} Samples)")
+    print(f"  Spannung {v_min:.3f} .. {v_max:.3f} V, letzte Periode Mittel {mean[-1]:.4f} V, "
+          f"Ripple {hi[-1] - lo[-1]:.4f} V")
+    print(f"  0.5 V erstmals bei {first_cross * 1e3:.3f} ms überschritten, {n_cross} Durchgänge")
@@ -0,0 +1,181 @@
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from scipy.signal import lfilter
+
+from pwm_sim import affine_scan
+
+# =============================================================
+# Verstärkerstufe mit Slew-Rate-Grenze (nichtlinear)
+#
+# Pro Sample (dt) mit optionaler Bandbreite (Pol tau_bw, ZOH):
+#   y[i] = y[i-1] + clip((1 - a) * (u - y[i-1]), -SR * dt, +SR * dt)
+#   a = exp(-dt / tau_bw)   (ohne tau_bw: a = 0, Ausgang folgt u)
+# u wie in rc_filter.py: hold='current' -> x[i], 'previous' -> x[i-1].
+#
+# Solange clip nicht greift, ist die Stufe linear (lfilter wie
+# rc_lowpass), während sie greift eine Rampe mit ±SR. Gerechnet wird
+# abschnittsweise und für alle Zeilen eines Batches gleichzeitig: jede
+# Runde nimmt für jede Zeile ein Fenster ab ihrer eigenen Position,
+# rechnet es linear (lfilter mit Anfangszustand, bei verschiedenen
+# Bandbreiten je Zeile pwm_sim.affine_scan) bzw. als Rampe und
+# übernimmt es bis zum ersten Wechsel der Zeile. Die Vorausschau je
+# Zeile beginnt nach einem Wechsel mit der Länge des letzten Abschnitts
+# derselben Art (+64) und verdoppelt sich, solange nichts passiert –
+# bei PWM meist eine Runde pro Abschnitt. Aufwand O(N) plus ein paar
+# NumPy-Aufrufe pro Flanke, unabhängig von der Zahl der Zeilen.
+# =============================================================
+
+LOOKAHEAD_MIN = 64
+LOOKAHEAD_MAX = 1 << 16
+
+
+def _linear(seg, y_prev, a):
+    """Lineare Stufe auf seg (Zeilen, m), Anfangswerte y_prev, a Skalar oder je Zeile."""
+    if np.ndim(a) == 0:
+        return lfilter([1 - a], [1, -a], seg, axis=-1, zi=(a * y_prev)[:, np.newaxis])[0]
+    a = a[:, np.newaxis]
+    A, B = affine_scan(a, (1 - a) * seg)
+    return A * y_prev[:, np.newaxis] + B
+
+
+def _windows(arr, width):
+    """Sicht (Zeilen, Länge - width + 1, width) auf alle Fenster arr[r, i:i + width]."""
+    s_row, s_col = arr.strides
+    return as_strided(arr, (arr.shape[0], arr.shape[1] - width + 1, width), (s_row, s_col, s_col))
+
+
+def _window(u, rows, p, width):
+    """u[r, p:p + width] für jede Zeile r, hinter dem Ende mit dem letzten Wert."""
+    if p.max() + width <= u.shape[1]:
+        return _windows(u, width)[rows, p]
+    idx = np.minimum(p[:, np.newaxis] + np.arange(width), u.shape[1] - 1)
+    return u[rows[:, np.newaxis], idx]
+
+
+def _first(switch, p, n):
+    """Länge bis zum ersten Wechsel je Zeile (höchstens bis n) und ob es einen gab."""
+    width = switch.shape[1]
+    if p.max() + width > n:
+        switch &= np.arange(width) < (n - p)[:, np.newaxis]
+    m = switch.argmax(axis=-1)
+    found = switch[np.arange(m.size), m]
+    return np.where(found, m, np.minimum(width, n - p)), found
+
+
+def _slew_rows(u, y_prev, a, step):
+    """u (Zeilen, n) ab i=1, y_prev = y[0], a und step = SR * dt je Zeile."""
+    rows, n = u.shape
+    # Überhang hinter n: Fenster werden ganz geschrieben, alles ab dem
+    # Wechsel überschreibt die nächste Runde
+    y = np.empty((rows, n + LOOKAHEAD_MAX))
+    y_prev = y_prev.copy()
+    pos = np.zeros(rows, dtype=np.int64)
+    start = np.zeros(rows, dtype=np.int64)      # Beginn des laufenden Abschnitts
+    sign = np.zeros(rows)                       # != 0: Zeile läuft gerade eine Rampe
+    look = np.full(rows, LOOKAHEAD_MIN)
+    last = np.full((2, rows), LOOKAHEAD_MIN)    # letzte Abschnittslänge linear / Rampe
+    a_lin = float(a[0]) if np.all(a == a[0]) else a
+    active = np.arange(rows)
+    while active.size:
+        for ramp in (False, True):
+            group = active[((sign[active] != 0) == ramp) & (pos[active] < n)]
+            if not group.size:
+                continue
+            p, yp, st = pos[group], y_prev[group], step[group, np.newaxis]
+            k = np.arange(look[group].max())
+            seg = _window(u, group, p, k.size)
+            if ramp:
+                # Rampe, solange (1 - a) * s * (u - y_prev) > step gilt
+                s = sign[group, np.newaxis]
+                prev = yp[:, np.newaxis] + (s * st) * k
+                switch = (1 - a[group, np.newaxis]) * s * (seg - prev) <= st
+                # gerade aus linear gekommen: das erste Sample ist geclippt,
+                # so kommt jeder Wechsel mindestens ein Sample weiter
+                switch[start[group] == p, 0] = False
+                cand = prev + s * st
+            else:
+                # linear bis zum ersten zu großen Schritt
+                cand = _linear(seg, yp, a_lin if np.ndim(a_lin) == 0 else a_lin[group])
+                switch = np.abs(np.diff(cand, axis=-1, prepend=yp[:, np.newaxis])) > st
+            m, found = _first(switch, p, n)
+
+            _windows(y, k.size)[group, p] = cand
+            moved = m > 0
+            y_prev[group[moved]] = cand[moved, m[moved] - 1]
+            pos[group] = p + m
+
+            # Vorausschau: nach einem Wechsel so lang wie der letzte
+            # Abschnitt derselben Art, sonst verdoppeln
+            hit = group[found]
+            last[int(ramp), hit] = pos[hit] - start[hit]
+            start[hit] = pos[hit]
+            sign[hit] = 0.0 if ramp else np.sign(u[hit, pos[hit]] - y_prev[hit])
+            look[hit] = np.minimum(last[1 - int(ramp), hit] + LOOKAHEAD_MIN, LOOKAHEAD_MAX)
+            calm = group[~found]
+            look[calm] = np.minimum(2 * look[calm], LOOKAHEAD_MAX)
+        active = active[pos[active] < n]
+    return y[:, :n]
+
+
+def slew_amp(x, dt, slew_rate, tau_bw=None, y0=0.0, hold='current'):
+    """
+    x entlang der letzten Achse durch die Stufe, y[0] = y0.
+    slew_rate in Einheiten von x pro s (2 V/µs -> 2e6). slew_rate, tau_bw
+    und y0 werden wie bei rc_lowpass mit den vorderen Achsen gebroadcastet.
+    """
+    if hold not in ('current', 'previous'):
+        raise ValueError("hold muss 'current' oder 'previous' sein")
+    x = np.asarray(x, dtype=np.float64)
+    sr = np.asarray(slew_rate, dtype=np.float64)
+    a = np.zeros(()) if tau_bw is None else np.exp(-dt / np.asarray(tau_bw, dtype=np.float64))
+    y0 = np.asarray(y0, dtype=np.float64)
+    batch = np.broadcast_shapes(x.shape[:-1], sr.shape, a.shape, y0.shape)
+    x = np.broadcast_to(x, batch + x.shape[-1:])
+    y = np.empty(x.shape)
+    y[..., 0] = y0
+    if x.shape[-1] < 2:
+        return y
+    u = x[..., 1:] if hold == 'current' else x[..., :-1]
+    sr, a, y0 = (np.broadcast_to(v, batch).ravel() for v in (sr, a, y0))
+    rows = y.reshape(-1, y.shape[-1])
+    rows[:, 1:] = _slew_rows(u.reshape(-1, u.shape[-1]), y0, a, sr * dt)
+    return y
+
+
+if __name__ == "__main__":
+    import time
+    from rc_filter import rc_lowpass
+    from adc_emulator import AdcEmulator, measurement_windows
+
+    def step_response(n, v, a, step):
+        """Sprung 0 -> v bei i = 1 geschlossen: Rampe, bis clip nicht mehr greift, dann exponentiell."""
+        k = np.arange(n)
+        k0 = 1 + np.argmin((1 - a) * (v - k[1:] * step + step) > step, axis=-1)[..., np.newaxis]
+        y_k0 = (k0 - 1) * step
+        return np.where(k < k0, k * step, v - (v - y_k0) * a ** np.maximum(k - k0 + 1, 0))
+
+    # Sprung 3.3 V, Bandbreite 1 MHz, drei Slew-Raten auf einmal
+    dt = 1e-8
+    tau_bw = 1 / (2 * np.pi * 1e6)
+    sr = np.array([20e6, 2e6, 0.5e6])
+    x = np.full(20000, 3.3)
+    x[0] = 0.0
+    y = slew_amp(x, dt, sr, tau_bw)
+    exact = step_response(x.size, 3.3, np.exp(-dt / tau_bw), sr[:, np.newaxis] * dt)
+    print(f"Sprung, {sr.size} Slew-Raten: max. Abweichung zur geschlossenen Form "
+          f"{np.abs(y - exact).max():.1e} V")
+
+    # Skala: 0.2 s PWM direkt in den INA, danach RC; ADC-Mittel je Fenster
+    dt = 2e-8
+    t = np.arange(int(0.2 / dt)) * dt
+    pwm = np.where((t * 15e3) % 1 < 0.3, 3.3, 0.0)
+    t0 = time.perf_counter()
+    ina = slew_amp(pwm, dt, np.array([np.inf, 2e6, 0.5e6]), tau_bw)
+    print(f"{t.size} Samples x 3 Slew-Raten: {time.perf_counter() - t0:.2f} s")
+    v = rc_lowpass(ina, dt, 1e3 * 60.1e-9)
+    adc = AdcEmulator(lsb=3.3 / 0xfff)
+    windows = measurement_windows(1e-3, 0.5, t[-1])
+    means = np.array([adc.measure((t, row), windows).mean() for row in v])
+    for sr, m in zip(("ohne", "2 V/µs", "0.5 V/µs"), means):
+        print(f"  Slew {sr:>8}: ADC-Mittel {m[10:].mean():.2f} Bits "
+              f"(Abweichung {m[10:].mean() - means[0, 10:].mean():+.2f})")
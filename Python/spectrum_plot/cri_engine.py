@@ -0,0 +1,189 @@
+import numpy as np
+
+# =============================================================
+# Farbwiedergabeindex (CIE 13.3, Ra) für viele Spektren auf einmal
+#
+# colour_rendering_index() baut pro Aufruf SpectralDistributions,
+# interpoliert auf 360..780 nm (1 nm) und integriert jede Testfarbe
+# einzeln. Alles davon außer der Referenzlichtquelle ist linear im
+# Spektrum und hängt nur vom Wellenlängengitter ab; das wird hier einmal
+# mit colour vorberechnet:
+#   M   (421, n)   Gitter -> 1 nm, colours Interpolation/Extrapolation
+#                  angewendet auf Einheitsvektoren
+#   B   (421, 45)  [x̄ ȳ z̄ | R_j x̄, R_j ȳ, R_j z̄ für die 14 Testfarben]
+# Ein Stapel Spektren (..., n) ergibt dann mit einem Matrixprodukt
+# Weißpunkt und alle Testfarben-XYZ: S @ (M.T @ B).
+# Referenz je Spektrum nach CCT (Robertson):
+#   CCT < 5000 K   Planck-Strahler, (k, 421) @ B für diese Spektren
+#   sonst          CIE-D-Reihe S0 + M1 S1 + M2 S2 -> nur drei
+#                  vorberechnete Zeilen S_i @ B
+# Danach CIE-1960-UCS, von-Kries-Anpassung (nur Testseite), U*V*W*,
+# R_i = 100 - 4.6 ΔE, Ra = Mittel R1..R8. Gleiche Formeln und
+# Konstanten wie colour 0.4 (CIE 1995-Testfarben, M1/M2 auf 3 Stellen
+# gerundet). Nullspektren ergeben NaN.
+# =============================================================
+
+N_RA = 8
+
+
+def _resample_matrix(wl, shape):
+    """(len(shape), len(wl)): colours reshape_sd auf Einheitsvektoren."""
+    from colour import SpectralDistribution
+    from colour.colorimetry import reshape_sd
+
+    columns = []
+    for i in range(wl.size):
+        e = np.zeros(wl.size)
+        e[i] = 1.0
+        columns.append(reshape_sd(SpectralDistribution(dict(zip(wl, e))), shape).values)
+    return np.stack(columns, axis=-1)
+
+
+def _uv(XYZ):
+    """CIE 1960 UCS u, v aus XYZ (letzte Achse)."""
+    X, Y, Z = XYZ[..., 0], XYZ[..., 1], XYZ[..., 2]
+    den = X + 15 * Y + 3 * Z
+    return 4 * X / den, 6 * Y / den
+
+
+def _cd(u, v):
+    return (4 - u - 10 * v) / v, (1.708 * v + 0.404 - 1.481 * u) / v
+
+
+class CriEngine:
+    """
+    Ra für Spektren auf dem festen Gitter wl (gleichabständig, nm).
+    Aufbau rechnet einmal mit colour (~0.1 s), ra() nur noch numpy.
+    """
+    def __init__(self, wl=np.arange(400, 751, 5)):
+        from colour import MSDS_CMFS
+        from colour.colorimetry import SPECTRAL_SHAPE_DEFAULT, reshape_msds, reshape_sd
+        from colour.colorimetry.illuminants import SDS_BASIS_FUNCTIONS_CIE_ILLUMINANT_D_SERIES
+        from colour.quality.datasets.tcs import INDEXES_TO_NAMES_TCS, SDS_TCS
+        from colour.colorimetry.blackbody import CONSTANT_C1, CONSTANT_C2
+
+        self.wl = np.asarray(wl, dtype=np.float64)
+        shape = SPECTRAL_SHAPE_DEFAULT
+        cmfs = reshape_msds(MSDS_CMFS["CIE 1931 2 Degree Standard Observer"], shape).values
+        self.lam = shape.wavelengths
+        self.M = _resample_matrix(wl, shape)
+
+        tcs = [SDS_TCS["CIE 1995"][name] for _, name in sorted(INDEXES_TO_NAMES_TCS["CIE 1995"].items())]
+        self.tcs_names = [sd.name for sd in tcs]
+        R = np.stack([reshape_sd(sd, shape).values for sd in tcs])
+        self.B = np.concatenate((cmfs, (R[:, :, np.newaxis] * cmfs).transpose(1, 0, 2).reshape(self.lam.size, -1)),
+                                axis=-1)
+        self.MB = self.M.T @ self.B
+
+        basis = SDS_BASIS_FUNCTIONS_CIE_ILLUMINANT_D_SERIES
+        S_d = np.stack([np.interp(self.lam, basis[k].wavelengths, basis[k].values) for k in ("S0", "S1", "S2")])
+        self.D_B = S_d @ self.B
+        self.c1, self.c2 = CONSTANT_C1, CONSTANT_C2
+
+    def _tcs(self, SB):
+        """(..., 45) -> Weißpunkt uv, Testfarben-Y (..., 14), Testfarben-uv (..., 14)."""
+        white = SB[..., :3]
+        XYZ = 100 * SB[..., 3:].reshape(SB.shape[:-1] + (-1, 3)) / white[..., np.newaxis, 1:2]
+        u, v = _uv(XYZ)
+        return _uv(white), XYZ[..., 1], (u, v)
+
+    def _reference(self, CCT):
+        """S_ref @ B (..., 45) für Referenzlichtquellen zu CCT (K)."""
+        from colour.temperature import CCT_to_xy_CIE_D
+
+        out = np.full(CCT.shape + (self.B.shape[1],), np.nan)
+        planck = CCT < 5000
+        if planck.any():
+            lam = self.lam * 1e-9
+            S = self.c1 * lam ** -5 / np.pi / np.expm1(self.c2 / (lam * CCT[planck][:, np.newaxis])) * 1e-9
+            out[planck] = S @ self.B
+        daylight = CCT >= 5000
+        if daylight.any():
+            x, y = np.moveaxis(CCT_to_xy_CIE_D(CCT[daylight]).reshape(-1, 2), -1, 0)
+            m = 0.0241 + 0.2562 * x - 0.7341 * y
+            m1 = np.around((-1.3515 - 1.7703 * x + 5.9114 * y) / m, 3)
+            m2 = np.around((0.0300 - 31.4424 * x + 30.0717 * y) / m, 3)
+            out[daylight] = self.D_B[0] + m1[:, np.newaxis] * self.D_B[1] + m2[:, np.newaxis] * self.D_B[2]
+        return out
+
+    def ra(self, spectra, return_ri=False):
+        """
+        spectra (..., len(wl)) -> Ra (...); mit return_ri zusätzlich
+        R1..R14 (..., 14).
+        """
+        from colour.temperature import uv_to_CCT_Robertson1968
+
+        spectra = np.asarray(spectra, dtype=np.float64)
+        batch = spectra.shape[:-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            (u_t, v_t), Y_t, (u_i, v_i) = self._tcs(spectra.reshape(-1, self.wl.size) @ self.MB)
+            CCT = uv_to_CCT_Robertson1968(np.stack((u_t, v_t), axis=-1))[..., 0]
+            (u_r, v_r), Y_r, (u_j, v_j) = self._tcs(self._reference(CCT))
+
+            # von-Kries-Anpassung der Testseite an die Referenz
+            c_t, d_t = _cd(u_t, v_t)
+            c_r, d_r = _cd(u_r, v_r)
+            c_i, d_i = _cd(u_i, v_i)
+            cc = (c_r / c_t)[:, np.newaxis] * c_i
+            dd = (d_r / d_t)[:, np.newaxis] * d_i
+            den = 16.518 + 1.481 * cc - dd
+            u_i, v_i = (10.872 + 0.404 * cc - 4 * dd) / den, 5.52 / den
+
+            W_t = 25 * np.cbrt(Y_t) - 17
+            W_r = 25 * np.cbrt(Y_r) - 17
+            dU = 13 * (W_t * (u_i - u_r[:, np.newaxis]) - W_r * (u_j - u_r[:, np.newaxis]))
+            dV = 13 * (W_t * (v_i - v_r[:, np.newaxis]) - W_r * (v_j - v_r[:, np.newaxis]))
+            ri = 100 - 4.6 * np.sqrt(dU ** 2 + dV ** 2 + (W_t - W_r) ** 2)
+        ra = ri[:, :N_RA].mean(axis=-1).reshape(batch)[()]
+        if return_ri:
+            return ra, ri.reshape(batch + (-1,))
+        return ra
+
+
+if __name__ == "__main__":
+    import os
+    import time
+    import warnings
+    import pandas as pd
+    from colour import SpectralDistribution, colour_rendering_index
+    from colour.colorimetry import SpectralShape
+
+    t0 = time.perf_counter()
+    engine = CriEngine()
+    print(f"Aufbau: {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+    wl = engine.wl
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+    def load(name):
+        df = pd.read_csv(os.path.join(data_dir, name))
+        return np.interp(wl, df["Wavelength [nm]"], df["Relative Intensity [%]"], left=0, right=0)
+
+    def gauss(center, width):
+        return np.exp(-((wl - center) ** 2) / (2 * width ** 2))
+
+    # Mischungen wie in spectrum_phosphor.py: SMD, Rot, Phosphor
+    base = np.stack((load("smd_led.csv"), load("red_led.csv"), 100 * gauss(580, 40)))
+    rng = np.random.default_rng(0)
+    check = np.concatenate((base, rng.random((40, 3)) @ base,
+                            [gauss(450, 12) + gauss(540, 30) + gauss(620, 20)]))
+
+    def reference(intensity):
+        sd = SpectralDistribution(dict(zip(wl, intensity)), name="Sample")
+        return colour_rendering_index(sd.interpolate(SpectralShape(400, 750, 5)))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        t0 = time.perf_counter()
+        ra_colour = np.array([reference(s) for s in check])
+        t_colour = (time.perf_counter() - t0) / len(check)
+    ra = engine.ra(check)
+    print(f"{len(check)} Spektren: Ra {ra.min():.1f} .. {ra.max():.1f}, "
+          f"max. Abweichung zu colour {np.abs(ra - ra_colour).max():.1e}")
+
+    mixes = rng.random((50_000, 3)) @ base
+    t0 = time.perf_counter()
+    engine.ra(mixes)
+    dt = time.perf_counter() - t0
+    print(f"{len(mixes)} Mischungen in {dt * 1e3:.0f} ms ({len(mixes) / dt:,.0f} / s), "
+          f"colour: {1 / t_colour:.0f} / s")
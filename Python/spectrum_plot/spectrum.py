@@ -4,8 +4,10 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from scipy.interpolate import interp1d
 from scipy.signal import savgol_filter
-from colour import SpectralDistribution, colour_rendering_index, wavelength_to_XYZ, XYZ_to_sRGB
-from colour.colorimetry import SpectralShape
+
+from cri_engine import CriEngine
+from spectrum_render import ColoredSpectrum, segment_colors
+from wavelength_lut import wavelength_to_rgb
 
 # 🔧 Projektverzeichnis bestimmen
 project_dir = os.path.dirname(os.path.abspath(__file__))
@@ -27,35 +29,19 @@ df_candle = trim(df_candle)
 df_filament_led = trim(df_filament_led)
 df_smd_led = trim(df_smd_led)
 
-# 🎯 CRI-Berechnung
-target_shape = SpectralShape(400, 750, 5)
+# 🎯 CRI-Berechnung (cri_engine.py, Messwerte linear auf 400–750 nm / 5 nm)
+cri_engine = CriEngine(np.arange(400, 751, 5))
 def compute_cri(df):
-    data = dict(zip(df["Wavelength [nm]"], df["Relative Intensity [%]"]))
-    sd = SpectralDistribution(data, name="Sample")
-    sd = sd.interpolate(target_shape)
-    return colour_rendering_index(sd)
+    # doppelte Wellenlängen: letzter Messwert zählt (wie beim dict der SpectralDistribution)
+    wl = df["Wavelength [nm]"].to_numpy()[::-1]
+    wl_unique, last = np.unique(wl, return_index=True)
+    intensity = df["Relative Intensity [%]"].to_numpy()[::-1][last]
+    return cri_engine.ra(np.interp(cri_engine.wl, wl_unique, intensity))
 
 cri_candle = compute_cri(df_candle)
 cri_filament = compute_cri(df_filament_led)
 cri_smd = compute_cri(df_smd_led)
 
-def wavelength_to_rgb(wavelength_nm):
-    if 380 <= wavelength_nm <= 645:
-        XYZ = wavelength_to_XYZ(wavelength_nm)
-        rgb = XYZ_to_sRGB(XYZ / max(XYZ))
-        return [max(0, min(1, c)) for c in rgb]
-    elif 645 < wavelength_nm <= 800:
-        t = (wavelength_nm - 645) / 100
-        XYZ_visible = wavelength_to_XYZ(645)
-        rgb_visible = XYZ_to_sRGB(XYZ_visible / max(XYZ_visible))
-        rgb_visible = [max(0, min(1, c)) for c in rgb_visible]
-        rgb_ir = [0.3, 0.0, 0.0]
-        return [(1 - t) * v + t * i for v, i in zip(rgb_visible, rgb_ir)]
-    elif wavelength_nm > 800:
-        return [0.3, 0.0, 0.0]
-    else:
-        return [0, 0, 0]
-
 # 🔍 Interpolation mit einheitlichem Bereich 400–750 nm
 def interpolate_df(df, resolution=0.1, wl_range=(400, 750)):
     wl = df["Wavelength [nm]"].to_numpy()
@@ -76,13 +62,8 @@ def plot_colored_spectrum(ax, df, title, cri, window_length=201, polyorder=2, re
     smoothed = savgol_filter(intensity, window_length=window_length, polyorder=polyorder)
     smoothed = np.clip(smoothed, 0, None)
 
-    for i in range(len(wl) - 1):
-        wl1, wl2 = wl[i], wl[i + 1]
-        inten1, inten2 = smoothed[i], smoothed[i + 1]
-        rgb = wavelength_to_rgb((wl1 + wl2) / 2)
-        ax.fill_between([wl1, wl2], [inten1, inten2], color=rgb, alpha=1.0)
-
-    ax.plot(wl, smoothed, color='black', linewidth=1.2)
+    # farbige Fläche als ein Bild (spectrum_render.py), Farben aus der Tabelle (wavelength_lut.py)
+    ColoredSpectrum(ax, wl, smoothed, segment_colors(wl, wavelength_to_rgb))
     ax.set_title(f"{title} (CRI = {cri:.2f} %)")
     ax.set_ylabel("Relative Intensität [%]")
     ax.grid(True)
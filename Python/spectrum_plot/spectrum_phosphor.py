@@ -3,10 +3,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 from scipy.interpolate import interp1d
-from colour import SpectralDistribution, colour_rendering_index, wavelength_to_XYZ, XYZ_to_sRGB
-from colour.colorimetry import SpectralShape
 import os
 
+from cri_engine import CriEngine
+from spectrum_render import ColoredSpectrum, segment_colors
+from wavelength_lut import wavelength_to_rgb
+
 # 🔧 CSV laden
 project_dir = os.path.dirname(os.path.abspath(__file__))
 csv_smd_led = os.path.join(project_dir, "data", "smd_led.csv")
@@ -27,36 +29,25 @@ def interpolate_df(df, resolution=5):
     intensity_new = f(wl_new)
     return wl_new, intensity_new
 
-# RGB-Konvertierung
-def wavelength_to_rgb(wl):
-    try:
-        XYZ = wavelength_to_XYZ(wl)
-        if np.max(XYZ) == 0:
-            return [0, 0, 0]
-        rgb = XYZ_to_sRGB(XYZ / np.max(XYZ))
-        return np.clip(rgb, 0, 1)
-    except Exception:
-        return [0, 0, 0]
-
-# CRI berechnen
-def compute_cri(wl, intensity):
-    data = dict(zip(wl, intensity))
-    sd = SpectralDistribution(data, name="Sample")
-    sd = sd.interpolate(SpectralShape(400, 750, 5))
-    return colour_rendering_index(sd)
-
-# Plotfunktion
+# CRI berechnen: alle Spektren eines Updates in einem Aufruf (cri_engine.py)
+cri_engine = CriEngine(np.arange(400, 751, 5))
+def compute_cri(*intensities):
+    return cri_engine.ra(np.stack(intensities))
+
+# Plotfunktion: Artists beim ersten Aufruf anlegen, danach nur aktualisieren
+# (spectrum_render.py, Farben aus der Tabelle in wavelength_lut.py)
+spectra = {}
 def plot_spectrum(ax, wl, intensity, title):
-    ax.clear()
-    for i in range(len(wl) - 1):
-        rgb = wavelength_to_rgb((wl[i] + wl[i + 1]) / 2)
-        ax.fill_between([wl[i], wl[i + 1]], [intensity[i], intensity[i + 1]], color=rgb)
-    ax.plot(wl, intensity, color='black', linewidth=0.8)
-    ax.set_xlim(400, 750)
+    if ax not in spectra:
+        spectra[ax] = ColoredSpectrum(ax, wl, intensity, segment_colors(wl, wavelength_to_rgb),
+                                      linewidth=0.8)
+        ax.set_xlim(400, 750)
+        ax.set_ylabel("Intensität [%]")
+        ax.grid(True)
+    else:
+        spectra[ax].update(intensity)
     ax.set_ylim(0, max(intensity)*1.1 if max(intensity) > 0 else 1)
-    ax.set_ylabel("Intensität [%]")
     ax.set_title(title)
-    ax.grid(True)
 
 # 💡 Daten vorbereiten
 wl, base_smd = interpolate_df(df_smd)
@@ -97,10 +88,7 @@ def update(val=None):
     smd_remaining = smd_scaled * (1 - absorption)
     total = smd_remaining + red_scaled + phosphor
 
-    cri_smd = compute_cri(wl, smd_scaled)
-    cri_red = compute_cri(wl, red_scaled)
-    cri_phos = compute_cri(wl, phosphor)
-    cri_total = compute_cri(wl, total)
+    cri_smd, cri_red, cri_phos, cri_total = compute_cri(smd_scaled, red_scaled, phosphor, total)
 
     plot_spectrum(axs[0], wl, smd_scaled, f"SMD LED (CRI = {cri_smd:.1f} %)")
     plot_spectrum(axs[1], wl, red_scaled, f"Rote LED (CRI = {cri_red:.1f} %)")
@@ -0,0 +1,53 @@
+import numpy as np
+from matplotlib.patches import Polygon
+
+# =============================================================
+# Farbige Fläche unter einem Spektrum mit einem einzigen Bild-Artist
+#
+# Statt eines fill_between (und einer Farbumrechnung) pro Segment:
+# ein 1 x Segmente-Bild mit der Farbe jeder Segmentmitte, auf die
+# Fläche unter der Kurve zugeschnitten (Clip-Pfad = Polygon unter der
+# Kurve). Gleiche Darstellung wie die Segment-Schleife, aber beim
+# Zeichnen nur ein Bild. Für Slider wird nur Clip-Polygon, Bildhöhe
+# und Linie aktualisiert (update), Farben bleiben.
+# Farben kommen als Array aus einer Funktion über alle Segmentmitten
+# (wavelength_lut.wavelength_to_rgb).
+# =============================================================
+
+
+def segment_colors(wl, rgb_func):
+    """RGB (Segmente, 3) an den Segmentmitten von wl; rgb_func rechnet auf Arrays."""
+    wl = np.asarray(wl, dtype=np.float64)
+    return np.clip(rgb_func((wl[:-1] + wl[1:]) / 2), 0, 1)
+
+
+def _area(wl, intensity):
+    return np.concatenate((np.column_stack((wl, intensity)), [[wl[-1], 0.0], [wl[0], 0.0]]))
+
+
+class ColoredSpectrum:
+    """
+    Farbige Fläche + schwarze Kurve für (wl, intensity) auf ax.
+    colors: (len(wl) - 1, 3) RGB je Segment (siehe segment_colors).
+    """
+    def __init__(self, ax, wl, intensity, colors, linewidth=1.2):
+        self.ax = ax
+        self.wl = np.asarray(wl, dtype=np.float64)
+        intensity = np.asarray(intensity, dtype=np.float64)
+        self.clip = Polygon(_area(self.wl, intensity), closed=True, transform=ax.transData,
+                            facecolor='none', edgecolor='none')
+        self.image = ax.imshow(np.asarray(colors)[np.newaxis], aspect='auto', origin='lower',
+                               interpolation='nearest', extent=self._extent(intensity))
+        self.image.set_clip_path(self.clip)
+        self.image.sticky_edges.y.clear()          # Achsenränder wie bei fill_between
+        self.line, = ax.plot(self.wl, intensity, color='black', linewidth=linewidth)
+
+    def _extent(self, intensity):
+        top = intensity.max() if intensity.size and intensity.max() > 0 else 1.0
+        return (self.wl[0], self.wl[-1], 0.0, top)
+
+    def update(self, intensity):
+        intensity = np.asarray(intensity, dtype=np.float64)
+        self.clip.set_xy(_area(self.wl, intensity))
+        self.image.set_extent(self._extent(intensity))
+        self.line.set_ydata(intensity)
@@ -0,0 +1,118 @@
+import os
+import zipfile
+
+import numpy as np
+
+# =============================================================
+# Wellenlänge -> sRGB als vorberechnete Tabelle
+#
+# Gleiche Farben wie wavelength_to_rgb() aus spectrum.py, aber einmal
+# für 360..830 nm in 0.1-nm-Schritten gerechnet (colour: CMFs ->
+# XYZ / max(XYZ) -> sRGB, auf 0..1 begrenzt) und als .npz neben den
+# Daten gespeichert. Danach ist jede Abfrage eine lineare Interpolation
+# über ganze Arrays, ohne colour-Import.
+#   < 380 nm        schwarz
+#   380..645 nm     Spektralfarbe
+#   645..800 nm     t = (wl - 645) / 100, linear zwischen der Farbe bei
+#                   645 nm und der IR-Farbe [0.3, 0, 0] (über t = 1
+#                   hinaus extrapoliert, wie spectrum.py)
+#   > 800 nm        IR-Farbe
+# =============================================================
+
+project_dir = os.path.dirname(os.path.abspath(__file__))
+LUT_PATH = os.path.join(project_dir, "data", "wavelength_rgb.npz")
+LUT_VERSION = 2
+WL_MIN, WL_MAX, WL_STEP = 360.0, 830.0, 0.1
+VISIBLE = (380.0, 645.0)
+IR_FADE = 100.0
+IR_END = 800.0
+IR_RGB = np.array([0.3, 0.0, 0.0])
+
+
+def build_lut(wl):
+    """Farben an den Wellenlängen wl (N,) -> (N, 3), rechnet mit colour."""
+    from colour import wavelength_to_XYZ, XYZ_to_sRGB
+
+    def spectral(w):
+        XYZ = wavelength_to_XYZ(w)
+        return np.clip(XYZ_to_sRGB(XYZ / XYZ.max(axis=-1, keepdims=True)), 0, 1)
+
+    rgb = np.zeros((wl.size, 3))
+    vis = (wl >= VISIBLE[0]) & (wl <= VISIBLE[1])
+    rgb[vis] = spectral(wl[vis])
+    fade = (wl > VISIBLE[1]) & (wl <= IR_END)
+    t = ((wl[fade] - VISIBLE[1]) / IR_FADE)[:, np.newaxis]
+    rgb[fade] = (1 - t) * spectral(np.array([VISIBLE[1]])) + t * IR_RGB
+    rgb[wl > IR_END] = IR_RGB
+    return rgb
+
+
+def load_lut(path=LUT_PATH):
+    """Tabelle von Platte laden, beim ersten Mal (oder neuer Version) erzeugen."""
+    try:
+        with np.load(path) as f:
+            if int(f['version']) == LUT_VERSION:
+                return f['rgb']
+    except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+        pass                           # fehlt, veraltet oder beschädigt -> neu erzeugen
+    n = int(round((WL_MAX - WL_MIN) / WL_STEP)) + 1
+    rgb = build_lut(WL_MIN + np.arange(n) * WL_STEP)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, rgb=rgb, version=LUT_VERSION)
+    os.replace(tmp, path)
+    return rgb
+
+
+_lut = None
+
+
+def wavelength_to_rgb(wl):
+    """sRGB (0..1) für Wellenlängen beliebiger Form -> Form wl.shape + (3,)."""
+    global _lut
+    if _lut is None:
+        _lut = load_lut()
+    wl = np.asarray(wl, dtype=np.float64)
+    x = np.clip((wl - WL_MIN) / WL_STEP, 0, _lut.shape[0] - 1)
+    i = np.minimum(x.astype(np.int64), _lut.shape[0] - 2)
+    frac = (x - i)[..., np.newaxis]
+    rgb = (1 - frac) * _lut[i] + frac * _lut[i + 1]
+    rgb[wl < VISIBLE[0]] = 0.0
+    rgb[wl > IR_END] = IR_RGB          # Sprung bei 800 nm nicht über ein Tabellenintervall verschmieren
+    return rgb
+
+
+if __name__ == "__main__":
+    import time
+    from colour import wavelength_to_XYZ, XYZ_to_sRGB
+
+    def scalar(wavelength_nm):
+        # wavelength_to_rgb() aus spectrum.py
+        if 380 <= wavelength_nm <= 645:
+            XYZ = wavelength_to_XYZ(wavelength_nm)
+            rgb = XYZ_to_sRGB(XYZ / max(XYZ))
+            return [max(0, min(1, c)) for c in rgb]
+        elif 645 < wavelength_nm <= 800:
+            t = (wavelength_nm - 645) / 100
+            XYZ_visible = wavelength_to_XYZ(645)
+            rgb_visible = XYZ_to_sRGB(XYZ_visible / max(XYZ_visible))
+            rgb_visible = [max(0, min(1, c)) for c in rgb_visible]
+            return [(1 - t) * v + t * i for v, i in zip(rgb_visible, [0.3, 0.0, 0.0])]
+        elif wavelength_nm > 800:
+            return [0.3, 0.0, 0.0]
+        return [0, 0, 0]
+
+    t0 = time.perf_counter()
+    load_lut()
+    print(f"Tabelle laden/erzeugen: {(time.perf_counter() - t0) * 1e3:.0f} ms ({LUT_PATH})")
+
+    mid = np.arange(400, 750, 0.1) + 0.05          # Segmentmitten wie in spectrum.py
+    t0 = time.perf_counter()
+    ref = np.array([scalar(w) for w in mid])
+    t_ref = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    rgb = wavelength_to_rgb(mid)
+    t_lut = time.perf_counter() - t0
+    print(f"{mid.size} Segmente: skalar {t_ref * 1e3:.0f} ms, Tabelle {t_lut * 1e3:.2f} ms, "
+          f"max. Abweichung {np.abs(rgb - ref).max():.1e}")
+    ir = np.arange(645, 830, 0.1)                   # IR-Übergang bis 800 nm, danach IR-Farbe
+    print(f"645..830 nm: max. Abweichung {np.abs(wavelength_to_rgb(ir) - [scalar(w) for w in ir]).max():.1e}")
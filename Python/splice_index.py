@@ -0,0 +1,143 @@
+import numpy as np
+from scipy.fft import rfft, irfft, next_fast_len
+
+from clip_cutter import CROSSFADE_LENGTH
+
+ROW_BLOCK = 32         # out_points pro Durchgang (Block bleibt im Cache)
+
+# =============================================================
+# Index guter Schnittpaare (out_point, nächster in_point)
+#
+# Beim Crossfade werden die Fenster x[o-cf .. o] und x[i .. i+cf]
+# überblendet. Bewertet wird jedes Paar mit dem RMS-Abstand der
+# beiden Fenster über alle Kanäle:
+#
+#   SSD(a, b) = E[a] + E[b] - 2 C[a, b],   a = o - cf,  b = i
+#
+# E ist die gleitende Fensterenergie, C[a, b] das Skalarprodukt der
+# Fenster a und b. Erste Zeile und Spalte von C kommen aus einer
+# FFT-Kreuzkorrelation, alle weiteren Zeilen aus der Diagonalen-
+# Rekursion C[a, b] = C[a-1, b-1] - x[a-1] x[b-1] + x[a+L-1] x[b+L-1]
+# (wie bei STOMP). Aufwand O(N²) statt O(N²·L), pro Zeile ein
+# Vektorschritt. Gespeichert werden je out_point die k besten in_points.
+# =============================================================
+
+
+def _sliding_dot(window, x):
+    # Skalarprodukt von window (Kanäle, L) mit allen Fenstern von x (Kanäle, N)
+    L, N = window.shape[1], x.shape[1]
+    n = next_fast_len(N + L)
+    spec = (np.conj(rfft(window, n, axis=-1)) * rfft(x, n, axis=-1)).sum(axis=0)
+    return irfft(spec, n)[:N - L + 1]
+
+
+class SpliceIndex:
+    """
+    Für jeden zulässigen out_point die keep besten in_points des nächsten
+    Clips, sortiert nach Fensterabstand (RMS in Pixelwerten).
+    candidates[o - out_min] -> in_points, scores[o - out_min] -> RMS.
+    """
+    def __init__(self, channels, crossfade_length=CROSSFADE_LENGTH, keep=0.05):
+        x = np.atleast_2d(np.asarray(channels, dtype=np.float64))
+        n_ch, N = x.shape
+        cf = crossfade_length
+        L = cf + 1
+        self.crossfade_length = cf
+        self.total_length = N
+        self.out_min = 2 * cf + 1
+        self.in_max  = N - 2 * cf - 2
+        if self.in_max < 0:
+            raise ValueError("Lichtprogramm zu kurz für diese Crossfade-Länge")
+        n_in = self.in_max + 1
+        k = max(1, min(n_in, int(round(keep * n_in))))
+
+        # ganzzahlige Daten -> alle Summen exakt, FFT-Ergebnis runden
+        integral = np.array_equal(x, np.round(x))
+
+        energy = np.convolve((x ** 2).sum(axis=0), np.ones(L), mode='valid')
+        a0, a1 = self.out_min - cf, N - 1 - cf          # Fensterstarts der out-Seite
+        row = _sliding_dot(x[:, a0:a0 + L], x)[:n_in]
+        col = _sliding_dot(x[:, :L], x)[a0:a1 + 1]       # C[a, 0] = C[0, a]
+        if integral:
+            row, col = np.rint(row), np.rint(col)
+
+        n_out = a1 - a0 + 1
+        self.candidates = np.empty((n_out, k), dtype=np.int32)
+        self.scores = np.empty((n_out, k), dtype=np.float32)
+        e_in = energy[:n_in]
+        norm = 1.0 / (n_ch * L)
+        head, tail = x[:, :n_in - 1], x[:, L:L + n_in - 1]
+        rows = np.empty((ROW_BLOCK + 1, n_in))      # Zeile 0: letzte des vorigen Blocks
+        for r0 in range(0, n_out, ROW_BLOCK):
+            a = a0 + np.arange(r0, min(r0 + ROW_BLOCK, n_out))
+            # Diagonalen-Rekursion: Korrekturterme des ganzen Blocks als
+            # zwei Matrixprodukte, pro Zeile bleibt eine verschobene Addition
+            delta = x[:, a + L - 1].T @ tail - x[:, a - 1].T @ head
+            if r0 == 0:
+                rows[1] = row
+            rows[1:a.size + 1, 0] = col[a - a0]
+            for j in range(2 if r0 == 0 else 1, a.size + 1):
+                np.add(rows[j - 1, :-1], delta[j - 1], out=rows[j, 1:])
+            # Auswahl der k besten für den ganzen Zeilenblock auf einmal
+            ssd = rows[1:a.size + 1] * -2
+            ssd += e_in
+            ssd += energy[a, np.newaxis]
+            best = np.argpartition(ssd, k - 1, axis=1)[:, :k]
+            best_ssd = np.take_along_axis(ssd, best, axis=1)
+            order = np.argsort(best_ssd, axis=1, kind='stable')
+            self.candidates[r0:r0 + a.size] = np.take_along_axis(best, order, axis=1)
+            self.scores[r0:r0 + a.size] = np.sqrt(
+                np.maximum(np.take_along_axis(best_ssd, order, axis=1), 0) * norm)
+            rows[0] = rows[a.size]
+
+    def good_in_points(self, out_pt):
+        return self.candidates[out_pt - self.out_min]
+
+
+def mismatch_matrix(channels, crossfade_length=CROSSFADE_LENGTH):
+    """
+    Vollständige RMS-Abstandsmatrix [out_point - out_min, in_point] für
+    kurze Programme (Heatmap), gleiche Rechnung wie SpliceIndex.
+    """
+    x = np.atleast_2d(np.asarray(channels, dtype=np.float64))
+    n_ch, N = x.shape
+    cf = crossfade_length
+    L = cf + 1
+    out = np.arange(2 * cf + 1, N)
+    windows = np.lib.stride_tricks.sliding_window_view(x, L, axis=1)   # (Kanäle, N-cf, L)
+    w_out = windows[:, out - cf]
+    w_in = windows[:, :N - 2 * cf - 1]
+    ssd = (np.einsum('cal,cal->a', w_out, w_out)[:, np.newaxis]
+           + np.einsum('cbl,cbl->b', w_in, w_in)[np.newaxis, :]
+           - 2 * np.einsum('cal,cbl->ab', w_out, w_in))
+    return np.sqrt(np.maximum(ssd, 0) / (n_ch * L))
+
+
+if __name__ == "__main__":
+    import time
+    from clip_cutter import ClipCutter, load_light_program
+
+    program = load_light_program()
+    channels = program['channels']
+    cf = program['fade_frames']
+
+    t0 = time.perf_counter()
+    index = SpliceIndex(channels, cf)
+    print(f"Index {channels.shape[1]} Frames: {(time.perf_counter() - t0) * 1e3:.1f} ms")
+    full = mismatch_matrix(channels, cf)
+    rows = np.arange(full.shape[0])[:, np.newaxis]
+    print("Abgleich mit direkter Rechnung: max. Abweichung",
+          np.abs(full[rows, index.candidates] - index.scores).max())
+
+    long_program = np.tile(channels, 8) + np.random.randint(-3, 4, (4, 8 * channels.shape[1]))
+    t0 = time.perf_counter()
+    SpliceIndex(long_program, cf)
+    print(f"Index {long_program.shape[1]} Frames: {time.perf_counter() - t0:.2f} s")
+
+    # Fensterabstand an den Nähten: Zufall vs. Index
+    for name, cutter in (("zufällig", ClipCutter(channels, cf)),
+                         ("Index",    ClipCutter(channels, cf, splice_index=index))):
+        f = cutter.render(25 * 3600)
+        ends = np.flatnonzero(f.clip_changed)[:-1]
+        rms = full[f.out_point[ends] - index.out_min, f.next_in_point[ends]]
+        print(f"{name:9s}: Naht-RMS Median {np.median(rms):5.2f}, P90 {np.percentile(rms, 90):5.2f}")
@@ -0,0 +1,175 @@
+import numpy as np
+from scipy.linalg import expm, schur
+from scipy.signal import lfilter
+
+from pwm_sim import affine_scan
+
+# =============================================================
+# Filterstufen als Zustandsraummodell, exakt diskretisiert
+#
+#   x' = A x + B u,  y = C x
+# ZOH-Diskretisierung über die Matrixexponentielle des erweiterten
+# Systems  expm([[A, B], [0, 0]] * dt) = [[Ad, Bd], [0, I]].
+# Keine Umrechnung in eine Übertragungsfunktion: bei n gleichen Polen
+# nahe z = 1 sind die Polynomkoeffizienten schon ab Ordnung 3-4
+# numerisch unbrauchbar. Stattdessen Schur-Zerlegung Ad = Z T Z^H
+# (T obere Dreiecksmatrix, Z unitär) und Rekursion im Zustand z = Z^H x:
+#   z_k[i] = T_kk z_k[i-1] + sum_{j>k} T_kj z_j[i-1] + (Z^H Bd)_k u[i]
+# von der letzten Komponente aufwärts, jede ein lfilter 1. Ordnung
+# über ganze Arrays bzw. alle Zeilen eines Batches. Ersetzt die
+# geschachtelten Euler-Schritte von digital_adc_filter_2.py
+# (y'' über v_out_deriv, v_out_pwm).
+# Stapel von Systemen (A (..., n, n), z. B. eine Ordnung für viele tau)
+# laufen gemeinsam: T_kk ist dann je Zeile verschieden, die Rekursion
+# wird statt mit lfilter als affiner Scan (pwm_sim.affine_scan) über
+# alle Zeilen auf einmal gerechnet.
+#
+# hold wie in rc_filter.py: 'current' -> u = x[i], 'previous' -> u = x[i-1].
+# Anfangszustand ist 0 (Filter entladen), y[0] = 0.
+# =============================================================
+
+
+def critically_damped(tau, order=2):
+    """
+    (A, B, C) für H(s) = 1 / (1 + s tau)^order: Kette aus order gleichen
+    RC-Gliedern. order=2 ist das Filter aus digital_adc_filter_2.py
+    (tau² y'' + 2 tau y' + y = u).
+    Der Eingang wirkt auf den letzten Zustand, der Ausgang ist der erste;
+    so ist A (und Ad) obere Dreiecksmatrix und schon in Schur-Form.
+    Für ein Array tau ein Stapel (tau.shape + (order, order) usw.).
+    """
+    tau = np.asarray(tau, dtype=np.float64)[..., np.newaxis, np.newaxis]
+    A = (np.eye(order, k=1) - np.eye(order)) / tau
+    B = np.zeros(tau.shape[:-2] + (order, 1))
+    B[..., -1, :] = 1 / tau[..., 0]
+    C = np.zeros(tau.shape[:-2] + (1, order))
+    C[..., 0, 0] = 1
+    return A, B, C
+
+
+def discretize(A, B, dt):
+    """
+    ZOH: (Ad, Bd) mit x[i] = Ad x[i-1] + Bd u (u über dt konstant).
+    A, B dürfen Stapel (..., n, n) / (..., n, m) sein.
+    """
+    n, m = B.shape[-2:]
+    M = np.zeros(np.broadcast_shapes(A.shape[:-2], B.shape[:-2]) + (n + m, n + m))
+    M[..., :n, :n], M[..., :n, n:] = A, B
+    E = expm(M * dt)
+    return E[..., :n, :n], E[..., :n, n:]
+
+
+def discrete_schur(A, B, C, dt):
+    """
+    (T, Bz, Cz): ZOH-Modell in Schur-Form, x = Z z (komplex), für Stapel
+    je System. Ist Ad schon obere Dreiecksmatrix (critically_damped),
+    gilt T = Ad, Z = I ohne Zerlegung, und alles bleibt reell.
+    """
+    Ad, Bd = discretize(A, B, dt)
+    if not np.tril(Ad, -1).any():
+        T = Ad
+        Z = np.broadcast_to(np.eye(Ad.shape[-1]), Ad.shape)
+    else:
+        T = np.empty(Ad.shape, np.complex128)
+        Z = np.empty(Ad.shape, np.complex128)
+        for idx in np.ndindex(Ad.shape[:-2]):
+            T[idx], Z[idx] = schur(Ad[idx].astype(np.complex128), output='complex')
+    Bz = (Z.conj().swapaxes(-1, -2) @ Bd)[..., 0]
+    Cz = (np.asarray(C) @ Z)[..., 0, :]
+    return T, Bz, Cz
+
+
+def ss_filter(x, dt, A, B, C, hold='current'):
+    """
+    Beliebige SISO-Stufe (A, B, C) auf x entlang der letzten Achse.
+    Stapel A (..., n, n), B (..., n, 1), C (..., 1, n) werden mit den
+    vorderen Achsen von x gebroadcastet und in einem Durchgang gefiltert.
+    """
+    if hold not in ('current', 'previous'):
+        raise ValueError("hold muss 'current' oder 'previous' sein")
+    x = np.asarray(x, dtype=np.float64)
+    T, Bz, Cz = discrete_schur(A, B, C, dt)
+    y = np.zeros(np.broadcast_shapes(x.shape[:-1], T.shape[:-2]) + x.shape[-1:])
+    if x.shape[-1] < 2:
+        return y
+    u = x[..., 1:] if hold == 'current' else x[..., :-1]
+    n = T.shape[-1]
+    z = [None] * n
+    for k in range(n - 1, -1, -1):
+        w = Bz[..., k, np.newaxis] * u
+        for j in range(k + 1, n):
+            w[..., 1:] += T[..., k, j, np.newaxis] * z[j][..., :-1]
+        if T.ndim == 2:
+            z[k] = lfilter([1.0], [1.0, -T[k, k]], w, axis=-1)
+        else:
+            z[k] = affine_scan(T[..., k, k, np.newaxis], w)[1]
+    y[..., 1:] = sum(Cz[..., k, np.newaxis] * z[k] for k in range(n)).real
+    return y
+
+
+def ss_lowpass(x, dt, tau, order=2, hold='current'):
+    """
+    Kritisch gedämpfter Tiefpass der Ordnung order (order=1 entspricht
+    rc_filter.rc_lowpass). tau und order dürfen Arrays sein und werden
+    wie bei rc_lowpass mit den vorderen Achsen von x gebroadcastet:
+      ss_lowpass(v_pwm, dt, taus[:, None], orders[None, :])  ->  (taus, orders, N)
+    Je Ordnung ein ss_filter-Aufruf mit den Systemen aller tau als Stapel.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    tau = np.asarray(tau, dtype=np.float64)
+    order = np.asarray(order)
+    batch = np.broadcast_shapes(x.shape[:-1], tau.shape, order.shape)
+    x = np.broadcast_to(x, batch + x.shape[-1:])
+    if tau.ndim == 0 and order.ndim == 0:
+        return ss_filter(x, dt, *critically_damped(float(tau), int(order)), hold=hold)
+
+    tau_b = np.broadcast_to(tau, batch)
+    order_b = np.broadcast_to(order, batch)
+    y = np.empty(x.shape)
+    for n_ in np.unique(order_b):
+        rows = order_b == n_
+        y[rows] = ss_filter(x[rows], dt, *critically_damped(tau_b[rows], int(n_)), hold=hold)
+    return y
+
+
+if __name__ == "__main__":
+    import time
+    from scipy.special import gammainc
+    from rc_filter import rc_lowpass
+
+    # Sprungantwort n. Ordnung exakt: P(n, t/tau) = 1 - Q(n, t/tau)
+    print("Sprungantwort gegen 1 - Q(n, t/tau), max. Fehler für Ordnung 1..6:")
+    for tau, dt in ((200e-6, 1e-7), (1e-3, 1e-8)):
+        t = np.arange(int(round(20 * tau / dt))) * dt
+        errors = [np.abs(ss_lowpass(np.ones(t.size), dt, tau, order=n) - gammainc(n, t / tau)).max()
+                  for n in range(1, 7)]
+        print(f"  tau = {tau * 1e6:6.0f} µs, dt = {dt:.0e}: " + " ".join(f"{e:.1e}" for e in errors))
+
+    # Sprungantwort 2. Ordnung: 1 - (1 + t/tau) exp(-t/tau)
+    tau = 72.1046e-6
+    for n in (20000, 200):
+        t = np.linspace(0, 10 * tau, n)
+        dt = t[1] - t[0]
+        y = ss_lowpass(np.ones(n), dt, tau, order=2, hold='previous')
+        exact = 1 - (1 + t / tau) * np.exp(-t / tau)
+        print(f"2. Ordnung, dt/tau={dt / tau:.4f}: max. Fehler {np.abs(y - exact).max():.2e}")
+    x = np.random.default_rng(0).random(5000)
+    print("1. Ordnung gegen rc_lowpass:",
+          f"{np.abs(ss_lowpass(x, 1e-7, 1e-6, order=1) - rc_lowpass(x, 1e-7, 1e-6)).max():.2e}")
+
+    # Batch: PWM wie digital_adc_filter_2.py, 6 Zeitkonstanten x Ordnung 1..4
+    t = np.linspace(0, 2e-3, 20000)
+    dt = t[1] - t[0]
+    pwm = np.where((t >= 1e-3) & ((t * 15e3) % 1 < 0.5), 0xfff, 0.0)
+    taus = np.array([10e-6, 20e-6, 40e-6, 72.1046e-6, 100e-6, 200e-6])
+    orders = np.arange(1, 5)
+    t0 = time.perf_counter()
+    y = ss_lowpass(pwm, dt, taus[:, np.newaxis], orders[np.newaxis, :])
+    print(f"Batch {y.shape}: {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    window = (t >= 1.5e-3)
+    span = np.ptp(y[..., window], axis=-1)
+    print("Spannweite (Bits) im Fenster 1.5..2 ms (Ripple + Rest-Einschwingen),\n"
+          "Zeilen tau, Spalten Ordnung 1..4:")
+    for tau_, row in zip(taus, span):
+        print(f"  tau = {tau_ * 1e6:7.2f} µs: " + " ".join(f"{r:8.2f}" for r in row))
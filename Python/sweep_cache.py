@@ -0,0 +1,66 @@
+import os
+import pickle
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# =============================================================
+# Plattencache für Parameter-Sweeps
+#
+# Jeder Job ist ein Tupel von Parametern (Zahlen, Strings, Arrays).
+# Das Ergebnis von fn(job) wird unter einem Hash aus Funktionsname,
+# CACHE_VERSION der Funktion und den Parametern abgelegt. Nur fehlende
+# Jobs werden im Prozess-Pool gerechnet.
+# Ändert sich die Rechnung in fn, dort CACHE_VERSION hochzählen.
+# =============================================================
+
+project_dir = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(project_dir, ".sweep_cache")
+
+
+def _update(h, value):
+    if isinstance(value, np.ndarray):
+        h.update(f"{value.dtype}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (tuple, list)):
+        h.update(b"(")
+        for v in value:
+            _update(h, v)
+        h.update(b")")
+    else:
+        h.update(repr(value).encode())
+
+
+def job_key(fn, job):
+    h = hashlib.sha1(f"{fn.__module__}.{fn.__qualname__}".encode())
+    _update(h, getattr(fn, "CACHE_VERSION", 0))
+    _update(h, job)
+    return h.hexdigest()
+
+
+def cached_map(fn, jobs, workers=None, cache_dir=CACHE_DIR):
+    """
+    Wie list(map(fn, jobs)), aber mit Plattencache und Prozess-Pool.
+    Liefert zusätzlich die Anzahl neu gerechneter Jobs.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = [os.path.join(cache_dir, job_key(fn, job) + ".pkl") for job in jobs]
+    results = [None] * len(jobs)
+    missing = []
+    for i, path in enumerate(paths):
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                results[i] = pickle.load(f)
+        else:
+            missing.append(i)
+
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for i, res in zip(missing, pool.map(fn, [jobs[i] for i in missing])):
+                results[i] = res
+                tmp = paths[i] + ".tmp"
+                with open(tmp, "wb") as f:
+                    pickle.dump(res, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, paths[i])       # kein halber Eintrag bei Abbruch
+    return results, len(missing)
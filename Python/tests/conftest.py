@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Die Module liegen flach in Python/ und Python/spectrum_plot/ und werden
+# wie in den Skripten direkt importiert (from clip_cutter import ...),
+# siehe PYTHONPATH im README.
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+for path in (os.path.join(TESTS_DIR, ".."), os.path.join(TESTS_DIR, "..", "spectrum_plot")):
+    path = os.path.normpath(path)
+    if path not in sys.path:
+        sys.path.insert(0, path)
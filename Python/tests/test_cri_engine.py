@@ -0,0 +1,75 @@
+import os
+import warnings
+
+import numpy as np
+import pytest
+
+pytest.importorskip("colour")
+
+from cri_engine import CriEngine
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "spectrum_plot", "data")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return CriEngine()
+
+
+def reference(engine, spectrum, additional_data=False):
+    from colour import SpectralDistribution, colour_rendering_index
+    from colour.colorimetry import SpectralShape
+
+    sd = SpectralDistribution(dict(zip(engine.wl, spectrum)), name="Sample")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return colour_rendering_index(sd.interpolate(SpectralShape(400, 750, 5)),
+                                      additional_data=additional_data)
+
+
+@pytest.fixture(scope="module")
+def spectra(engine):
+    import pandas as pd
+
+    wl = engine.wl
+
+    def load(name):
+        df = pd.read_csv(os.path.join(DATA_DIR, name))
+        return np.interp(wl, df["Wavelength [nm]"], df["Relative Intensity [%]"], left=0, right=0)
+
+    def gauss(center, width):
+        return np.exp(-((wl - center) ** 2) / (2 * width ** 2))
+
+    base = np.stack((load("smd_led.csv"), load("red_led.csv"), 100 * gauss(580, 40)))
+    mixes = np.random.default_rng(0).random((6, 3)) @ base
+    # RGB-Mischungen mit ~4700 K (Planck-Referenz) und ~6900 K (Tageslicht-Referenz)
+    rgb = [b * gauss(450, 12) + gauss(540, 30) + gauss(620, 20) for b in (1, 2)]
+    return np.concatenate((base, mixes, rgb))
+
+
+def test_ra_matches_colour(engine, spectra):
+    ra = engine.ra(spectra)
+    expected = np.array([reference(engine, s) for s in spectra])
+    assert ra.shape == (len(spectra),)
+    np.testing.assert_allclose(ra, expected, rtol=0, atol=1e-9)
+
+
+def test_ri_matches_colour(engine, spectra):
+    _, ri = engine.ra(spectra[:3], return_ri=True)
+    for s, row in zip(spectra[:3], ri):
+        data = reference(engine, s, additional_data=True)
+        expected = [data.Q_as[i + 1].Q_a for i in range(14)]
+        np.testing.assert_allclose(row, expected, rtol=0, atol=1e-9)
+
+
+def test_batch_shape_and_scale(engine, spectra):
+    # Ra hängt nicht von der Skalierung ab, Batch-Achsen bleiben erhalten
+    batch = np.stack((spectra[:4], 7.5 * spectra[:4]))
+    ra = engine.ra(batch)
+    assert ra.shape == (2, 4)
+    np.testing.assert_allclose(ra[0], ra[1], rtol=0, atol=1e-9)
+    assert np.ndim(engine.ra(spectra[0])) == 0
+
+
+def test_zero_spectrum_is_nan(engine):
+    assert np.isnan(engine.ra(np.zeros(engine.wl.size)))
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from pwm_sim import PwmRc, affine_scan, pwm_edges, pwm_steady_state
+from rc_filter import rc_lowpass
+
+PERIOD = 1 / 15e3
+RC = 60.1e-6
+STEPS = 2000                  # Rasterschritte pro Periode, alle Flanken liegen auf dem Raster
+
+
+@pytest.fixture
+def pwm():
+    """Duty-Rampe über 30 Perioden und das gleiche Signal auf dem Raster."""
+    n_per = 30
+    duty = np.linspace(0, 1, n_per)
+    duty = np.round(duty * STEPS) / STEPS
+    times, levels = pwm_edges(PERIOD, duty, n_per * PERIOD, 3.3)
+    i = np.arange(n_per * STEPS)
+    grid_t = i * (PERIOD / STEPS)
+    grid_levels = np.where(i % STEPS < np.rint(duty[i // STEPS] * STEPS), 3.3, 0.0)
+    return times, levels, grid_t, grid_levels
+
+
+def test_on_grid_matches_rc_lowpass(pwm):
+    times, levels, grid_t, grid_levels = pwm
+    dense = rc_lowpass(grid_levels, PERIOD / STEPS, [RC, 5e-6], hold='previous')
+    sim = PwmRc(times, levels, [RC, 5e-6])
+    np.testing.assert_allclose(sim(grid_t), dense, rtol=0, atol=1e-10)
+
+
+def test_off_grid_matches_dense_interp(pwm):
+    # beliebige Zeitpunkte: dichtes Raster + np.interp, Fehler O(Rasterschritt)
+    times, levels, grid_t, grid_levels = pwm
+    dense = rc_lowpass(grid_levels, PERIOD / STEPS, RC, hold='previous')
+    t = np.sort(np.random.default_rng(0).uniform(0, grid_t[-1], 5000))
+    step = 3.3 * (PERIOD / STEPS) / RC
+    np.testing.assert_allclose(PwmRc(times, levels, RC)(t), np.interp(t, grid_t, dense),
+                               rtol=0, atol=step)
+
+
+def test_mean_and_extrema_match_dense(pwm):
+    times, levels, grid_t, grid_levels = pwm
+    dense = rc_lowpass(grid_levels, PERIOD / STEPS, RC, hold='previous')
+    sim = PwmRc(times, levels, RC)
+    t0, t1 = 10 * PERIOD, 25 * PERIOD
+    # t0, t1 liegen auf dem Raster, bis auf Rundung von i * dt
+    half = PERIOD / STEPS / 2
+    inside = (grid_t > t0 - half) & (grid_t < t1 + half)
+    y, t = dense[inside], grid_t[inside]
+    dense_mean = ((y[1:] + y[:-1]) / 2 * np.diff(t)).sum() / (t1 - t0)
+    assert sim.mean(t0, t1) == pytest.approx(dense_mean, abs=1e-6)
+    y_min, y_max = sim.extrema(t0, t1)
+    assert y_min == pytest.approx(dense[inside].min(), abs=1e-9)
+    assert y_max == pytest.approx(dense[inside].max(), abs=1e-9)
+
+
+def test_steady_state():
+    n_per = 400
+    times, levels = pwm_edges(PERIOD, np.full(n_per, 0.3), n_per * PERIOD)
+    sim = PwmRc(times, levels, RC)
+    y_start, y_peak = pwm_steady_state(PERIOD, 0.3, RC)
+    last = (n_per - 1) * PERIOD
+    assert sim(last) == pytest.approx(y_start, abs=1e-12)
+    assert sim(last + 0.3 * PERIOD) == pytest.approx(y_peak, abs=1e-12)
+    assert sim.mean(last, last + PERIOD) == pytest.approx(0.3, abs=1e-12)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 16, 17, 1000])
+def test_affine_scan_matches_loop(n):
+    rng = np.random.default_rng(n)
+    A, B = rng.uniform(0.5, 1, (3, n)), rng.standard_normal((3, n))
+    A_ref, B_ref = np.empty_like(A), np.empty_like(B)
+    a, b = np.ones(3), np.zeros(3)
+    for i in range(n):
+        a, b = A[:, i] * a, A[:, i] * b + B[:, i]
+        A_ref[:, i], B_ref[:, i] = a, b
+    A_scan, B_scan = affine_scan(A, B)
+    np.testing.assert_allclose(A_scan, A_ref, rtol=1e-12)
+    np.testing.assert_allclose(B_scan, B_ref, rtol=1e-12, atol=1e-12)
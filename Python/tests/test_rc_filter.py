@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from rc_filter import rc_lowpass
+
+RC = 60.1e-6
+
+
+def euler(x, dt, rc, y0=0.0, hold='current'):
+    """Die Schleife aus current/ (hold='current') bzw. gs-filter/ (hold='previous')."""
+    y = np.empty_like(x)
+    y[0] = y0
+    for i in range(1, len(x)):
+        u = x[i] if hold == 'current' else x[i - 1]
+        y[i] = y[i - 1] + (u - y[i - 1]) * dt / rc
+    return y
+
+
+@pytest.mark.parametrize("hold", ['current', 'previous'])
+@pytest.mark.parametrize("n", [20000, 200, 12])
+def test_step_exact(hold, n):
+    # ZOH ist für einen Sprung exakt, unabhängig von dt
+    t = np.linspace(0, 10 * RC, n)
+    y = rc_lowpass(np.ones(n), t[1] - t[0], RC, hold=hold)
+    np.testing.assert_allclose(y, 1 - np.exp(-t / RC), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("hold", ['current', 'previous'])
+def test_matches_euler_for_small_dt(hold):
+    # Euler weicht um O(dt/RC) ab: bei 10x kleinerem dt ~10x weniger
+    rng = np.random.default_rng(0)
+    errors = []
+    for steps in (2000, 20000):
+        t = np.linspace(0, 5 * RC, steps)
+        dt = t[1] - t[0]
+        x = np.repeat(rng.random(20), steps // 20)
+        y = rc_lowpass(x, dt, RC, y0=0.3, hold=hold)
+        errors.append(np.abs(y - euler(x, dt, RC, y0=0.3, hold=hold)).max())
+        assert errors[-1] < dt / RC
+    assert errors[1] < errors[0] / 5
+
+
+def test_batch_matches_single():
+    rng = np.random.default_rng(1)
+    x = rng.random((4, 1, 3000))
+    rc = np.array([1e-6, 1e-5, 6e-5])
+    y0 = rng.random((4, 3))
+    y = rc_lowpass(x, 1e-7, rc, y0=y0)
+    assert y.shape == (4, 3, 3000)
+    for i in range(4):
+        for j in range(3):
+            np.testing.assert_allclose(y[i, j], rc_lowpass(x[i, 0], 1e-7, rc[j], y0=y0[i, j]),
+                                       rtol=0, atol=1e-14)
+
+
+def test_hold_previous_is_shifted_input():
+    x = np.random.default_rng(2).random(500)
+    y_prev = rc_lowpass(x, 1e-7, 1e-6, hold='previous')
+    y_cur = rc_lowpass(np.concatenate(([0.0], x[:-1])), 1e-7, 1e-6)
+    np.testing.assert_allclose(y_prev, y_cur, atol=1e-15)
+
+
+def test_short_input_and_bad_hold():
+    np.testing.assert_array_equal(rc_lowpass([5.0], 1e-7, 1e-6, y0=2.0), [2.0])
+    with pytest.raises(ValueError):
+        rc_lowpass(np.ones(10), 1e-7, 1e-6, hold='next')